@@ -0,0 +1,94 @@
+"""Per-event cost of ``emit_event`` on the calling thread.
+
+Compares the previous ``logger.log`` of an inline ``json.dumps`` through a
+plain ``StreamHandler`` with the queued observation handler, both writing to
+``os.devnull``::
+
+    python benchmarks/observation_logging.py --events 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from functions import handler  # noqa: E402
+
+
+FIELDS = {
+    "date": "20260713",
+    "slot": "중식1",
+    "outcome": "SUCCESS",
+    "source_length": 412,
+    "source_sha256": "df427679aa06",
+}
+
+
+def _inline_emit(inline_logger: logging.Logger, context: dict[str, str]) -> None:
+    event = {
+        **context,
+        "event.name": "source.classified",
+        "stage": "classify",
+        "log.level": "INFO",
+        **FIELDS,
+    }
+    inline_logger.log(
+        logging.INFO,
+        json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    context = {
+        "service.name": "menu-scraper",
+        "faas.invocation_id": "benchmark",
+        "run_id": "benchmark",
+        "operation": "schedule_dodam",
+        "restaurant": "DODAM",
+        "trigger": "local",
+    }
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        inline = logging.getLogger("benchmark.inline_observation")
+        inline.propagate = False
+        inline.setLevel(logging.INFO)
+        inline_handler = logging.StreamHandler(sink)
+        inline_handler.setFormatter(logging.Formatter("%(message)s"))
+        inline.addHandler(inline_handler)
+        started = time.perf_counter()
+        for _ in range(args.events):
+            _inline_emit(inline, context)
+        inline_us = (time.perf_counter() - started) / args.events * 1e6
+
+        queued = handler._observation_logger.handlers[0]
+        previous = queued.setStream(sink)
+        token = handler._observation_context.set(context)
+        try:
+            started = time.perf_counter()
+            for _ in range(args.events):
+                handler.emit_event("INFO", "source.classified", "classify", **FIELDS)
+            queued_us = (time.perf_counter() - started) / args.events * 1e6
+            handler.flush_observations()
+            drained_us = (time.perf_counter() - started) / args.events * 1e6
+        finally:
+            handler._observation_context.reset(token)
+            queued.setStream(previous)
+
+    encoder = "orjson" if handler.orjson is not None else "json"
+    print(f"inline logger.log(json.dumps) + write: {inline_us:.2f} us/event")
+    print(f"queued emit_event ({encoder}): {queued_us:.2f} us/event on the caller")
+    print(f"queued including final flush: {drained_us:.2f} us/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Event-loop responsiveness while several scrapes parse their pages.
+
+A heartbeat coroutine sleeps 1 ms in a loop and records how late it wakes up
+while ``fetch_meals`` runs concurrently against an in-memory session. The
+pages are parsed once inline on the loop (the previous behaviour) and once on
+the bounded parse pool::
+
+    python benchmarks/parse_offload.py --scrapes 16 --rows 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from functions import scraper  # noqa: E402
+
+
+FIXTURES = Path(__file__).resolve().parents[1] / "tests/fixtures/characterization"
+
+
+def _page(rows: int) -> str:
+    """The dodam fixture padded with unrelated table rows to a realistic size."""
+    html = (FIXTURES / "dodam.html").read_text(encoding="utf-8")
+    filler = "".join(
+        f"<tr><td class='notice'>공지 {index}</td><td>안내 문구 {index}</td></tr>"
+        for index in range(rows)
+    )
+    return f"<html><body>{html}<table>{filler}</table></body></html>"
+
+
+class _Response:
+    def __init__(self, html: str) -> None:
+        self.html = html
+
+    async def __aenter__(self) -> _Response:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def text(self) -> str:
+        await asyncio.sleep(0)
+        return self.html
+
+
+class _Session(_Response):
+    def get(self, *args: object, **kwargs: object) -> _Response:
+        return _Response(self.html)
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - started) * 1000 - 1)
+
+
+async def _run(html: str, scrapes: int) -> tuple[float, float, float]:
+    stop, lags = asyncio.Event(), []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    started = time.perf_counter()
+    _ = await asyncio.gather(
+        *(
+            scraper.fetch_meals(
+                "DODAM", "20260713", session_factory=lambda: _Session(html)
+            )
+            for _ in range(scrapes)
+        )
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stop.set()
+    await heartbeat
+    lags.sort()
+    return elapsed_ms, lags[len(lags) * 99 // 100], lags[-1]
+
+
+async def _inline(
+    html_content: str, restaurant: object, requested_dates: object
+) -> list[scraper.MealRecord]:
+    return scraper.parse_menu_html(html_content, restaurant, requested_dates)  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scrapes", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=400)
+    args = parser.parse_args()
+    html = _page(args.rows)
+
+    pooled = scraper.parse_menu_html_async
+    scraper.parse_menu_html_async = _inline
+    try:
+        inline = asyncio.run(_run(html, args.scrapes))
+    finally:
+        scraper.parse_menu_html_async = pooled
+    offloaded = asyncio.run(_run(html, args.scrapes))
+
+    print(f"{args.scrapes} scrapes, {len(html)} bytes per page")
+    for name, (elapsed_ms, p99_ms, max_ms) in (
+        ("inline", inline),
+        (f"pool({scraper._parse_workers()})", offloaded),
+    ):
+        print(
+            f"{name:8s} total {elapsed_ms:7.1f} ms  "
+            f"heartbeat lag p99 {p99_ms:6.1f} ms  max {max_ms:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
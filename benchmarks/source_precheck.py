@@ -0,0 +1,64 @@
+"""Cost of classifying closure, empty and error pages with and without the precheck.
+
+Each page is parsed with ``parse_soongguri_html`` as shipped and with the
+byte-level precheck disabled, which forces the BeautifulSoup parse and the
+closure tree walk::
+
+    python benchmarks/source_precheck.py --rounds 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from functions import scraper  # noqa: E402
+
+
+_FILLER = "".join(
+    f'<li><a href="/notice/{index}">공지사항 {index}</a></li>' for index in range(60)
+)
+PAGES = {
+    "closure": f"<html><body><ul>{_FILLER}</ul><div>오늘은 쉽니다.</div></body></html>",
+    "empty": "<html><body></body></html>",
+    "error": f"<html><body><ul>{_FILLER}</ul><h1>502 Bad Gateway</h1></body></html>",
+}
+
+
+def _time(html: str, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        try:
+            _ = scraper.parse_soongguri_html(html, "20260713", "DODAM")
+        except scraper.ScraperError:
+            pass
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    precheck, closure_text = scraper._precheck_soongguri, scraper._DAY_CLOSURE_TEXT
+    for name, html in PAGES.items():
+        fast_us = _time(html, args.rounds)
+        scraper._precheck_soongguri = lambda *args: None
+        scraper._DAY_CLOSURE_TEXT = ""
+        try:
+            full_us = _time(html, args.rounds)
+        finally:
+            scraper._precheck_soongguri = precheck
+            scraper._DAY_CLOSURE_TEXT = closure_text
+        print(
+            f"{name:8s} full parse {full_us:8.1f} us  precheck {fast_us:6.1f} us "
+            f"({full_us / fast_us:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from functions.cli import main
+
+
+raise SystemExit(main())
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without the archive extra
+    zstandard = None
+
+
+ARCHIVE_ENVIRONMENT = "PAGE_ARCHIVE_URI"
+
+
+class ObjectStore(Protocol):
+    """The subset of an S3 bucket the archive needs."""
+
+    def put_object(self, *, Key: str, Body: bytes) -> None: ...
+
+    def get_object(self, *, Key: str) -> bytes | None: ...
+
+
+class LocalObjectStore:
+    """Filesystem bucket; keys map to paths below ``root``."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError("archive key escapes the store root")
+        return path
+
+    def put_object(self, *, Key: str, Body: bytes) -> None:
+        path = self._path(Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as temporary:
+            _ = temporary.write(Body)
+        _ = Path(temporary.name).replace(path)
+
+    def get_object(self, *, Key: str) -> bytes | None:
+        path = self._path(Key)
+        return path.read_bytes() if path.is_file() else None
+
+
+class S3ObjectStore:
+    """Adapter for a boto3-compatible S3 client bound to one bucket and prefix."""
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "") -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_object(self, *, Key: str, Body: bytes) -> None:
+        _ = self.client.put_object(Bucket=self.bucket, Key=self._key(Key), Body=Body)
+
+    def get_object(self, *, Key: str) -> bytes | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(Key))
+        except Exception as error:
+            code = getattr(error, "response", {}).get("Error", {}).get("Code")
+            if code in {"NoSuchKey", "404"}:
+                return None
+            raise
+        return response["Body"].read()
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    restaurant: str
+    date: str
+    sha256: str
+    codec: str
+    size: int
+    archived_at: str
+
+
+def _codec() -> str:
+    return "zst" if zstandard is not None else "zlib"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required for zst archives")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 9)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required for zst archives")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"unsupported archive codec: {codec}")
+
+
+class PageArchive:
+    """Append-only, content-addressed archive of scraped source pages.
+
+    Page bodies are stored once per sha256 under ``blobs/`` so a page that is
+    unchanged across days or retries costs one index entry. ``index/`` holds one
+    object per (restaurant, date) listing every distinct version in fetch order;
+    updates to one index are serialized within the process.
+    """
+
+    _index_locks: dict[str, threading.Lock] = {}
+    _index_locks_guard = threading.Lock()
+
+    def __init__(self, store: ObjectStore) -> None:
+        self.store = store
+
+    @classmethod
+    def _index_lock(cls, key: str) -> threading.Lock:
+        with cls._index_locks_guard:
+            return cls._index_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _index_key(restaurant: str, date: str) -> str:
+        return f"index/{restaurant.upper()}/{date}.json"
+
+    @staticmethod
+    def _blob_key(sha256: str, codec: str) -> str:
+        return f"blobs/{sha256[:2]}/{sha256}.html.{codec}"
+
+    def versions(self, restaurant: str, date: str) -> list[ArchivedPage]:
+        raw_index = self.store.get_object(Key=self._index_key(restaurant, date))
+        if raw_index is None:
+            return []
+        return [ArchivedPage(**entry) for entry in json.loads(raw_index)]
+
+    def put(self, restaurant: str, date: str, html_content: str) -> ArchivedPage:
+        with self._index_lock(self._index_key(restaurant, date)):
+            return self._put(restaurant, date, html_content)
+
+    def _put(self, restaurant: str, date: str, html_content: str) -> ArchivedPage:
+        data = html_content.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        versions = self.versions(restaurant, date)
+        for version in versions:
+            if version.sha256 == sha256:
+                return version
+
+        codec = _codec()
+        if self.store.get_object(Key=self._blob_key(sha256, codec)) is None:
+            self.store.put_object(
+                Key=self._blob_key(sha256, codec), Body=_compress(data, codec)
+            )
+        page = ArchivedPage(
+            restaurant=restaurant.upper(),
+            date=date,
+            sha256=sha256,
+            codec=codec,
+            size=len(data),
+            archived_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        self.store.put_object(
+            Key=self._index_key(restaurant, date),
+            Body=json.dumps([asdict(item) for item in [*versions, page]]).encode("utf-8"),
+        )
+        return page
+
+    def read(self, page: ArchivedPage) -> str:
+        blob = self.store.get_object(Key=self._blob_key(page.sha256, page.codec))
+        if blob is None:
+            raise KeyError(f"archived page blob is missing: {page.sha256}")
+        data = _decompress(blob, page.codec)
+        if hashlib.sha256(data).hexdigest() != page.sha256:
+            raise ValueError("archived page failed its content hash check")
+        return data.decode("utf-8")
+
+    def get(self, restaurant: str, date: str) -> str | None:
+        """Return the most recently archived page for a restaurant and date."""
+        versions = self.versions(restaurant, date)
+        return self.read(versions[-1]) if versions else None
+
+
+def open_store(uri: str) -> ObjectStore:
+    """Open ``file:///path``, a bare path, or ``s3://bucket/prefix``."""
+    parts = urlsplit(uri)
+    if parts.scheme == "s3":
+        import boto3
+
+        return S3ObjectStore(boto3.client("s3"), parts.netloc, parts.path)
+    if parts.scheme in {"", "file"}:
+        return LocalObjectStore(parts.path if parts.scheme else uri)
+    raise ValueError(f"unsupported object store URI: {uri}")
+
+
+def open_archive(uri: str) -> PageArchive:
+    return PageArchive(open_store(uri))
+
+
+def archive_from_environment() -> PageArchive | None:
+    uri = os.getenv(ARCHIVE_ENVIRONMENT)
+    return open_archive(uri) if uri else None
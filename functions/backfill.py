@@ -0,0 +1,246 @@
+"""Re-derive menus for an arbitrary date range from archived or live sources."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, TextIO
+
+from functions import handler
+from functions.archive import open_archive
+
+
+SOURCES = frozenset({"auto", "archive", "live"})
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+# Outcomes a later run may resolve; their dates stay out of the checkpoint.
+_RETRYABLE_OUTCOMES = frozenset({"API_FAILURE", "AMBIGUOUS_EMPTY"})
+
+
+def date_range(start_date: str, end_date: str) -> list[str]:
+    start = datetime.strptime(start_date, "%Y%m%d")
+    end = datetime.strptime(end_date, "%Y%m%d")
+    if end < start:
+        raise ValueError("end_date must not precede start_date")
+    return [
+        (start + timedelta(days=offset)).strftime("%Y%m%d")
+        for offset in range((end - start).days + 1)
+    ]
+
+
+def source_units(restaurant: str, dates: Sequence[str]) -> list[tuple[str, list[str]]]:
+    """Group dates by the page that carries them: one dormitory page per week, keyed on its Monday."""
+    if restaurant != "DORMITORY":
+        return [(date, [date]) for date in dates]
+    weeks: dict[str, list[str]] = {}
+    for date in dates:
+        value = datetime.strptime(date, "%Y%m%d")
+        monday = (value - timedelta(days=value.weekday())).strftime("%Y%m%d")
+        weeks.setdefault(monday, []).append(date)
+    return list(weeks.items())
+
+
+def completed_dates(path: Path | None) -> set[str]:
+    """Read the NDJSON checkpoint: every complete line marks its date as done."""
+    if path is None or not path.is_file():
+        return set()
+    done: set[str] = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, Mapping) and entry.get("complete") is True:
+            done.add(str(entry.get("date")))
+    return done
+
+
+def _bounded_concurrency(value: object) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return DEFAULT_CONCURRENCY
+    try:
+        return min(max(int(value), 1), MAX_CONCURRENCY)
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+async def _unit_meals(
+    config: Mapping[str, Any],
+    archive: Any,
+    source: str,
+    unit_date: str,
+    dates: Sequence[str],
+) -> tuple[str, list[Mapping[str, Any]]]:
+    plan = handler._plan_for(config)
+    if archive is not None and source != "live" and plan.parser is not None:
+        html_content = await asyncio.to_thread(archive.get, config["restaurant"], unit_date)
+        if html_content is not None:
+            records = await asyncio.to_thread(plan.parser, html_content, dates)
+            return "archive", [handler.meal_mapping(record) for record in records]
+    if source == "archive":
+        raise LookupError("page is not archived")
+    requested_dates = dates if config["restaurant"] == "DORMITORY" else None
+    meals = await handler.scrape(config, unit_date, requested_dates=requested_dates)
+    return "live", list(meals)
+
+
+async def _derive_slot(
+    config: Mapping[str, Any], raw_meal: Mapping[str, Any], publish: bool
+) -> dict[str, Any]:
+    outcome = raw_meal.get("outcome", "SUCCESS")
+    slot: dict[str, Any] = {
+        "outcome": outcome,
+        "reason_code": raw_meal.get("reason_code"),
+    }
+    if outcome != "SUCCESS":
+        return slot
+    try:
+        interpreted = await handler.interpret_menu(config, raw_meal)
+    except Exception as error:
+        slot["error_type"] = type(error).__name__
+        return slot
+    menu_names = handler._menu_names(interpreted)
+    main_menus = handler._main_menus(interpreted, menu_names)
+    slot["menuNames"] = menu_names
+    slot["mainMenus"] = main_menus
+    plan = handler._plan_for(config)
+    policy = plan.slot_policy(raw_meal.get("source_slot"))
+    if not publish or policy is None:
+        return slot
+    payload = handler._meal_payload(
+        config, str(raw_meal.get("date")), policy, menu_names, main_menus
+    )
+    published: list[str] = []
+    for environment in plan.environments:
+        try:
+            _ = await handler.publish_menu(config, payload, environment)
+        except Exception as error:
+            slot.setdefault("publication_errors", {})[environment] = type(error).__name__
+            continue
+        published.append(environment)
+    slot["published"] = published
+    return slot
+
+
+async def _derive_unit(
+    config: Mapping[str, Any],
+    archive: Any,
+    source: str,
+    unit_date: str,
+    dates: Sequence[str],
+    publish: bool,
+) -> list[dict[str, Any]]:
+    lines = {
+        date: {
+            "date": date,
+            "restaurant": config["restaurant"],
+            "slots": {},
+            "complete": True,
+        }
+        for date in dates
+    }
+    try:
+        origin, meals = await _unit_meals(config, archive, source, unit_date, dates)
+    except Exception as error:
+        outcome = getattr(error, "outcome", None)
+        for line in lines.values():
+            line["outcome"] = outcome or "SOURCE_ERROR"
+            line["reason_code"] = getattr(error, "reason_code", None)
+            line["error_type"] = type(error).__name__
+            line["complete"] = outcome == "EXPECTED_EMPTY"
+        return list(lines.values())
+
+    for raw_meal in meals:
+        line = lines.get(str(raw_meal.get("date")))
+        if line is None:
+            continue
+        slot = await _derive_slot(config, raw_meal, publish)
+        line["slots"][handler._source_slot(raw_meal)] = slot
+        if slot["outcome"] in _RETRYABLE_OUTCOMES or (
+            "error_type" in slot or "publication_errors" in slot
+        ):
+            line["complete"] = False
+    for line in lines.values():
+        line["source"] = origin
+        if not line["slots"]:
+            line["outcome"] = "MISSING_DATE"
+            line["complete"] = False
+    return list(lines.values())
+
+
+def _write_line(stream: TextIO, line: Mapping[str, Any]) -> None:
+    stream.write(json.dumps(line, ensure_ascii=False, sort_keys=True) + "\n")
+    stream.flush()
+
+
+async def run_backfill(
+    config: Mapping[str, Any], request: Mapping[str, Any], event: object
+) -> dict[str, Any]:
+    """Backfill ``start_date``..``end_date`` and stream one NDJSON line per date."""
+    del request
+    payload = handler._mapping(event)
+    start_date = handler._date(payload.get("start_date"))
+    end_date = handler._date(payload.get("end_date"))
+    source = payload.get("source", "auto")
+    if start_date is None or end_date is None or source not in SOURCES:
+        return handler._invalid_response("invalid backfill request")
+    try:
+        dates = date_range(start_date, end_date)
+    except ValueError:
+        return handler._invalid_response("invalid backfill request")
+
+    archive = None
+    archive_uri = config.get("page_archive_uri")
+    if isinstance(archive_uri, str):
+        archive = open_archive(archive_uri)
+    if source == "archive" and archive is None:
+        return handler._invalid_response("page archive is not configured")
+
+    raw_output = payload.get("output")
+    output = Path(raw_output) if isinstance(raw_output, str) and raw_output else None
+    done = completed_dates(output)
+    pending = [date for date in dates if date not in done]
+    publish = handler._boolean(payload.get("publish"))
+    semaphore = asyncio.Semaphore(_bounded_concurrency(payload.get("concurrency")))
+
+    async def throttled(unit_date: str, unit_dates: list[str]) -> list[dict[str, Any]]:
+        async with semaphore:
+            return await _derive_unit(
+                config, archive, str(source), unit_date, unit_dates, publish
+            )
+
+    started = time.perf_counter()
+    processed = 0
+    incomplete = 0
+    stream: TextIO = output.open("a", encoding="utf-8") if output else sys.stdout
+    try:
+        tasks = [
+            asyncio.ensure_future(throttled(unit_date, unit_dates))
+            for unit_date, unit_dates in source_units(config["restaurant"], pending)
+        ]
+        for finished in asyncio.as_completed(tasks):
+            for line in await finished:
+                _write_line(stream, line)
+                processed += 1
+                incomplete += 0 if line["complete"] else 1
+    finally:
+        if output is not None:
+            stream.close()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": processed,
+        "skipped_days": len(dates) - len(pending),
+        "incomplete_days": incomplete,
+        "elapsed_seconds": round(elapsed, 3),
+        "days_per_minute": round(processed / elapsed * 60, 2) if elapsed > 0 else None,
+    }
+    handler.emit_event("INFO", "backfill.completed", "backfill", **summary)
+    return handler._response(200, summary)
@@ -0,0 +1,325 @@
+"""Two-phase weekly schedule through the OpenAI Batch API.
+
+``batch_phase: "submit"`` scrapes the scheduled dates and submits one batch of
+``MENU_TOOL`` requests; ``batch_phase: "collect"`` polls the job and, once it is
+complete, runs the normal schedule with completions served from the batch
+output. Anything the batch did not answer falls back to a synchronous request.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime, timezone
+from functools import partial
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Protocol
+
+from openai import AsyncOpenAI
+
+from functions import handler, menu_ai
+from functions.archive import open_store
+
+
+SUBMIT = "submit"
+COLLECT = "collect"
+COMPLETED = "completed"
+PENDING_STATUSES = frozenset({"validating", "in_progress", "finalizing"})
+ENDPOINT = "/v1/chat/completions"
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchStatus:
+    status: str
+    output: list[Mapping[str, Any]] | None = None
+
+
+class BatchClient(Protocol):
+    async def submit(self, lines: Sequence[Mapping[str, Any]]) -> str: ...
+
+    async def poll(self, job_id: str) -> BatchStatus: ...
+
+
+class OpenAIBatchClient:
+    """Upload a JSON Lines request file and track the resulting batch job."""
+
+    def __init__(self, api_key: str) -> None:
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    async def submit(self, lines: Sequence[Mapping[str, Any]]) -> str:
+        payload = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+        uploaded = await self.client.files.create(
+            file=("menu-batch.jsonl", payload.encode("utf-8")), purpose="batch"
+        )
+        job = await self.client.batches.create(
+            input_file_id=uploaded.id, endpoint=ENDPOINT, completion_window="24h"
+        )
+        return job.id
+
+    async def poll(self, job_id: str) -> BatchStatus:
+        job = await self.client.batches.retrieve(job_id)
+        if job.status != COMPLETED:
+            return BatchStatus(job.status)
+        if not job.output_file_id:
+            return BatchStatus(COMPLETED, [])
+        content = await self.client.files.content(job.output_file_id)
+        return BatchStatus(
+            COMPLETED,
+            [json.loads(line) for line in content.text.splitlines() if line.strip()],
+        )
+
+
+class LocalBatchEndpoint:
+    """In-process stand-in for the Batch API used by tests and local runs.
+
+    ``responder`` maps one chat-completion request body to a completion body;
+    jobs report ``in_progress`` for ``pending_polls`` polls before completing.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[Mapping[str, Any]], Mapping[str, Any]],
+        *,
+        pending_polls: int = 1,
+    ) -> None:
+        self.responder = responder
+        self.pending_polls = pending_polls
+        self.jobs: dict[str, list[Mapping[str, Any]]] = {}
+        self.polls: dict[str, int] = {}
+
+    async def submit(self, lines: Sequence[Mapping[str, Any]]) -> str:
+        job_id = f"batch_local_{len(self.jobs) + 1}"
+        self.jobs[job_id] = [dict(line) for line in lines]
+        self.polls[job_id] = 0
+        return job_id
+
+    async def poll(self, job_id: str) -> BatchStatus:
+        if job_id not in self.jobs:
+            return BatchStatus("failed")
+        self.polls[job_id] += 1
+        if self.polls[job_id] <= self.pending_polls:
+            return BatchStatus("in_progress")
+        output: list[Mapping[str, Any]] = []
+        for line in self.jobs[job_id]:
+            try:
+                body = self.responder(line["body"])
+            except Exception as error:
+                output.append(
+                    {
+                        "custom_id": line["custom_id"],
+                        "response": None,
+                        "error": {"message": type(error).__name__},
+                    }
+                )
+                continue
+            output.append(
+                {
+                    "custom_id": line["custom_id"],
+                    "response": {"status_code": 200, "body": body},
+                }
+            )
+        return BatchStatus(COMPLETED, output)
+
+
+def open_batch_client(config: Mapping[str, Any]) -> BatchClient:
+    return OpenAIBatchClient(config["gpt_api_key"])
+
+
+def request_id(restaurant: str, raw_source: str, source_english: Sequence[str]) -> str:
+    encoded = json.dumps(
+        [restaurant, raw_source, list(source_english)], ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def _namespace(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+
+def _state_key(operation: str, job_id: str) -> str:
+    return f"batch-jobs/{operation}/{job_id}.json"
+
+
+async def _scheduled_meals(
+    config: Mapping[str, Any], dates: Sequence[str]
+) -> list[Mapping[str, Any]]:
+    if config["restaurant"] == "DORMITORY":
+        units: list[tuple[str, Sequence[str] | None]] = [(dates[0], dates)]
+    else:
+        units = [(target_date, None) for target_date in dates]
+    meals: list[Mapping[str, Any]] = []
+    for target_date, requested_dates in units:
+        try:
+            meals.extend(
+                await handler.scrape(config, target_date, requested_dates=requested_dates)
+            )
+        except Exception as error:
+            # The collect phase scrapes again and applies the usual error policy.
+            handler.emit_event(
+                "WARNING",
+                "batch.source.skipped",
+                "scrape",
+                date=target_date,
+                error_type=type(error).__name__,
+            )
+    return meals
+
+
+async def submit(
+    config: Mapping[str, Any], dates: Sequence[str], store: Any
+) -> dict[str, Any]:
+    lines: dict[str, dict[str, Any]] = {}
+    for raw_meal in await _scheduled_meals(config, dates):
+        raw_text = raw_meal.get("raw_text", "")
+        if raw_meal.get("outcome", "SUCCESS") != "SUCCESS" or not raw_text:
+            continue
+        evidence = tuple(raw_meal.get("source_english", ()))
+        custom_id = request_id(config["restaurant"], raw_text, evidence)
+        lines[custom_id] = {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": menu_ai.completion_request(config["restaurant"], raw_text, evidence),
+        }
+    job_id = None
+    if lines:
+        job_id = await open_batch_client(config).submit(list(lines.values()))
+        store.put_object(
+            Key=_state_key(config["operation"], job_id),
+            Body=json.dumps(
+                {
+                    "job_id": job_id,
+                    "dates": list(dates),
+                    "requests": len(lines),
+                    "submitted_at": datetime.now(timezone.utc).isoformat(
+                        timespec="seconds"
+                    ),
+                }
+            ).encode("utf-8"),
+        )
+    handler.emit_event(
+        "INFO", "batch.submitted", "interpret", job_id=job_id, requests=len(lines)
+    )
+    return {
+        "batch_phase": SUBMIT,
+        "job_id": job_id,
+        "requests": len(lines),
+        "dates": list(dates),
+    }
+
+
+class _BatchCompletions:
+    """``request_completion`` seam answering from batch output, else synchronously."""
+
+    def __init__(self, output: Sequence[Mapping[str, Any]]) -> None:
+        self.responses: dict[str, Mapping[str, Any]] = {}
+        for line in output:
+            response = line.get("response")
+            if isinstance(response, Mapping) and response.get("status_code") == 200:
+                self.responses[str(line.get("custom_id"))] = response["body"]
+        self.hits = 0
+        self.misses = 0
+
+    async def __call__(
+        self,
+        client: Any,
+        restaurant: str,
+        raw_source: str,
+        source_english: tuple[str, ...],
+        **options: Any,
+    ) -> object:
+        body = self.responses.get(request_id(restaurant, raw_source, source_english))
+        if body is not None:
+            self.hits += 1
+            return _namespace(body)
+        self.misses += 1
+        return await menu_ai._request_completion(
+            client, restaurant, raw_source, source_english, **options
+        )
+
+
+async def collect(
+    config: Mapping[str, Any],
+    job_id: str | None,
+    dates: Sequence[str],
+    store: Any,
+    *,
+    abandon: bool = False,
+) -> dict[str, Any]:
+    status = BatchStatus("missing")
+    if job_id is not None:
+        raw_state = store.get_object(Key=_state_key(config["operation"], job_id))
+        if raw_state is not None:
+            dates = json.loads(raw_state)["dates"]
+            status = BatchStatus("abandoned")
+            if not abandon:
+                status = await open_batch_client(config).poll(job_id)
+    if status.status in PENDING_STATUSES:
+        return {"batch_phase": COLLECT, "status": "pending", "job_id": job_id}
+
+    completions = _BatchCompletions(status.output or [])
+    plan = handler._plan_for(config)
+    bound = dict(plan.clients)
+    bound["interpret_menu"] = partial(bound["interpret_menu"], request_completion=completions)
+    token = handler._active_plan.set(
+        dataclasses.replace(plan, clients=MappingProxyType(bound))
+    )
+    try:
+        results = await handler.schedule_results(config, dates)
+    finally:
+        handler._active_plan.reset(token)
+    handler.emit_event(
+        "INFO",
+        "batch.collected",
+        "interpret",
+        job_id=job_id,
+        batch_status=status.status,
+        batch_hits=completions.hits,
+        synchronous_fallbacks=completions.misses,
+    )
+    return {
+        "batch_phase": COLLECT,
+        "status": "completed",
+        "job_id": job_id,
+        "batch_status": status.status,
+        "results": results,
+    }
+
+
+async def run_batch_phase(
+    config: Mapping[str, Any], request: Mapping[str, Any], event: object
+) -> dict[str, Any]:
+    payload = handler._mapping(event)
+    phase = payload.get("batch_phase")
+    state_uri = config.get("batch_state_uri")
+    if phase not in {SUBMIT, COLLECT}:
+        return handler._invalid_response("invalid batch phase")
+    if not isinstance(state_uri, str):
+        return handler._invalid_response("batch state store is not configured")
+    store = open_store(state_uri)
+    raw_dates = payload.get("batch_dates")
+    dates = (
+        [date for item in raw_dates if (date := handler._date(item)) is not None]
+        if isinstance(raw_dates, list)
+        else []
+    ) or handler._dates_for(config, request)
+    if phase == SUBMIT:
+        return handler._response(200, await submit(config, dates, store))
+    job_id = payload.get("batch_job_id")
+    job_id = job_id if isinstance(job_id, str) and job_id else None
+    return handler._response(
+        200,
+        await collect(
+            config,
+            job_id,
+            dates,
+            store,
+            abandon=handler._boolean(payload.get("batch_abandon")),
+        ),
+    )
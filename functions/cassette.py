@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Mapping
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+
+from functions import clients, menu_ai
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+_SENSITIVE_QUERY_MARKERS = ("key", "token", "secret", "signature", "password")
+_RECORDED_HEADERS = ("ETag", "Last-Modified")
+_replayed_error_types: dict[str, type[Exception]] = {}
+
+
+class CassetteMissError(RuntimeError):
+    """Replay found no recorded exchange for an outbound request."""
+
+
+def _digest(*parts: object) -> str:
+    encoded = json.dumps(parts, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _sensitive(name: str) -> bool:
+    return any(marker in name.lower() for marker in _SENSITIVE_QUERY_MARKERS)
+
+
+def _redact_url(url: str, params: Mapping[str, Any] | None = None) -> str:
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query.extend((str(name), str(value)) for name, value in (params or {}).items())
+    safe_query = [
+        (name, "[redacted]" if _sensitive(name) else value) for name, value in query
+    ]
+    netloc = parts.hostname or ""
+    if parts.port is not None:
+        netloc = f"{netloc}:{parts.port}"
+    return urlunsplit((parts.scheme, netloc, parts.path, urlencode(safe_query), ""))
+
+
+def _request_key(url: str, kwargs: Mapping[str, Any]) -> str:
+    key = f"GET {_redact_url(url, kwargs.get('params'))}"
+    headers = kwargs.get("headers")
+    # Conditional probes of one URL differ only by their validators.
+    return f"{key} {_digest(sorted(headers.items()))}" if headers else key
+
+
+def _replayed_error(error_type: str, status: int | None) -> Exception:
+    error_class = _replayed_error_types.get(error_type)
+    if error_class is None:
+        error_class = type(error_type.replace(".", "_"), (RuntimeError,), {})
+        _replayed_error_types[error_type] = error_class
+    error = error_class("replayed dependency failure")
+    error.status = status  # pyright: ignore[reportAttributeAccessIssue]
+    return error
+
+
+def _status(error: BaseException) -> int | None:
+    status = getattr(error, "status", None)
+    return status if isinstance(status, int) else None
+
+
+class Cassette:
+    """Append-only JSON Lines log of outbound exchanges, replayable by request key."""
+
+    def __init__(self, mode: str, path: Path, latency_scale: float = 1.0) -> None:
+        if mode not in {RECORD, REPLAY}:
+            raise ValueError(f"unsupported cassette mode: {mode}")
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self.recorded: list[dict[str, Any]] = []
+        self._queues: dict[tuple[str, str], deque[dict[str, Any]]] = defaultdict(deque)
+        if mode == REPLAY:
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    exchange = json.loads(line)
+                    self._queues[(exchange["dependency"], exchange["key"])].append(exchange)
+
+    def record(
+        self,
+        dependency: str,
+        key: str,
+        started: float,
+        *,
+        error: BaseException | None = None,
+        **response: Any,
+    ) -> None:
+        exchange: dict[str, Any] = {
+            "dependency": dependency,
+            "key": key,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            **response,
+        }
+        if error is not None:
+            exchange["error_type"] = type(error).__name__
+            exchange["status"] = _status(error)
+        self.recorded.append(exchange)
+
+    async def replay(self, dependency: str, key: str) -> dict[str, Any]:
+        queue = self._queues.get((dependency, key))
+        if not queue:
+            raise CassetteMissError(f"no recorded {dependency} exchange")
+        exchange = queue.popleft()
+        delay = float(exchange.get("latency_ms", 0)) * self.latency_scale / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+        error_type = exchange.get("error_type")
+        if isinstance(error_type, str) and exchange.get("stage", "request") == "request":
+            raise _replayed_error(error_type, exchange.get("status"))
+        return exchange
+
+    def finish(self) -> None:
+        """Append this run's exchanges so several invocations share one cassette."""
+        if self.mode != RECORD or not self.recorded:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as stream:
+            for exchange in self.recorded:
+                stream.write(json.dumps(exchange, ensure_ascii=False) + "\n")
+        self.recorded.clear()
+
+    def bind(
+        self, bound: Mapping[str, Callable[..., Any]]
+    ) -> dict[str, Callable[..., Any]]:
+        """Wrap an operation plan's clients so every outbound exchange goes through us."""
+        wrappers = {
+            "fetch_meals": self._sessions,
+            "probe_dormitory_page": self._sessions,
+            "interpret_menu": self._interpret_menu,
+            "publish_spring_meal": self._publish_spring_meal,
+            "send_slack_text": self._send_slack_text,
+        }
+        return {
+            name: wrappers[name](client) if name in wrappers else client
+            for name, client in bound.items()
+        }
+
+    def _sessions(self, fetch: Callable[..., Any]) -> Callable[..., Any]:
+        async def fetch_through_cassette(*args: Any, **kwargs: Any) -> Any:
+            inner = kwargs.pop("session_factory", None) or aiohttp.ClientSession
+
+            def session_factory() -> Any:
+                if self.mode == REPLAY:
+                    return _ReplaySession(self)
+                return _RecordingSession(inner(), self)
+
+            return await fetch(*args, session_factory=session_factory, **kwargs)
+
+        return fetch_through_cassette
+
+    def _interpret_menu(self, interpret_menu: Callable[..., Any]) -> Callable[..., Any]:
+        # Record through whatever the plan installed (hedging, for one), so the
+        # cassette holds what production would have run.
+        installed = getattr(interpret_menu, "keywords", {}).get("request_completion")
+
+        async def request_completion(
+            client: Any,
+            restaurant: str,
+            raw_source: str,
+            source_english: tuple[str, ...],
+            **prompt_options: Any,
+        ) -> object:
+            options = [value for value in prompt_options.values() if value]
+            key = f"{restaurant}:{_digest(raw_source, source_english, *options)}"
+            if self.mode == REPLAY:
+                exchange = await self.replay("openai", key)
+                return _completion(exchange.get("tool_calls"))
+            started = time.perf_counter()
+            try:
+                response = await (installed or menu_ai._request_completion)(
+                    client, restaurant, raw_source, source_english, **prompt_options
+                )
+            except Exception as error:
+                self.record("openai", key, started, error=error)
+                raise
+            self.record("openai", key, started, tool_calls=_tool_calls(response))
+            return response
+
+        return partial(interpret_menu, request_completion=request_completion)
+
+    def _publish_spring_meal(self, publish: Callable[..., Any]) -> Callable[..., Any]:
+        async def publish_spring_meal(**kwargs: Any) -> Any:
+            key = ":".join(
+                str(kwargs.get(name))
+                for name in ("environment", "date", "restaurant", "time")
+            )
+            if self.mode == REPLAY:
+                exchange = await self.replay("spring", key)
+                return clients.SpringPublishResult(
+                    accepted=True,
+                    unmatched_main_menus=tuple(exchange.get("unmatched_main_menus", ())),
+                    warnings=tuple(exchange.get("warnings", ())),
+                )
+            started = time.perf_counter()
+            try:
+                result = await publish(**kwargs)
+            except Exception as error:
+                self.record("spring", key, started, error=error)
+                raise
+            self.record(
+                "spring",
+                key,
+                started,
+                unmatched_main_menus=list(getattr(result, "unmatched_main_menus", ())),
+                warnings=list(getattr(result, "warnings", ())),
+            )
+            return result
+
+        return publish_spring_meal
+
+    def _send_slack_text(self, send: Callable[..., Any]) -> Callable[..., Any]:
+        async def send_slack_text(**kwargs: Any) -> None:
+            if self.mode == REPLAY:
+                _ = await self.replay("slack", "webhook")
+                return None
+            started = time.perf_counter()
+            try:
+                await send(**kwargs)
+            except Exception as error:
+                self.record("slack", "webhook", started, error=error)
+                raise
+            self.record("slack", "webhook", started)
+            return None
+
+        return send_slack_text
+
+
+def _tool_calls(response: object) -> list[dict[str, Any]] | None:
+    try:
+        tool_calls = response.choices[0].message.tool_calls  # pyright: ignore[reportAttributeAccessIssue]
+        return [
+            {"name": call.function.name, "arguments": call.function.arguments}
+            for call in tool_calls
+        ]
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+def _completion(tool_calls: object) -> object:
+    if not isinstance(tool_calls, list):
+        return SimpleNamespace(choices=[])
+    calls = [
+        SimpleNamespace(
+            function=SimpleNamespace(name=call["name"], arguments=call["arguments"])
+        )
+        for call in tool_calls
+    ]
+    message = SimpleNamespace(tool_calls=calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class _Response:
+    def __init__(
+        self,
+        status: int,
+        body: str,
+        error: BaseException | None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.status = status
+        self.headers = dict(headers or {})
+        self._body = body
+        self._error = error
+
+    def raise_for_status(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def text(self) -> str:
+        return self._body
+
+
+class _RecordedGet:
+    def __init__(
+        self, session: _RecordingSession, url: str, kwargs: dict[str, Any]
+    ) -> None:
+        self._session = session
+        self._url = url
+        self._kwargs = kwargs
+
+    async def __aenter__(self) -> _Response:
+        cassette = self._session.cassette
+        key = _request_key(self._url, self._kwargs)
+        started = time.perf_counter()
+        try:
+            async with self._session.inner.get(self._url, **self._kwargs) as response:
+                try:
+                    response.raise_for_status()
+                except Exception as error:
+                    cassette.record(
+                        "source", key, started, error=error, stage="status", body=""
+                    )
+                    return _Response(response.status, "", error)
+                body = await response.text()
+                response_headers = getattr(response, "headers", None) or {}
+                headers = {
+                    name: response_headers[name]
+                    for name in _RECORDED_HEADERS
+                    if response_headers.get(name)
+                }
+        except Exception as error:
+            cassette.record("source", key, started, error=error)
+            raise
+        cassette.record(
+            "source", key, started, status=response.status, body=body, headers=headers
+        )
+        return _Response(response.status, body, None, headers)
+
+    async def __aexit__(self, *_: object) -> bool:
+        return False
+
+
+class _RecordingSession:
+    def __init__(self, inner: Any, cassette: Cassette) -> None:
+        self.inner = inner
+        self.cassette = cassette
+
+    async def __aenter__(self) -> _RecordingSession:
+        await self.inner.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self.inner.__aexit__(*exc_info)
+
+    def get(self, url: str, **kwargs: Any) -> _RecordedGet:
+        return _RecordedGet(self, url, kwargs)
+
+
+class _ReplayedGet:
+    def __init__(self, cassette: Cassette, url: str, kwargs: Mapping[str, Any]) -> None:
+        self._cassette = cassette
+        self._key = _request_key(url, kwargs)
+
+    async def __aenter__(self) -> _Response:
+        exchange = await self._cassette.replay("source", self._key)
+        error_type = exchange.get("error_type")
+        status = exchange.get("status")
+        error = (
+            _replayed_error(error_type, status) if isinstance(error_type, str) else None
+        )
+        return _Response(
+            status if isinstance(status, int) else 200,
+            exchange.get("body", ""),
+            error,
+            exchange.get("headers"),
+        )
+
+    async def __aexit__(self, *_: object) -> bool:
+        return False
+
+
+class _ReplaySession:
+    def __init__(self, cassette: Cassette) -> None:
+        self._cassette = cassette
+
+    async def __aenter__(self) -> _ReplaySession:
+        return self
+
+    async def __aexit__(self, *_: object) -> bool:
+        return False
+
+    def get(self, url: str, **kwargs: Any) -> _ReplayedGet:
+        return _ReplayedGet(self._cassette, url, kwargs)
+
+
+def cassette_from_environment() -> Cassette | None:
+    """Build the cassette selected by CASSETTE_MODE/CASSETTE_PATH, if any."""
+    mode = os.getenv("CASSETTE_MODE")
+    path = os.getenv("CASSETTE_PATH")
+    if not mode or not path:
+        return None
+    try:
+        latency_scale = max(float(os.getenv("CASSETTE_LATENCY_SCALE", "1")), 0.0)
+    except ValueError:
+        latency_scale = 1.0
+    return Cassette(mode, Path(path), latency_scale)
@@ -0,0 +1,234 @@
+"""Local runner: ``python -m functions <operation> --date YYYYMMDD``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import dataclasses
+import io
+import json
+import os
+import pstats
+import sys
+from datetime import datetime, timedelta
+from functools import partial
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Sequence
+
+from dotenv import load_dotenv
+
+from functions import clients, config, handler, scraper
+
+
+_DRY_RUN_ENVIRONMENT = {
+    "SLACK_WEBHOOK_URL": "http://dry-run.invalid/slack",
+    "API_BASE_URL": "http://dry-run.invalid/prod",
+    "DEV_API_BASE_URL": "http://dry-run.invalid/dev",
+}
+
+
+def _date_argument(value: str) -> str:
+    try:
+        _ = datetime.strptime(value, "%Y%m%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError("dates must use YYYYMMDD") from None
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m functions",
+        description="Run one handler operation locally through orchestrate().",
+    )
+    operations = {*handler.DISPATCH_TABLE, *config.operations()}
+    parser.add_argument("operation", choices=sorted(operations))
+    parser.add_argument("--date", type=_date_argument, help="single target date")
+    parser.add_argument("--start", type=_date_argument, help="first date of a range")
+    parser.add_argument("--end", type=_date_argument, help="last date of a range")
+    parser.add_argument("--soongguri-url", help="Soongguri source stand-in URL")
+    parser.add_argument("--dormitory-url", help="dormitory source stand-in URL")
+    parser.add_argument("--spring-url", help="Spring stand-in for dev and prod")
+    parser.add_argument("--slack-url", help="Slack webhook stand-in URL")
+    parser.add_argument("--openai-url", help="OpenAI-compatible stand-in base URL")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="skip Spring and Slack side effects",
+    )
+    parser.add_argument("--record", metavar="PATH", help="record a cassette to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="replay the cassette at PATH")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="multiplier for replayed latencies (0 disables waiting)",
+    )
+    parser.add_argument("--output", metavar="PATH", help="backfill NDJSON checkpoint")
+    parser.add_argument(
+        "--source",
+        choices=("auto", "archive", "live"),
+        default="auto",
+        help="backfill page source",
+    )
+    parser.add_argument("--concurrency", type=int, help="backfill pages in flight")
+    parser.add_argument(
+        "--publish", action="store_true", help="republish backfilled days to Spring"
+    )
+    parser.add_argument("--profile", metavar="PATH", help="write a pstats dump to PATH")
+    parser.add_argument("--top", type=int, default=20, help="hot functions to print")
+    return parser
+
+
+def target_dates(operation: str, args: argparse.Namespace) -> list[str | None]:
+    """Expand --date/--start/--end into one target date per invocation."""
+    if args.start is None and args.end is None:
+        return [args.date]
+    if args.date is not None or args.start is None or args.end is None:
+        raise ValueError("use either --date or both --start and --end")
+    start = datetime.strptime(args.start, "%Y%m%d")
+    end = datetime.strptime(args.end, "%Y%m%d")
+    if end < start:
+        raise ValueError("--end must not precede --start")
+    # Direct dormitory scrapes already cover seven days from their target date.
+    step = 7 if operation == "scrape_dormitory" else 1
+    return [
+        (start + timedelta(days=offset)).strftime("%Y%m%d")
+        for offset in range(0, (end - start).days + 1, step)
+    ]
+
+
+def _configure_environment(args: argparse.Namespace) -> None:
+    overrides = {
+        "API_BASE_URL": args.spring_url,
+        "DEV_API_BASE_URL": args.spring_url,
+        "SLACK_WEBHOOK_URL": args.slack_url,
+        "OPENAI_BASE_URL": args.openai_url,
+    }
+    if args.record or args.replay:
+        overrides["CASSETTE_MODE"] = "record" if args.record else "replay"
+        overrides["CASSETTE_PATH"] = args.record or args.replay
+        overrides["CASSETTE_LATENCY_SCALE"] = str(args.latency_scale)
+    for name, value in overrides.items():
+        if value:
+            os.environ[name] = value
+    if args.dry_run:
+        for name, value in _DRY_RUN_ENVIRONMENT.items():
+            os.environ.setdefault(name, value)
+    if args.profile:
+        # cProfile only sees the main thread; parse there instead of the pool.
+        os.environ[scraper.PARSE_WORKERS_ENVIRONMENT] = "0"
+
+
+async def _skip_spring(**_: Any) -> clients.SpringPublishResult:
+    return clients.SpringPublishResult(accepted=True)
+
+
+async def _skip_slack(**_: Any) -> None:
+    return None
+
+
+def _local_plan(operation: str, args: argparse.Namespace) -> handler.OperationPlan | None:
+    plan = handler.load_operation_plan(operation)
+    if plan is None:
+        return None
+    bound = dict(plan.clients)
+    source_urls = {
+        "soongguri_base_url": args.soongguri_url,
+        "dormitory_base_url": args.dormitory_url,
+    }
+    source_urls = {name: value for name, value in source_urls.items() if value}
+    if source_urls and "fetch_meals" in bound:
+        bound["fetch_meals"] = partial(bound["fetch_meals"], **source_urls)
+    outbox = plan.outbox
+    if args.dry_run:
+        if "publish_spring_meal" in bound:
+            bound["publish_spring_meal"] = _skip_spring
+        bound["send_slack_text"] = _skip_slack
+        outbox = None
+    local_plan = dataclasses.replace(
+        plan, clients=MappingProxyType(bound), outbox=outbox
+    )
+    handler.pin_operation_plan(local_plan)
+    return local_plan
+
+
+async def run_operation(operation: str, dates: Sequence[str | None]) -> list[dict[str, Any]]:
+    responses: list[dict[str, Any]] = []
+    for index, target_date in enumerate(dates):
+        event: dict[str, Any] = {"operation": operation, "trigger": "local"}
+        if target_date is not None:
+            event["target_date"] = target_date
+        context = SimpleNamespace(aws_request_id=f"local-{index}")
+        responses.append(await handler.orchestrate(event, context))
+    return responses
+
+
+def backfill_event(operation: str, args: argparse.Namespace) -> dict[str, Any]:
+    """Build the single event a backfill operation consumes for its whole range."""
+    if args.start is None or args.end is None or args.date is not None:
+        raise ValueError("backfill needs --start and --end")
+    event: dict[str, Any] = {
+        "operation": operation,
+        "trigger": "local",
+        "start_date": args.start,
+        "end_date": args.end,
+        "source": args.source,
+        "publish": args.publish and not args.dry_run,
+    }
+    if args.output:
+        event["output"] = args.output
+    if args.concurrency is not None:
+        event["concurrency"] = args.concurrency
+    return event
+
+
+def hot_functions(profile: cProfile.Profile, top: int) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    _ = stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return stream.getvalue()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    configured = os.getenv("OPERATION") or os.getenv("HANDLER_OPERATION")
+    if configured and configured != args.operation:
+        parser.error(f"OPERATION is set to {configured}; unset it to run locally")
+    if args.record and args.replay:
+        parser.error("use either --record or --replay")
+    if args.dry_run and args.operation == "drain_notifications":
+        parser.error("drain_notifications has no dry run; it deletes what it sends")
+    backfill = args.operation.startswith("backfill_")
+    try:
+        if backfill:
+            event = backfill_event(args.operation, args)
+        else:
+            dates = target_dates(args.operation, args)
+    except ValueError as error:
+        parser.error(str(error))
+
+    _ = load_dotenv()
+    _configure_environment(args)
+    if _local_plan(args.operation, args) is None:
+        parser.error("operation configuration mismatch")
+
+    profile = cProfile.Profile() if args.profile else None
+    if profile is not None:
+        profile.enable()
+    try:
+        if backfill:
+            context = SimpleNamespace(aws_request_id="local-backfill")
+            responses = [asyncio.run(handler.orchestrate(event, context))]
+        else:
+            responses = asyncio.run(run_operation(args.operation, dates))
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(args.profile)
+            print(hot_functions(profile, args.top), file=sys.stderr)
+
+    for response in responses:
+        print(json.dumps(response, ensure_ascii=False))
+    return 0 if all(response["statusCode"] == 200 for response in responses) else 1
@@ -6,6 +6,8 @@ from typing import Mapping, Optional, Sequence, Tuple
 import aiohttp
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
+from functions import metrics
+
 
 _HTTP_TIMEOUT_SECONDS = 10
 _RESPONSE_PARSE_WARNING = "Spring accepted the meal but returned malformed JSON"
@@ -126,6 +128,7 @@ def _parse_spring_response(body: str) -> SpringPublishResult:
     wait=wait_fixed(2),
     reraise=True,
 )
+@metrics.timed("spring.publish.latency", argument_dimensions=("environment",))
 async def publish_spring_meal(
     *,
     base_url: str,
@@ -177,6 +180,7 @@ async def publish_spring_meal(
     wait=wait_fixed(2),
     reraise=True,
 )
+@metrics.timed("slack.send.latency")
 async def send_slack_text(*, webhook_url: str, text: str) -> None:
     payload = {
         "username": "학식봇",
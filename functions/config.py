@@ -4,50 +4,37 @@ import os
 from types import MappingProxyType
 from typing import Any, Mapping
 
+from functions import sources
 
-_RESTAURANTS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
-    {
-        "DODAM": {
-            "name_ko": "도담식당",
-            "week_days": 6,
-            "slots": {"중식": ("LUNCH", 6000), "석식": ("DINNER", 6000)},
-        },
-        "HAKSIK": {
-            "name_ko": "학생식당",
-            "week_days": 5,
-            "slots": {"중식": ("LUNCH", 5000), "석식": ("MORNING", 1000)},
-            "special_note": "석식 메뉴는 1000원 조식으로 처리됨",
-        },
-        "FACULTY": {
-            "name_ko": "교직원식당",
-            "week_days": 5,
-            "slots": {"중식": ("LUNCH", 7000)},
-            "special_note": "교직원식당은 점심만 운영됩니다",
-        },
-        "DORMITORY": {
-            "name_ko": "기숙사식당",
-            "week_days": 7,
-            "slots": {"중식": ("LUNCH", 5500), "석식": ("DINNER", 5500)},
-            "special_note": "기숙사식당은 조식을 운영하지 않습니다",
-        },
-    }
-)
 
-_OPERATIONS = MappingProxyType(
+# Restaurant operations come from the source registry; these serve the service.
+_SERVICE_OPERATIONS = MappingProxyType(
     {
-        "scrape_dodam": ("scrape", "DODAM"),
-        "scrape_haksik": ("scrape", "HAKSIK"),
-        "scrape_faculty": ("scrape", "FACULTY"),
-        "scrape_dormitory": ("scrape", "DORMITORY"),
-        "schedule_dodam": ("schedule", "DODAM"),
-        "schedule_haksik": ("schedule", "HAKSIK"),
-        "schedule_faculty": ("schedule", "FACULTY"),
-        "schedule_dormitory": ("schedule", "DORMITORY"),
         "notify_final_failure": ("final_failure", "DORMITORY"),
+        "drain_notifications": ("drain", "DORMITORY"),
+        "probe_dormitory": ("probe", "DORMITORY"),
     }
 )
 
 
+CONFIG_ENVIRONMENT = (
+    "SLACK_WEBHOOK_URL",
+    "GPT_API_KEY",
+    "DEV_API_BASE_URL",
+    "API_BASE_URL",
+    "PAGE_ARCHIVE_URI",
+    "TRANSLATION_MEMORY_URI",
+    "RULE_INTERPRETER_MIN_CONFIDENCE",
+    "OPENAI_HEDGE_PERCENTILE",
+    "OPENAI_HEDGE_BUDGET",
+    "BATCH_STATE_URI",
+    "PROMPT_TOKEN_BUDGET",
+    "NOTIFICATION_OUTBOX_URI",
+    "PARTIAL_WEEK_STATE_URI",
+    "SOURCE_SPECS_URI",
+)
+
+
 def _required_environment(name: str) -> str:
     value = os.getenv(name)
     if not value:
@@ -55,22 +42,82 @@ def _required_environment(name: str) -> str:
     return value
 
 
+def _confidence_environment(name: str) -> float:
+    try:
+        value = float(os.environ[name])
+    except ValueError:
+        value = -1.0
+    if not 0.0 <= value <= 1.0:
+        raise RuntimeError(f"invalid configuration: {name}")
+    return value
+
+
+def _percentile_environment(name: str) -> float:
+    try:
+        value = float(os.environ[name])
+    except ValueError:
+        value = -1.0
+    if not 0.0 < value < 100.0:
+        raise RuntimeError(f"invalid configuration: {name}")
+    return value
+
+
+def _count_environment(name: str, *, default: int) -> int:
+    raw_value = os.getenv(name)
+    if not raw_value:
+        return default
+    if not raw_value.isdigit():
+        raise RuntimeError(f"invalid configuration: {name}")
+    return int(raw_value)
+
+
+def operations() -> dict[str, tuple[str, str]]:
+    """``operation -> (kind, restaurant)`` for the service and every source."""
+    return {**sources.operations(), **_SERVICE_OPERATIONS}
+
+
 def load_operation_config(operation: str) -> Mapping[str, Any] | None:
-    spec = _OPERATIONS.get(operation)
+    spec = operations().get(operation)
     if spec is None:
         return None
 
     kind, restaurant = spec
+    source = sources.registry()[restaurant]
     config: dict[str, Any] = {
         "operation": operation,
         "kind": kind,
         "restaurant": restaurant,
-        **_RESTAURANTS[restaurant],
+        **source.settings,
         "slack_webhook_url": _required_environment("SLACK_WEBHOOK_URL"),
     }
-    if kind != "final_failure":
+    if kind == "drain":
+        config["notification_outbox_uri"] = _required_environment(
+            "NOTIFICATION_OUTBOX_URI"
+        )
+    elif os.getenv("NOTIFICATION_OUTBOX_URI"):
+        config["notification_outbox_uri"] = os.environ["NOTIFICATION_OUTBOX_URI"]
+    if kind not in {"final_failure", "drain", "probe"}:
         config["gpt_api_key"] = _required_environment("GPT_API_KEY")
         config["dev_api_base_url"] = _required_environment("DEV_API_BASE_URL")
-    if kind == "schedule":
+        if os.getenv("PAGE_ARCHIVE_URI"):
+            config["page_archive_uri"] = os.environ["PAGE_ARCHIVE_URI"]
+        if restaurant == "DORMITORY" and os.getenv("TRANSLATION_MEMORY_URI"):
+            config["translation_memory_uri"] = os.environ["TRANSLATION_MEMORY_URI"]
+        if restaurant != "DORMITORY" and os.getenv("RULE_INTERPRETER_MIN_CONFIDENCE"):
+            config["rule_min_confidence"] = _confidence_environment(
+                "RULE_INTERPRETER_MIN_CONFIDENCE"
+            )
+        config["prompt_token_budget"] = _count_environment(
+            "PROMPT_TOKEN_BUDGET", default=source.spec.prompt_token_budget
+        )
+        if os.getenv("OPENAI_HEDGE_PERCENTILE"):
+            config["hedge_percentile"] = _percentile_environment("OPENAI_HEDGE_PERCENTILE")
+            config["hedge_budget"] = _count_environment("OPENAI_HEDGE_BUDGET", default=4)
+    if kind in {"schedule", "backfill"}:
         config["api_base_url"] = _required_environment("API_BASE_URL")
+    if kind == "schedule" and os.getenv("BATCH_STATE_URI"):
+        config["batch_state_uri"] = os.environ["BATCH_STATE_URI"]
+    partial_week = kind == "schedule" and restaurant == "DORMITORY"
+    if partial_week and os.getenv("PARTIAL_WEEK_STATE_URI"):
+        config["partial_week_state_uri"] = os.environ["PARTIAL_WEEK_STATE_URI"]
     return MappingProxyType(config)
@@ -2,36 +2,165 @@ from __future__ import annotations
 
 import asyncio
 import contextvars
+import dataclasses
 import hashlib
 import importlib
 import json
 import logging
 import os
+import queue
 import re
 import sys
+import threading
+import time
 from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from types import MappingProxyType
 from typing import Any, Awaitable, Callable, Mapping, Sequence
 from zoneinfo import ZoneInfo
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the fastjson extra
+    orjson = None
+
+# Match json.dumps(default=str) for values orjson would otherwise encode natively.
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
 
 logger = logging.getLogger(__name__)
 
+_OBSERVATION_FLUSH_TIMEOUT_SECONDS = 5.0
+
 _observation_context: contextvars.ContextVar[Mapping[str, Any]] = contextvars.ContextVar(
     "observation_context", default={}
 )
+_active_plan: contextvars.ContextVar[OperationPlan | None] = contextvars.ContextVar(
+    "active_plan", default=None
+)
+
+
+class _ObservationFormatter(logging.Formatter):
+    """Encode an event mapping as one compact JSON line, with orjson if installed."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = record.msg
+        if not isinstance(event, Mapping):
+            return record.getMessage()
+        if orjson is not None:
+            encoded = orjson.dumps(event, default=str, option=_ORJSON_OPTIONS)
+            return encoded.decode("utf-8")
+        return json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class ObservationQueueHandler(logging.StreamHandler):
+    """Stream handler whose encoding and writes run on a background writer thread.
+
+    ``emit`` only enqueues the record; the writer formats whatever has queued
+    up and writes it with a single flush. ``flush`` blocks until the queue is
+    empty, which ``orchestrate`` relies on before returning.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        super().__init__(stream)
+        self.setFormatter(_ObservationFormatter())
+        self.records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._stream_lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._writer: threading.Thread | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=self._write_forever, name="observation-writer", daemon=True
+                    )
+                    self._writer.start()
+        with self._idle:
+            self._pending += 1
+        self.records.put(record)
+
+    def _write_forever(self) -> None:
+        while True:
+            batch = [self.records.get()]
+            while True:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            lines: list[str] = []
+            for record in batch:
+                try:
+                    lines.append(self.format(record) + self.terminator)
+                except Exception:
+                    self.handleError(record)
+            with self._stream_lock:
+                try:
+                    _ = self.stream.write("".join(lines))
+                    self.stream.flush()
+                except Exception:
+                    self.handleError(batch[-1])
+            with self._idle:
+                self._pending -= len(batch)
+                if not self._pending:
+                    self._idle.notify_all()
+
+    def flush(self) -> None:
+        with self._idle:
+            _ = self._idle.wait_for(
+                lambda: not self._pending, timeout=_OBSERVATION_FLUSH_TIMEOUT_SECONDS
+            )
+        with self._stream_lock:
+            super().flush()
+
+    def setStream(self, stream: Any) -> Any:
+        self.flush()
+        with self._stream_lock:
+            previous, self.stream = self.stream, stream
+        return None if stream is previous else previous
+
+
 _observation_logger = logging.getLogger("food_crawling.observation")
 if not _observation_logger.handlers:
-    _handler = logging.StreamHandler(sys.stdout)
-    _handler.setFormatter(logging.Formatter("%(message)s"))
-    _observation_logger.addHandler(_handler)
+    _observation_logger.addHandler(ObservationQueueHandler(sys.stdout))
 _observation_logger.setLevel(logging.INFO)
 _observation_logger.propagate = False
 
+# EMF documents carry no event.name, so they stay off the observation stream.
+_metrics_logger = logging.getLogger("food_crawling.metrics")
+if not _metrics_logger.handlers:
+    _metrics_logger.addHandler(ObservationQueueHandler(sys.stdout))
+_metrics_logger.setLevel(logging.INFO)
+_metrics_logger.propagate = False
+
 _DATE_PATTERN = re.compile(r"\d{8}")
-_TRIGGERS = frozenset({"direct", "eventbridge", "iam", "local", "step_functions"})
+_TRIGGERS = frozenset(
+    {"direct", "eventbridge", "iam", "local", "step_functions", "warmup"}
+)
 _CONTENT_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+_CLIENT_BINDINGS: Mapping[str, tuple[str, str]] = MappingProxyType(
+    {
+        "fetch_meals": ("functions.scraper", "fetch_meals"),
+        "parse_menu_html": ("functions.scraper", "parse_menu_html"),
+        "interpret_menu": ("functions.menu_ai", "interpret_menu"),
+        "publish_spring_meal": ("functions.clients", "publish_spring_meal"),
+        "format_slack_text": ("functions.clients", "format_slack_text"),
+        "send_slack_text": ("functions.clients", "send_slack_text"),
+        "probe_dormitory_page": ("functions.scraper", "probe_dormitory_page"),
+    }
+)
+_SLACK_CLIENTS = ("format_slack_text", "send_slack_text")
+_PROBE_CLIENTS = ("probe_dormitory_page",)
 
 
 class RetryableEmptyMenuError(Exception):
@@ -116,36 +245,227 @@ def load_operation_config(operation: str) -> Mapping[str, Any] | None:
     return _mapping(loaded) or None
 
 
+@dataclasses.dataclass(frozen=True)
+class OperationPlan:
+    """Per-container compilation of one operation's configuration and clients."""
+
+    config: Mapping[str, Any]
+    environments: tuple[str, ...]
+    critical_environment: str
+    slot_policy: Callable[[object], tuple[str, int] | None]
+    clients: Mapping[str, Callable[..., Any]]
+    parser: Callable[[str, Sequence[str]], list[Any]] | None
+    translation_memory: Any = None
+    fast_path: Any = None
+    hedging: Any = None
+    prompt_budget: Any = None
+    outbox: Any = None
+
+    @property
+    def scheduled(self) -> bool:
+        return self.config["kind"] == "schedule"
+
+
+_OPERATION_PLANS: dict[str, tuple[tuple[str | None, ...], OperationPlan]] = {}
+# Plans for configs built outside an invocation (tests, CLI, backfill, batch).
+_CONFIG_PLANS: dict[str, OperationPlan] = {}
+MAX_CONFIG_PLANS = 32
+
+
+def _compile_slot_policy(
+    slots: Mapping[str, Any],
+) -> Callable[[object], tuple[str, int] | None]:
+    markers = tuple(
+        (marker, (str(policy[0]), int(policy[1])))
+        for marker, policy in slots.items()
+        if isinstance(marker, str)
+    )
+
+    @lru_cache(maxsize=64)
+    def resolve(source_slot: str) -> tuple[str, int] | None:
+        return next((policy for marker, policy in markers if marker in source_slot), None)
+
+    def match(source_slot: object) -> tuple[str, int] | None:
+        return resolve(source_slot) if isinstance(source_slot, str) else None
+
+    return match
+
+
+def _bind_client(name: str) -> Callable[..., Any]:
+    module_name, attribute = _CLIENT_BINDINGS[name]
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _archive_sink(archive: Any) -> Callable[[str, str, str], None]:
+    def sink(restaurant: str, date: str, html_content: str) -> None:
+        try:
+            page = archive.put(restaurant, date, html_content)
+        except Exception as error:
+            emit_event(
+                "WARNING",
+                "source.archive.failed",
+                "scrape",
+                date=date,
+                error_type=type(error).__name__,
+            )
+            return
+        emit_event(
+            "INFO", "source.archived", "scrape", date=date, source_sha256=page.sha256[:12]
+        )
+
+    return sink
+
+
+def compile_operation_plan(config: Mapping[str, Any]) -> OperationPlan:
+    """Resolve clients, slot policy and destinations for an already-loaded config."""
+    scheduled = config["kind"] in {"schedule", "backfill"}
+    slack_only = config["kind"] in {"final_failure", "drain"}
+    if config["kind"] == "probe":
+        names = _PROBE_CLIENTS
+    else:
+        names = _SLACK_CLIENTS if slack_only else tuple(_CLIENT_BINDINGS)
+    clients = {name: _bind_client(name) for name in names}
+    archive_uri = config.get("page_archive_uri")
+    if isinstance(archive_uri, str) and "fetch_meals" in clients:
+        archive = importlib.import_module("functions.archive").open_archive(archive_uri)
+        clients["fetch_meals"] = partial(
+            clients["fetch_meals"], page_sink=_archive_sink(archive)
+        )
+    translation_memory = None
+    memory_uri = config.get("translation_memory_uri")
+    if isinstance(memory_uri, str) and "interpret_menu" in clients:
+        translation_memory = importlib.import_module(
+            "functions.translation_memory"
+        ).open_translation_memory(memory_uri)
+        clients["interpret_menu"] = partial(
+            clients["interpret_menu"], translation_memory=translation_memory
+        )
+    fast_path = None
+    min_confidence = config.get("rule_min_confidence")
+    if isinstance(min_confidence, float) and "interpret_menu" in clients:
+        fast_path = importlib.import_module("functions.rule_interpreter").RuleFastPath(
+            min_confidence
+        )
+        clients["interpret_menu"] = partial(clients["interpret_menu"], fast_path=fast_path)
+    hedging = None
+    percentile = config.get("hedge_percentile")
+    if isinstance(percentile, float) and "interpret_menu" in clients:
+        hedging = importlib.import_module("functions.hedging").HedgedCompletion(
+            percentile, config["hedge_budget"]
+        )
+        clients["interpret_menu"] = partial(
+            clients["interpret_menu"], request_completion=hedging.request_completion
+        )
+    prompt_budget = None
+    token_budget = config.get("prompt_token_budget")
+    if isinstance(token_budget, int) and "interpret_menu" in clients:
+        prompt_budget = importlib.import_module("functions.prompt_budget").PromptBudget(
+            token_budget
+        )
+        clients["interpret_menu"] = partial(
+            clients["interpret_menu"], prompt_budget=prompt_budget
+        )
+    outbox = None
+    outbox_uri = config.get("notification_outbox_uri")
+    if isinstance(outbox_uri, str):
+        outbox = importlib.import_module("functions.outbox").open_outbox(outbox_uri)
+    parser = None
+    if "parse_menu_html" in clients:
+        parse_menu_html = clients["parse_menu_html"]
+        restaurant = config["restaurant"]
+
+        def parser(html_content: str, requested_dates: Sequence[str]) -> list[Any]:
+            return parse_menu_html(html_content, restaurant, requested_dates)
+
+    return OperationPlan(
+        config=config,
+        environments=("dev", "prod") if scheduled else ("dev",),
+        critical_environment="prod" if scheduled else "dev",
+        slot_policy=_compile_slot_policy(_mapping(config.get("slots"))),
+        clients=MappingProxyType(clients),
+        parser=parser,
+        translation_memory=translation_memory,
+        fast_path=fast_path,
+        hedging=hedging,
+        prompt_budget=prompt_budget,
+        outbox=outbox,
+    )
+
+
+def _environment_fingerprint() -> tuple[str | None, ...]:
+    config_module = importlib.import_module("functions.config")
+    return tuple(os.getenv(name) for name in config_module.CONFIG_ENVIRONMENT)
+
+
+def load_operation_plan(operation: str) -> OperationPlan | None:
+    """Reuse the warm-container plan until its configuration environment changes."""
+    fingerprint = _environment_fingerprint()
+    cached = _OPERATION_PLANS.get(operation)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    config = load_operation_config(operation)
+    if config is None:
+        return None
+    plan = compile_operation_plan(config)
+    _OPERATION_PLANS[operation] = (fingerprint, plan)
+    return plan
+
+
+def pin_operation_plan(plan: OperationPlan) -> None:
+    """Install a plan with substituted clients for the current environment."""
+    _OPERATION_PLANS[plan.config["operation"]] = (_environment_fingerprint(), plan)
+
+
+def _plan_for(config: Mapping[str, Any]) -> OperationPlan:
+    plan = _active_plan.get()
+    if plan is not None and plan.config is config:
+        return plan
+    key = json.dumps(
+        [_environment_fingerprint(), config], sort_keys=True, default=repr
+    )
+    plan = _CONFIG_PLANS.get(key)
+    if plan is None:
+        if len(_CONFIG_PLANS) >= MAX_CONFIG_PLANS:
+            _ = _CONFIG_PLANS.pop(next(iter(_CONFIG_PLANS)))
+        plan = _CONFIG_PLANS[key] = compile_operation_plan(config)
+    return plan
+
+
+def _client(config: Mapping[str, Any], name: str) -> Callable[..., Any]:
+    clients = _plan_for(config).clients
+    return clients[name] if name in clients else _bind_client(name)
+
+
 async def scrape(
     config: Mapping[str, Any],
     target_date: str,
     requested_dates: Sequence[str] | None = None,
 ) -> Sequence[Mapping[str, Any]]:
     """Call the scraper's frozen record boundary and adapt its attributes."""
-    module = importlib.import_module("functions.scraper")
-    records = await module.fetch_meals(
+    records = await _client(config, "fetch_meals")(
         config["restaurant"], target_date, requested_dates=requested_dates
     )
-    return [
-        {
-            "date": record.date,
-            "restaurant": record.restaurant,
-            "source_slot": record.source_slot,
-            "raw_text": record.raw_text,
-            "source_english": record.source_english,
-            "outcome": record.outcome,
-            "reason_code": record.reason_code,
-        }
-        for record in records
-    ]
+    return [meal_mapping(record) for record in records]
+
+
+def meal_mapping(record: Any) -> dict[str, Any]:
+    """Adapt a scraper ``MealRecord`` to the handler's raw-meal mapping."""
+    return {
+        "date": record.date,
+        "restaurant": record.restaurant,
+        "source_slot": record.source_slot,
+        "raw_text": record.raw_text,
+        "source_english": record.source_english,
+        "outcome": record.outcome,
+        "reason_code": record.reason_code,
+    }
 
 
 async def interpret_menu(
     config: Mapping[str, Any], raw_meal: Mapping[str, Any]
 ) -> Mapping[str, Any]:
     """Lazy patch boundary for the Task 4 menu AI module."""
-    module = importlib.import_module("functions.menu_ai")
-    return await module.interpret_menu(
+    return await _client(config, "interpret_menu")(
         config["gpt_api_key"],
         config["restaurant"],
         raw_meal.get("raw_text", ""),
@@ -157,9 +477,8 @@ async def publish_menu(
     config: Mapping[str, Any], payload: Mapping[str, Any], environment: str
 ) -> Any:
     """Lazy patch boundary for accepted Spring writes in Task 5."""
-    module = importlib.import_module("functions.clients")
     base_url_key = "api_base_url" if environment == "prod" else "dev_api_base_url"
-    return await module.publish_spring_meal(
+    return await _client(config, "publish_spring_meal")(
         base_url=config[base_url_key],
         environment=environment,
         date=payload["date"],
@@ -173,9 +492,21 @@ async def publish_menu(
 
 async def notify_slack(config: Mapping[str, Any], notification: Mapping[str, Any]) -> Any:
     """Lazy patch boundary; final failure reaches only this client function."""
-    module = importlib.import_module("functions.clients")
-    text = module.format_slack_text(notification)
-    return await module.send_slack_text(
+    text = _client(config, "format_slack_text")(notification)
+    outbox = _plan_for(config).outbox
+    if outbox is not None:
+        message_id = outbox.enqueue(
+            text, type=notification.get("type"), operation=config["operation"]
+        )
+        emit_event(
+            "INFO",
+            "notification.enqueued",
+            "notification",
+            notification_type=notification.get("type"),
+            message_id=message_id,
+        )
+        return message_id
+    return await _client(config, "send_slack_text")(
         webhook_url=config["slack_webhook_url"], text=text
     )
 
@@ -193,9 +524,85 @@ def emit_event(level: str, event_name: str, stage: str, **fields: Any) -> None:
         "log.level": level.upper(),
         **{key: value for key, value in fields.items() if value is not None},
     }
-    _observation_logger.log(
-        getattr(logging, level.upper(), logging.INFO),
-        json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str),
+    levelno = getattr(logging, level.upper(), logging.INFO)
+    if _observation_logger.isEnabledFor(levelno):
+        # makeRecord skips the caller-frame lookup that logger.log performs.
+        _observation_logger.handle(
+            _observation_logger.makeRecord(
+                _observation_logger.name, levelno, __file__, 0, event, None, None
+            )
+        )
+
+
+def _write_metrics(document: Mapping[str, Any]) -> None:
+    _metrics_logger.handle(
+        _metrics_logger.makeRecord(
+            _metrics_logger.name, logging.INFO, __file__, 0, document, None, None
+        )
+    )
+
+
+def flush_observations() -> None:
+    """Block until every queued observation event has reached its stream."""
+    for log_handler in (*_observation_logger.handlers, *_metrics_logger.handlers):
+        log_handler.flush()
+
+
+def _report_interpreter_usage(plan: OperationPlan) -> None:
+    """Emit and reset the per-invocation counters of the plan's interpreter aids."""
+    if plan.translation_memory is not None:
+        _report_translation_memory(plan.translation_memory)
+    if plan.fast_path is not None:
+        emit_event("INFO", "menu_ai.fast_path", "interpret", **plan.fast_path.take_stats())
+    if plan.hedging is not None:
+        emit_event("INFO", "menu_ai.hedging", "interpret", **plan.hedging.take_stats())
+    if plan.prompt_budget is not None and plan.prompt_budget.prompts:
+        emit_event(
+            "INFO", "menu_ai.prompt_tokens", "interpret", **plan.prompt_budget.take_stats()
+        )
+
+
+def _report_translation_memory(memory: Any) -> None:
+    stats = memory.take_stats()
+    try:
+        stats["new_translations"] = memory.flush()
+    except Exception as error:
+        emit_event(
+            "WARNING",
+            "menu_ai.translation_memory.flush_failed",
+            "interpret",
+            error_type=type(error).__name__,
+        )
+    emit_event("INFO", "menu_ai.translation_memory", "interpret", **stats)
+
+
+def _report_slow_invocation(profiler: Any, started: float, invocation_id: str) -> None:
+    profiler.stop()
+    duration_ms = round((time.perf_counter() - started) * 1000)
+    if duration_ms < profiler.threshold_ms:
+        return
+    profiling = importlib.import_module("functions.profiling")
+    try:
+        path = profiling.write_profile(profiler, invocation_id)
+    except OSError as error:
+        path = None
+        emit_event(
+            "WARNING",
+            "handler.invocation.profile.write_failed",
+            "handler",
+            error_type=type(error).__name__,
+        )
+    emit_event(
+        "INFO",
+        "handler.invocation.profile",
+        "handler",
+        duration_ms=duration_ms,
+        threshold_ms=profiler.threshold_ms,
+        samples=profiler.samples,
+        sampler_overhead_ms=round(profiler.overhead_seconds * 1000, 3),
+        profile_format="collapsed",
+        profile_path=path,
+        profile=None if path else profiler.collapsed(profiling.EVENT_STACK_LIMIT),
     )
 
 
@@ -221,13 +628,7 @@ def _dates_for(config: Mapping[str, Any], request: Mapping[str, Any]) -> list[st
 
 
 def _slot_policy(config: Mapping[str, Any], source_slot: object) -> tuple[str, int] | None:
-    if not isinstance(source_slot, str):
-        return None
-    for marker, policy in _mapping(config.get("slots")).items():
-        if isinstance(marker, str) and marker in source_slot:
-            time_slot, price = policy
-            return str(time_slot), int(price)
-    return None
+    return _plan_for(config).slot_policy(source_slot)
 
 
 def _result_value(result: Any, name: str, default: Any) -> Any:
@@ -273,14 +674,33 @@ def _main_menus(
     return validated
 
 
-async def _process_source_date(
+def _meal_payload(
+    config: Mapping[str, Any],
+    meal_date: str,
+    policy: tuple[str, int],
+    menu_names: list[str],
+    main_menus: list[dict[str, str]],
+) -> dict[str, Any]:
+    time_slot, price = policy
+    payload: dict[str, Any] = {
+        "date": meal_date,
+        "restaurant": config["restaurant"],
+        "time": time_slot,
+        "price": price,
+        "menuNames": menu_names,
+    }
+    if main_menus:
+        payload["mainMenus"] = main_menus
+    return payload
+
+
+async def _scrape_or_empty(
     config: Mapping[str, Any],
     target_date: str,
-    *,
-    scheduled: bool,
-    requested_dates: Sequence[str] | None = None,
-) -> list[dict[str, Any]]:
-    dormitory_retry = scheduled and config["restaurant"] == "DORMITORY"
+    requested_dates: Sequence[str] | None,
+    dormitory_retry: bool,
+) -> list[Mapping[str, Any]]:
+    """Scrape, turning an expected or tolerated empty source into one empty meal."""
     try:
         if requested_dates is None:
             raw_meals = list(await scrape(config, target_date))
@@ -305,6 +725,20 @@ async def _process_source_date(
                 "reason_code": reason_code,
             }
         ]
+    return raw_meals
+
+
+async def _process_source_date(
+    config: Mapping[str, Any],
+    target_date: str,
+    *,
+    requested_dates: Sequence[str] | None = None,
+) -> list[dict[str, Any]]:
+    plan = _plan_for(config)
+    dormitory_retry = plan.scheduled and config["restaurant"] == "DORMITORY"
+    raw_meals = await _scrape_or_empty(
+        config, target_date, requested_dates, dormitory_retry
+    )
     if dormitory_retry and requested_dates is not None:
         represented_dates = {
             meal_date
@@ -313,7 +747,17 @@ async def _process_source_date(
         }
         if set(requested_dates) - represented_dates:
             raise RetryableEmptyMenuError(target_date)
+    return await _process_meals(config, target_date, raw_meals)
+
 
+async def _process_meals(
+    config: Mapping[str, Any],
+    target_date: str,
+    raw_meals: Sequence[Mapping[str, Any]],
+) -> list[dict[str, Any]]:
+    """Interpret, publish and summarize already scraped meals."""
+    plan = _plan_for(config)
+    dormitory_retry = plan.scheduled and config["restaurant"] == "DORMITORY"
     summaries: dict[str, dict[str, Any]] = defaultdict(
         lambda: {
             "menus": {},
@@ -324,8 +768,6 @@ async def _process_source_date(
         }
     )
     critical_failures: set[str] = set()
-    environments = ("dev", "prod") if scheduled else ("dev",)
-    critical_environment = "prod" if scheduled else "dev"
 
     for raw_meal in raw_meals:
         meal_date = _meal_date(raw_meal, target_date)
@@ -373,24 +815,15 @@ async def _process_source_date(
         main_menus = _main_menus(interpreted, menu_names)
         if main_menus:
             summary["main_menus"][source_slot] = main_menus
-        policy = _slot_policy(config, source_slot)
+        policy = plan.slot_policy(source_slot)
         if policy is None:
             summary["warnings"].append(
                 {"slot": source_slot, "reason": "unsupported source slot"}
             )
             continue
-        time_slot, price = policy
-        payload: dict[str, Any] = {
-            "date": meal_date,
-            "restaurant": config["restaurant"],
-            "time": time_slot,
-            "price": price,
-            "menuNames": menu_names,
-        }
-        if main_menus:
-            payload["mainMenus"] = main_menus
+        payload = _meal_payload(config, meal_date, policy, menu_names, main_menus)
 
-        for environment in environments:
+        for environment in plan.environments:
             try:
                 publication = await publish_menu(config, payload, environment)
             except (RetryableEmptyMenuError, RetryableApiSendError):
@@ -406,7 +839,7 @@ async def _process_source_date(
                         "error_type": type(error).__name__,
                     }
                 )
-                if environment == critical_environment:
+                if environment == plan.critical_environment:
                     critical_failures.add(meal_date)
                 continue
 
@@ -506,10 +939,7 @@ async def _run_scrape(
         else:
             requested_dates = _week_dates(7, next_week=False)
         results = await _process_source_date(
-            config,
-            target_date,
-            scheduled=False,
-            requested_dates=requested_dates,
+            config, target_date, requested_dates=requested_dates
         )
         menus = {
             f"{result['date']}_{slot}": items
@@ -531,7 +961,7 @@ async def _run_scrape(
             "special_note": config.get("special_note"),
         }
     else:
-        results = await _process_source_date(config, target_date, scheduled=False)
+        results = await _process_source_date(config, target_date)
         result = results[0]
         body = {
             "success": result["success"],
@@ -545,22 +975,35 @@ async def _run_scrape(
     return _response(200 if body["success"] else 400, body)
 
 
-async def _run_schedule(
-    config: Mapping[str, Any], request: Mapping[str, Any], event: object
-) -> dict[str, Any]:
-    del event
-    dates = _dates_for(config, request)
+async def schedule_results(
+    config: Mapping[str, Any], dates: Sequence[str]
+) -> list[dict[str, Any]]:
+    """Scrape, interpret and publish every scheduled date; dormitory reads one page."""
+    if config["restaurant"] == "DORMITORY" and config.get("partial_week_state_uri"):
+        module = importlib.import_module("functions.partial_week")
+        return await module.schedule_partial_week(config, dates)
     results: list[dict[str, Any]] = []
     if config["restaurant"] == "DORMITORY":
         results.extend(
-            await _process_source_date(
-                config, dates[0], scheduled=True, requested_dates=dates
-            )
+            await _process_source_date(config, dates[0], requested_dates=dates)
         )
     else:
         for target_date in dates:
-            results.extend(await _process_source_date(config, target_date, scheduled=True))
-    return _response(200, results)
+            results.extend(await _process_source_date(config, target_date))
+    return results
+
+
+async def _run_schedule(
+    config: Mapping[str, Any], request: Mapping[str, Any], event: object
+) -> dict[str, Any]:
+    if _mapping(event).get("batch_phase") is not None:
+        module = importlib.import_module("functions.batch")
+        return await module.run_batch_phase(config, request, event)
+    dates = _dates_for(config, request)
+    if _boolean(_mapping(event).get("fan_out")):
+        # Per-day workflows invoke this function again once per returned date.
+        return _response(200, {"dates": dates})
+    return _response(200, await schedule_results(config, dates))
 
 
 async def _run_final_failure(
@@ -594,6 +1037,83 @@ async def _run_final_failure(
     )
 
 
+async def _run_backfill(
+    config: Mapping[str, Any], request: Mapping[str, Any], event: object
+) -> dict[str, Any]:
+    module = importlib.import_module("functions.backfill")
+    return await module.run_backfill(config, request, event)
+
+
+async def _run_drain(
+    config: Mapping[str, Any], request: Mapping[str, Any], event: object
+) -> dict[str, Any]:
+    send = _client(config, "send_slack_text")
+    summary = await _plan_for(config).outbox.drain(
+        partial(send, webhook_url=config["slack_webhook_url"])
+    )
+    importlib.import_module("functions.metrics").REGISTRY.gauge(
+        "notification.queue_depth", summary["queue_depth"], unit="Count"
+    )
+    emit_event(
+        "WARNING" if summary["failed"] or summary["discarded"] else "INFO",
+        "notification.drained",
+        "notification",
+        **summary,
+    )
+    return _response(200, summary)
+
+
+def _optional_text(value: object) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+async def _run_probe(
+    config: Mapping[str, Any], request: Mapping[str, Any], event: object
+) -> dict[str, Any]:
+    """Report whether the dormitory page changed since the caller's last probe."""
+    payload = _mapping(event)
+    known_sha256 = _optional_text(payload.get("probe_sha256"))
+    raw_known_dates = payload.get("probe_ready_dates")
+    known_dates = (
+        {date for date in raw_known_dates if _date(date)}
+        if isinstance(raw_known_dates, list)
+        else set()
+    )
+    dates = _dates_for(config, request)
+    probe = await _client(config, "probe_dormitory_page")(
+        dates,
+        etag=_optional_text(payload.get("probe_etag")),
+        last_modified=_optional_text(payload.get("probe_last_modified")),
+    )
+    changed = probe.modified and probe.sha256 != known_sha256
+    if not changed:
+        ready_dates = sorted(known_dates)
+    elif probe.ready_dates is None:
+        # The page changed in a way the probe cannot read; let the pipeline decide.
+        ready_dates = list(dates)
+    else:
+        ready_dates = list(probe.ready_dates)
+    body = {
+        "changed": changed,
+        "sha256": probe.sha256 if probe.modified else known_sha256,
+        "etag": probe.etag,
+        "last_modified": probe.last_modified,
+        "ready_dates": ready_dates,
+        "new_dates": [date for date in ready_dates if date not in known_dates],
+        "complete": len(ready_dates) == len(dates),
+    }
+    emit_event(
+        "INFO",
+        "source.probed",
+        "scrape",
+        changed=changed,
+        not_modified=not probe.modified,
+        ready_days=len(ready_dates),
+        new_days=len(body["new_dates"]),
+    )
+    return _response(200, body)
+
+
 DISPATCH_TABLE: Mapping[
     str,
     Callable[
@@ -611,22 +1131,69 @@ DISPATCH_TABLE: Mapping[
         "schedule_faculty": _run_schedule,
         "schedule_dormitory": _run_schedule,
         "notify_final_failure": _run_final_failure,
+        "backfill_dodam": _run_backfill,
+        "backfill_haksik": _run_backfill,
+        "backfill_faculty": _run_backfill,
+        "backfill_dormitory": _run_backfill,
+        "drain_notifications": _run_drain,
+        "probe_dormitory": _run_probe,
     }
 )
 
 
+async def _run_warmup(
+    config: Mapping[str, Any],
+    request: Mapping[str, Any],
+    event: object,
+    *,
+    plan_ms: float,
+) -> dict[str, Any]:
+    del request, event
+    module = importlib.import_module("functions.warmup")
+    return _response(200, await module.prime(_plan_for(config), plan_ms=plan_ms))
+
+
+# Operations of sources declared through SOURCE_SPECS_URI dispatch by kind.
+_KIND_DISPATCH: Mapping[
+    str,
+    Callable[
+        [Mapping[str, Any], Mapping[str, Any], object],
+        Awaitable[dict[str, Any]],
+    ],
+] = MappingProxyType(
+    {"scrape": _run_scrape, "schedule": _run_schedule, "backfill": _run_backfill}
+)
+
+
 async def orchestrate(event: object, context: object) -> dict[str, Any]:
     """Resolve and execute exactly one operation inside one event-loop boundary."""
     operation = resolve_operation(event)
     if operation is None:
         return _invalid_response("missing operation")
     dispatcher = DISPATCH_TABLE.get(operation)
+    plan = None
+    loading = time.perf_counter()
+    if dispatcher is None:
+        plan = load_operation_plan(operation)
+        if plan is not None:
+            dispatcher = _KIND_DISPATCH.get(plan.config["kind"])
     if dispatcher is None:
         return _invalid_response("unknown operation")
-    config = load_operation_config(operation)
-    if config is None or config.get("operation", operation) != operation:
+    plan = plan or load_operation_plan(operation)
+    plan_ms = (time.perf_counter() - loading) * 1000
+    if plan is None or plan.config.get("operation", operation) != operation:
         return _invalid_response("operation configuration mismatch")
+    config = plan.config
+    cassette = None
+    if os.getenv("CASSETTE_MODE"):
+        cassette = importlib.import_module("functions.cassette").cassette_from_environment()
+    if cassette is not None:
+        plan = dataclasses.replace(
+            plan, clients=MappingProxyType(cassette.bind(plan.clients))
+        )
     request = parse_event(event)
+    if request["trigger"] == "warmup":
+        dispatcher = partial(_run_warmup, plan_ms=plan_ms)
     payload = _mapping(event)
     invocation_id = getattr(context, "aws_request_id", "unknown")
     run_id = request.get("execution_id") or payload.get("id") or invocation_id
@@ -640,6 +1207,13 @@ async def orchestrate(event: object, context: object) -> dict[str, Any]:
             "trigger": request["trigger"],
         }
     )
+    plan_token = _active_plan.set(plan)
+    metrics = importlib.import_module("functions.metrics")
+    metrics_token = metrics.bind_dimensions(
+        operation=operation, restaurant=config["restaurant"]
+    )
+    profiler = importlib.import_module("functions.profiling").slow_invocation_profiler()
+    started = time.perf_counter()
     try:
         emit_event("INFO", "handler.invocation.started", "handler")
         response = await dispatcher(config, request, event)
@@ -662,7 +1236,16 @@ async def orchestrate(event: object, context: object) -> dict[str, Any]:
         )
         raise
     finally:
+        if cassette is not None:
+            cassette.finish()
+        _report_interpreter_usage(plan)
+        if profiler is not None:
+            _report_slow_invocation(profiler, started, str(invocation_id))
+        metrics.reset_dimensions(metrics_token)
+        _ = metrics.flush(_write_metrics)
+        _active_plan.reset(plan_token)
         _observation_context.reset(token)
+        flush_observations()
 
 
 def lambda_handler(event: object, context: object) -> dict[str, Any]:
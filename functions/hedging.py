@@ -0,0 +1,135 @@
+"""Hedged chat completions: race a second identical request against a slow first."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any
+
+from functions import menu_ai
+from functions.translation_memory import estimated_tokens
+
+
+DEFAULT_BUDGET = 4
+MAX_HEDGE_RATE = 0.25
+MIN_SAMPLES = 5
+INITIAL_DELAY_SECONDS = 10.0
+MIN_DELAY_SECONDS = 1.0
+_WINDOW = 200
+
+
+class HedgedCompletion:
+    """Issue a backup completion once the first outlives the latency percentile.
+
+    Latencies are kept across the warm container so the delay tracks the model's
+    recent distribution; cancelled requests count as at least the current delay.
+    Hedges are capped per invocation both absolutely (``budget``) and as a
+    fraction of requests (``MAX_HEDGE_RATE``).
+    """
+
+    def __init__(self, percentile: float, budget: int = DEFAULT_BUDGET) -> None:
+        self.percentile = percentile
+        self.budget = budget
+        self.latencies: deque[float] = deque(maxlen=_WINDOW)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.capped = 0
+        self.extra_prompt_tokens = 0
+
+    def delay(self) -> float:
+        if len(self.latencies) < MIN_SAMPLES:
+            return INITIAL_DELAY_SECONDS
+        ordered = sorted(self.latencies)
+        rank = max(math.ceil(self.percentile / 100 * len(ordered)) - 1, 0)
+        return max(ordered[rank], MIN_DELAY_SECONDS)
+
+    def _may_hedge(self) -> bool:
+        return self.hedges < self.budget and self.hedges < MAX_HEDGE_RATE * self.requests
+
+    async def _timed(self, *args: Any, **options: Any) -> object:
+        started = time.perf_counter()
+        try:
+            response = await menu_ai._request_completion(*args, **options)
+        except asyncio.CancelledError:
+            # A cancelled loser ran at least this long; dropping it would bias
+            # the percentile towards the requests that happened to be fast.
+            self.latencies.append(max(time.perf_counter() - started, self.delay()))
+            raise
+        self.latencies.append(time.perf_counter() - started)
+        return response
+
+    async def request_completion(
+        self,
+        client: Any,
+        restaurant: str,
+        raw_source: str,
+        source_english: tuple[str, ...],
+        **options: Any,
+    ) -> object:
+        """Drop-in for ``menu_ai._request_completion``; first valid response wins."""
+        self.requests += 1
+        arguments = (client, restaurant, raw_source, source_english)
+        primary = asyncio.ensure_future(self._timed(*arguments, **options))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay())
+        except asyncio.CancelledError:
+            _ = primary.cancel()
+            raise
+        if done:
+            return primary.result()
+        if not self._may_hedge():
+            self.capped += 1
+            return await primary
+
+        self.hedges += 1
+        self.extra_prompt_tokens += estimated_tokens(
+            menu_ai.SYSTEM_PROMPT
+            + menu_ai._user_prompt(restaurant, raw_source, source_english)
+        )
+        hedge = asyncio.ensure_future(self._timed(*arguments, **options))
+        pending = {primary, hedge}
+        fallback: asyncio.Future[object] | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        fallback = fallback or task
+                        continue
+                    try:
+                        _ = menu_ai.parse_tool_response(
+                            task.result(), restaurant, raw_source, source_english
+                        )
+                    except menu_ai.MenuInterpretationError:
+                        fallback = fallback or task
+                        continue
+                    if task is hedge:
+                        self.hedge_wins += 1
+                    return task.result()
+        finally:
+            for task in pending:
+                _ = task.cancel()
+            if pending:
+                _ = await asyncio.gather(*pending, return_exceptions=True)
+        return (fallback or primary).result()
+
+    def take_stats(self) -> dict[str, Any]:
+        stats = {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": round(self.hedges / self.requests, 3) if self.requests else None,
+            "hedge_wins": self.hedge_wins,
+            "hedges_capped": self.capped,
+            "hedge_delay_ms": round(self.delay() * 1000),
+            "estimated_extra_prompt_tokens": self.extra_prompt_tokens,
+        }
+        self.reset_stats()
+        return stats
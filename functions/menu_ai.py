@@ -1,17 +1,28 @@
 import json
 import re
-from collections.abc import Iterable, Mapping, Sequence
-from typing import Any, TypedDict, cast
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionToolParam
 from tenacity import retry, stop_after_attempt, wait_fixed
 
+from functions import metrics, sources
+from functions.translation_memory import TranslationMemory, estimated_tokens
+
+if TYPE_CHECKING:
+    from functions.prompt_budget import PromptBudget
+    from functions.rule_interpreter import RuleFastPath
+
 
 MODEL_ID = "gpt-5.6-luna"
 TOOL_NAME = "extract_main_menus"
-SITE_ENGLISH_RESTAURANTS = frozenset({"HAKSIK", "DODAM", "FACULTY"})
 DORMITORY = "DORMITORY"
+# Kept for importers from before the source registry; built-in sources only.
+SITE_ENGLISH_RESTAURANTS = frozenset(
+    spec.restaurant for spec in sources.BUILTIN_SOURCES if spec.site_english
+)
 
 MENU_TOOL: ChatCompletionToolParam = {
     "type": "function",
@@ -62,6 +73,7 @@ _HANGUL_RE = re.compile(r"[\u3131-\u318e\uac00-\ud7a3]")
 _LATIN_RE = re.compile(r"[A-Za-z]")
 _SLOT_LABEL_RE = re.compile(r"^(?:조식|중식|석식)\s*\d*$")
 _BRACKETED_LABEL_RE = re.compile(r"^\s*\[[^\]]+\]\s*$")
+_DECORATION_RE = re.compile(r"\s*[★☆◆◇■□●○◎▶▷►◀◁※♥♡♣♠♧♤]+\s*")
 
 
 class MenuInterpretationError(ValueError):
@@ -86,11 +98,17 @@ def _restaurant_name(restaurant: object) -> str:
     if not isinstance(name, str):
         raise MenuInterpretationError("restaurant must identify a supported restaurant")
     name = name.upper()
-    if name not in SITE_ENGLISH_RESTAURANTS | {DORMITORY}:
+    if sources.source(name) is None:
         raise MenuInterpretationError(f"unsupported restaurant: {name}")
     return name
 
 
+def has_site_english(restaurant: str) -> bool:
+    """Whether the restaurant's source prints English names next to the menus."""
+    compiled = sources.source(restaurant)
+    return compiled is not None and compiled.spec.site_english
+
+
 def _exact_fields(value: Mapping[str, Any], expected: set[str], label: str) -> None:
     if set(value) != expected:
         raise MenuInterpretationError(f"{label} must contain exactly {sorted(expected)}")
@@ -111,7 +129,7 @@ def validate_tool_arguments(
     source_english: Iterable[str] = (),
 ) -> MenuInterpretation:
     """Validate parsed tool arguments and assemble canonical mainMenus."""
-    restaurant_name = _restaurant_name(restaurant)
+    site_english = has_site_english(_restaurant_name(restaurant))
     if not isinstance(arguments, Mapping):
         raise MenuInterpretationError("tool arguments must be a JSON object")
     _exact_fields(arguments, {"menuNames", "mainCandidates"}, "tool arguments")
@@ -159,7 +177,7 @@ def validate_tool_arguments(
         indexes.add(menu_index)
 
         name_en = _validate_name_en(raw_candidate["nameEn"])
-        if restaurant_name in SITE_ENGLISH_RESTAURANTS and not (
+        if site_english and not (
             name_en in raw_source or name_en in evidence
         ):
             raise MenuInterpretationError(
@@ -167,7 +185,7 @@ def validate_tool_arguments(
             )
         main_menus.append({"nameKo": menu_names[menu_index], "nameEn": name_en})
 
-    if restaurant_name in SITE_ENGLISH_RESTAURANTS:
+    if site_english:
         if not main_menus:
             raise MenuInterpretationError(
                 "site restaurants require at least one main candidate"
@@ -220,46 +238,134 @@ def parse_tool_response(
     )
 
 
+def canonical_source(
+    raw_source: str, source_english: Iterable[str] = ()
+) -> tuple[str, tuple[str, ...]]:
+    """Strip decorative symbols and drop evidence already present in the source."""
+    canonical = _DECORATION_RE.sub(" ", raw_source).strip()
+    evidence: list[str] = []
+    for item in source_english:
+        if item not in canonical and item not in evidence:
+            evidence.append(item)
+    return canonical, tuple(evidence)
+
+
+def _user_prompt(
+    restaurant: str, raw_source: str, source_english: tuple[str, ...]
+) -> str:
+    # Slow-changing sections come first so consecutive prompts share a prefix.
+    raw_source, source_english = canonical_source(raw_source, source_english)
+    prompt = f"Restaurant: {restaurant}\n"
+    if source_english:
+        evidence = "\n".join(source_english)
+        prompt += f"Additional source English evidence:\n{evidence}\n"
+    return prompt + f"\nRaw menu source:\n{raw_source}"
+
+
+def completion_request(
+    restaurant: str, raw_source: str, source_english: tuple[str, ...]
+) -> dict[str, Any]:
+    """Chat-completion parameters shared by synchronous and batch requests."""
+    return {
+        "model": MODEL_ID,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": _user_prompt(restaurant, raw_source, source_english),
+            },
+        ],
+        "tools": [MENU_TOOL],
+        "tool_choice": {"type": "function", "function": {"name": TOOL_NAME}},
+        "reasoning_effort": "none",
+        "prompt_cache_key": f"menu-{restaurant.lower()}",
+    }
+
+
 @retry(stop=stop_after_attempt(3), wait=wait_fixed(5), reraise=True)
+@metrics.timed("openai.completion.latency")
 async def _request_completion(
     client: AsyncOpenAI,
     restaurant: str,
     raw_source: str,
     source_english: tuple[str, ...],
 ) -> object:
-    evidence = "\n".join(source_english)
+    request = completion_request(restaurant, raw_source, source_english)
+    # The locked openai client predates the prompt_cache_key argument.
+    cache_key = request.pop("prompt_cache_key")
     return await client.chat.completions.create(
-        model=MODEL_ID,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": (
-                    f"Restaurant: {restaurant}\n"
-                    f"Source English evidence:\n{evidence}\n\n"
-                    f"Raw menu source:\n{raw_source}"
-                ),
-            },
-        ],
-        tools=[MENU_TOOL],
-        tool_choice={"type": "function", "function": {"name": TOOL_NAME}},
-        reasoning_effort=cast(Any, "none"),
+        **request, extra_body={"prompt_cache_key": cache_key}
     )
 
 
+def _remembered_interpretation(
+    memory: TranslationMemory, raw_source: str
+) -> MenuInterpretation | None:
+    arguments = memory.local_arguments(raw_source)
+    if arguments is None:
+        return None
+    try:
+        interpretation = validate_tool_arguments(arguments, DORMITORY, raw_source)
+    except MenuInterpretationError:
+        return None
+    memory.calls_skipped += 1
+    memory.tokens_saved += estimated_tokens(
+        SYSTEM_PROMPT + _user_prompt(DORMITORY, raw_source, ())
+    ) + estimated_tokens(json.dumps(arguments, ensure_ascii=False))
+    return interpretation
+
+
 async def interpret_menu(
     api_key: str,
     restaurant: object,
     raw_source: str,
     source_english: Iterable[str] = (),
+    *,
+    request_completion: Callable[..., Awaitable[object]] | None = None,
+    translation_memory: TranslationMemory | None = None,
+    fast_path: "RuleFastPath | None" = None,
+    prompt_budget: "PromptBudget | None" = None,
 ) -> MenuInterpretation:
     """Interpret one meal and return menuNames plus canonical mainMenus."""
     restaurant_name = _restaurant_name(restaurant)
     if not isinstance(raw_source, str) or not raw_source.strip():
         raise MenuInterpretationError("raw source must be a non-empty string")
     evidence = tuple(source_english)
-    client = AsyncOpenAI(api_key=api_key)
-    response = await _request_completion(
-        client, restaurant_name, raw_source, evidence
-    )
-    return parse_tool_response(response, restaurant_name, raw_source, evidence)
+    memory = translation_memory if restaurant_name == DORMITORY else None
+    if memory is None:
+        if fast_path is not None:
+            ruled = fast_path.interpret(restaurant_name, raw_source, evidence)
+            if ruled is not None:
+                return ruled
+        if prompt_budget is not None:
+            _ = prompt_budget.admit(restaurant_name, raw_source, evidence)
+        client = AsyncOpenAI(api_key=api_key)
+        started = time.perf_counter()
+        response = await (request_completion or _request_completion)(
+            client, restaurant_name, raw_source, evidence
+        )
+        if fast_path is not None:
+            fast_path.observe_model_call(time.perf_counter() - started)
+        if prompt_budget is not None:
+            prompt_budget.observe(response)
+        return parse_tool_response(response, restaurant_name, raw_source, evidence)
+
+    interpretation = _remembered_interpretation(memory, raw_source)
+    if interpretation is None:
+        # The strict tool schema needs a nameEn on every main candidate, so the
+        # model still writes one; remembered names replace it in apply() below
+        # rather than growing the prompt with them.
+        if prompt_budget is not None:
+            _ = prompt_budget.admit(restaurant_name, raw_source, evidence)
+        client = AsyncOpenAI(api_key=api_key)
+        response = await (request_completion or _request_completion)(
+            client, restaurant_name, raw_source, evidence
+        )
+        if prompt_budget is not None:
+            prompt_budget.observe(response)
+        interpretation = parse_tool_response(
+            response, restaurant_name, raw_source, evidence
+        )
+    memory.apply(interpretation["mainMenus"])
+    memory.learn(interpretation["menuNames"], interpretation["mainMenus"])
+    return interpretation
@@ -0,0 +1,229 @@
+"""In-process metrics aggregated per invocation and flushed as CloudWatch EMF.
+
+Instruments record into the module registry with a bounded dimension set
+(operation, restaurant, environment, outcome). ``flush`` turns everything
+recorded since the last flush into one Embedded Metric Format document per
+dimension combination; CloudWatch extracts the metrics from the log line.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import math
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+
+NAMESPACE_ENVIRONMENT = "METRICS_NAMESPACE"
+DEFAULT_NAMESPACE = "FoodCrawling"
+DIMENSION_KEYS = ("operation", "restaurant", "environment", "outcome")
+OUTCOMES = frozenset({"success", "error"})
+MAX_EMF_VALUES = 100
+SIGNIFICANT_DIGITS = 2
+
+_dimensions: contextvars.ContextVar[Mapping[str, str]] = contextvars.ContextVar(
+    "metric_dimensions", default={}
+)
+_Function = TypeVar("_Function", bound=Callable[..., Awaitable[Any]])
+_Key = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+def _bounded(dimensions: Mapping[str, object]) -> tuple[tuple[str, str], ...]:
+    bounded = {}
+    for key in DIMENSION_KEYS:
+        value = dimensions.get(key)
+        if value is None:
+            continue
+        value = str(value)
+        if key == "outcome" and value not in OUTCOMES:
+            value = "error"
+        bounded[key] = value[:64]
+    return tuple(bounded.items())
+
+
+class Histogram:
+    """HDR-style histogram: values are bucketed to two significant digits."""
+
+    def __init__(self) -> None:
+        self.buckets: dict[float, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    @staticmethod
+    def bucket(value: float) -> float:
+        if value <= 0:
+            return 0.0
+        scale = 10 ** (math.floor(math.log10(value)) - SIGNIFICANT_DIGITS + 1)
+        return round(round(value / scale) * scale, 6)
+
+    def record(self, value: float) -> None:
+        bucket = self.bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def percentile(self, percentile: float) -> float | None:
+        if not self.count:
+            return None
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for bucket, count in sorted(self.buckets.items()):
+            seen += count
+            if seen >= rank:
+                return bucket
+        return self.maximum
+
+    def emf_values(self) -> list[float]:
+        """At most ``MAX_EMF_VALUES`` values whose distribution matches the buckets."""
+        if self.count <= MAX_EMF_VALUES:
+            return [
+                bucket
+                for bucket, count in sorted(self.buckets.items())
+                for _ in range(count)
+            ]
+        return [
+            value
+            for index in range(1, MAX_EMF_VALUES + 1)
+            if (value := self.percentile(index * 100 / MAX_EMF_VALUES)) is not None
+        ]
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms keyed by name and bounded dimensions."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.counters: dict[_Key, float] = {}
+        self.gauges: dict[_Key, float] = {}
+        self.histograms: dict[_Key, Histogram] = {}
+
+    def _key(self, name: str, unit: str, dimensions: Mapping[str, object]) -> _Key:
+        return name, unit, _bounded({**_dimensions.get(), **dimensions})
+
+    def increment(
+        self, name: str, value: float = 1, *, unit: str = "Count", **dimensions: object
+    ) -> None:
+        key = self._key(name, unit, dimensions)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(
+        self, name: str, value: float, *, unit: str = "None", **dimensions: object
+    ) -> None:
+        self.gauges[self._key(name, unit, dimensions)] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        *,
+        unit: str = "Milliseconds",
+        **dimensions: object,
+    ) -> None:
+        key = self._key(name, unit, dimensions)
+        self.histograms.setdefault(key, Histogram()).record(value)
+
+    def emf_documents(self, namespace: str, timestamp_ms: int) -> list[dict[str, Any]]:
+        grouped: dict[tuple[tuple[str, str], ...], dict[str, Any]] = {}
+
+        def add(key: _Key, value: object) -> None:
+            name, unit, dimensions = key
+            document = grouped.setdefault(dimensions, {"metrics": [], "values": {}})
+            document["metrics"].append({"Name": name, "Unit": unit})
+            document["values"][name] = value
+
+        for key, value in self.counters.items():
+            add(key, value)
+        for key, value in self.gauges.items():
+            add(key, value)
+        for key, histogram in self.histograms.items():
+            add(key, histogram.emf_values())
+
+        documents = []
+        for dimensions, document in grouped.items():
+            documents.append(
+                {
+                    "_aws": {
+                        "Timestamp": timestamp_ms,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": namespace,
+                                "Dimensions": [[key for key, _ in dimensions]],
+                                "Metrics": document["metrics"],
+                            }
+                        ],
+                    },
+                    **dict(dimensions),
+                    **document["values"],
+                }
+            )
+        return documents
+
+
+REGISTRY = MetricsRegistry()
+
+
+def bind_dimensions(**values: object) -> contextvars.Token[Mapping[str, str]]:
+    """Add dimensions to every metric recorded until ``reset_dimensions``."""
+    return _dimensions.set({**_dimensions.get(), **values})
+
+
+def reset_dimensions(token: contextvars.Token[Mapping[str, str]]) -> None:
+    _dimensions.reset(token)
+
+
+@contextmanager
+def dimensions(**values: object) -> Iterator[None]:
+    token = bind_dimensions(**values)
+    try:
+        yield
+    finally:
+        reset_dimensions(token)
+
+
+def timed(
+    metric: str, *, argument_dimensions: tuple[str, ...] = ()
+) -> Callable[[_Function], _Function]:
+    """Record the latency and outcome of every await of a coroutine function."""
+
+    def decorate(function: _Function) -> _Function:
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            extra = {name: kwargs[name] for name in argument_dimensions if name in kwargs}
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await function(*args, **kwargs)
+                outcome = "success"
+                return result
+            finally:
+                REGISTRY.observe(
+                    metric,
+                    (time.perf_counter() - started) * 1000,
+                    outcome=outcome,
+                    **extra,
+                )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def flush(write: Callable[[Mapping[str, Any]], None]) -> int:
+    """Write one EMF document per dimension set and reset the registry."""
+    documents = REGISTRY.emf_documents(
+        os.getenv(NAMESPACE_ENVIRONMENT) or DEFAULT_NAMESPACE, round(time.time() * 1000)
+    )
+    REGISTRY.reset()
+    for document in documents:
+        write(document)
+    return len(documents)
@@ -0,0 +1,273 @@
+"""Durable Slack notification outbox drained outside the scheduled invocation.
+
+Notifications are rendered at enqueue time and stored without the webhook URL.
+The queue surface is the subset of a boto3 SQS client the outbox needs, so
+``SqliteQueue`` stands in locally and an SQS queue URL works in production.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+
+OUTBOX_ENVIRONMENT = "NOTIFICATION_OUTBOX_URI"
+BATCH_SIZE = 10
+VISIBILITY_TIMEOUT_SECONDS = 60
+MAX_BATCHES = 50
+MAX_RECEIVE_COUNT = 5
+_DEPTH_ATTRIBUTES = (
+    "ApproximateNumberOfMessages",
+    "ApproximateNumberOfMessagesNotVisible",
+)
+
+
+class MessageQueue(Protocol):
+    """The subset of an SQS client the outbox needs."""
+
+    def send_message(self, *, QueueUrl: str, MessageBody: str) -> Mapping[str, Any]: ...
+
+    def receive_message(
+        self,
+        *,
+        QueueUrl: str,
+        MaxNumberOfMessages: int,
+        VisibilityTimeout: int,
+        AttributeNames: Sequence[str],
+    ) -> Mapping[str, Any]: ...
+
+    def delete_message_batch(
+        self, *, QueueUrl: str, Entries: Sequence[Mapping[str, str]]
+    ) -> Mapping[str, Any]: ...
+
+    def get_queue_attributes(
+        self, *, QueueUrl: str, AttributeNames: Sequence[str]
+    ) -> Mapping[str, Any]: ...
+
+
+class SqliteQueue:
+    """Single-file SQS stand-in with visibility timeouts and receive counts."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            _ = connection.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id TEXT PRIMARY KEY, queue TEXT NOT NULL, body TEXT NOT NULL, "
+                "sent_at REAL NOT NULL, visible_at REAL NOT NULL, "
+                "receive_count INTEGER NOT NULL DEFAULT 0, receipt TEXT)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level="IMMEDIATE")
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def send_message(self, *, QueueUrl: str, MessageBody: str) -> Mapping[str, Any]:
+        message_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as connection:
+            _ = connection.execute(
+                "INSERT INTO messages (id, queue, body, sent_at, visible_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (message_id, QueueUrl, MessageBody, now, now),
+            )
+        return {"MessageId": message_id}
+
+    def receive_message(
+        self,
+        *,
+        QueueUrl: str,
+        MaxNumberOfMessages: int = 1,
+        VisibilityTimeout: int = 30,
+        AttributeNames: Sequence[str] = (),
+    ) -> Mapping[str, Any]:
+        now = time.time()
+        messages = []
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id, body, sent_at, receive_count FROM messages "
+                "WHERE queue = ? AND visible_at <= ? ORDER BY sent_at LIMIT ?",
+                (QueueUrl, now, MaxNumberOfMessages),
+            ).fetchall()
+            for message_id, body, sent_at, receive_count in rows:
+                receipt = uuid.uuid4().hex
+                _ = connection.execute(
+                    "UPDATE messages SET visible_at = ?, receipt = ?, "
+                    "receive_count = receive_count + 1 WHERE id = ?",
+                    (now + VisibilityTimeout, receipt, message_id),
+                )
+                messages.append(
+                    {
+                        "MessageId": message_id,
+                        "ReceiptHandle": receipt,
+                        "Body": body,
+                        "Attributes": {
+                            "SentTimestamp": str(round(sent_at * 1000)),
+                            "ApproximateReceiveCount": str(receive_count + 1),
+                        },
+                    }
+                )
+        return {"Messages": messages} if messages else {}
+
+    def delete_message_batch(
+        self, *, QueueUrl: str, Entries: Sequence[Mapping[str, str]]
+    ) -> Mapping[str, Any]:
+        with self._connect() as connection:
+            for entry in Entries:
+                _ = connection.execute(
+                    "DELETE FROM messages WHERE queue = ? AND receipt = ?",
+                    (QueueUrl, entry["ReceiptHandle"]),
+                )
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries]}
+
+    def get_queue_attributes(
+        self, *, QueueUrl: str, AttributeNames: Sequence[str] = ()
+    ) -> Mapping[str, Any]:
+        now = time.time()
+        with self._connect() as connection:
+            visible, in_flight = connection.execute(
+                "SELECT COALESCE(SUM(visible_at <= ?), 0), "
+                "COALESCE(SUM(visible_at > ?), 0) FROM messages WHERE queue = ?",
+                (now, now, QueueUrl),
+            ).fetchone()
+        return {
+            "Attributes": {
+                "ApproximateNumberOfMessages": str(visible),
+                "ApproximateNumberOfMessagesNotVisible": str(in_flight),
+            }
+        }
+
+
+class Outbox:
+    """Enqueue rendered Slack texts and deliver them later in batches."""
+
+    def __init__(self, queue: MessageQueue, queue_url: str) -> None:
+        self.queue = queue
+        self.queue_url = queue_url
+
+    def enqueue(self, text: str, **attributes: Any) -> str:
+        body = json.dumps(
+            {"text": text, "enqueued_at": time.time(), **attributes}, ensure_ascii=False
+        )
+        response = self.queue.send_message(QueueUrl=self.queue_url, MessageBody=body)
+        return str(response.get("MessageId"))
+
+    def depth(self) -> int:
+        attributes = self.queue.get_queue_attributes(
+            QueueUrl=self.queue_url, AttributeNames=list(_DEPTH_ATTRIBUTES)
+        ).get("Attributes", {})
+        return sum(int(attributes.get(name, 0)) for name in _DEPTH_ATTRIBUTES)
+
+    async def drain(
+        self,
+        send: Callable[..., Awaitable[object]],
+        *,
+        max_batches: int = MAX_BATCHES,
+    ) -> dict[str, Any]:
+        """Deliver queued texts; failures stay queued until their visibility expires.
+
+        Unreadable messages, and messages that failed on their
+        ``MAX_RECEIVE_COUNT``-th receive, are deleted and counted as discarded.
+        """
+        delivered = failed = discarded = batches = 0
+        latencies: list[float] = []
+        while batches < max_batches:
+            messages = self.queue.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=BATCH_SIZE,
+                VisibilityTimeout=VISIBILITY_TIMEOUT_SECONDS,
+                AttributeNames=["ApproximateReceiveCount"],
+            ).get("Messages", [])
+            if not messages:
+                break
+            batches += 1
+            entries = []
+            readable: list[tuple[int, Mapping[str, Any], Mapping[str, Any]]] = []
+            for index, message in enumerate(messages):
+                body = _message_body(message)
+                if body is None:
+                    discarded += 1
+                    entries.append(
+                        {"Id": str(index), "ReceiptHandle": message["ReceiptHandle"]}
+                    )
+                    continue
+                readable.append((index, message, body))
+            outcomes = await asyncio.gather(
+                *(send(text=body["text"]) for _, _, body in readable),
+                return_exceptions=True,
+            )
+            sent_at = time.time()
+            for (index, message, body), outcome in zip(readable, outcomes):
+                if isinstance(outcome, BaseException):
+                    if _receive_count(message) < MAX_RECEIVE_COUNT:
+                        failed += 1
+                        continue
+                    discarded += 1
+                else:
+                    delivered += 1
+                    latencies.append(sent_at - body["enqueued_at"])
+                entries.append({"Id": str(index), "ReceiptHandle": message["ReceiptHandle"]})
+            if entries:
+                _ = self.queue.delete_message_batch(
+                    QueueUrl=self.queue_url, Entries=entries
+                )
+        return {
+            "delivered": delivered,
+            "failed": failed,
+            "discarded": discarded,
+            "batches": batches,
+            "queue_depth": self.depth(),
+            "delivery_latency_ms_p50": (
+                round(statistics.median(latencies) * 1000) if latencies else None
+            ),
+            "delivery_latency_ms_max": (
+                round(max(latencies) * 1000) if latencies else None
+            ),
+        }
+
+
+def _message_body(message: Mapping[str, Any]) -> Mapping[str, Any] | None:
+    try:
+        body = json.loads(message["Body"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not isinstance(body, Mapping) or not isinstance(body.get("text"), str):
+        return None
+    enqueued_at = body.get("enqueued_at")
+    if isinstance(enqueued_at, bool) or not isinstance(enqueued_at, (int, float)):
+        return None
+    return body
+
+
+def _receive_count(message: Mapping[str, Any]) -> int:
+    try:
+        return int(message.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def open_outbox(uri: str) -> Outbox:
+    """Open an SQS queue URL, ``sqlite:///path``, ``file:///path`` or a bare path."""
+    parts = urlsplit(uri)
+    if parts.scheme == "https" and parts.netloc.startswith("sqs."):
+        import boto3
+
+        return Outbox(boto3.client("sqs"), uri)
+    if parts.scheme in {"", "file", "sqlite"}:
+        return Outbox(SqliteQueue(parts.path if parts.scheme else uri), "outbox")
+    raise ValueError(f"unsupported outbox URI: {uri}")
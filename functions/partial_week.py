@@ -0,0 +1,99 @@
+"""Partial-week dormitory publication with persisted completed days.
+
+Every day whose slots are all present is interpreted and published as soon as
+the page shows it, and recorded in the state store under the week's first
+date. A retry only scrapes and processes the days that are still outstanding;
+the retryable error is raised after the completed days have been saved.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from functions import handler
+from functions.archive import ObjectStore, open_store
+
+
+AMBIGUOUS_EMPTY = "AMBIGUOUS_EMPTY"
+
+
+def _state_key(operation: str, week_start: str) -> str:
+    return f"partial-weeks/{operation}/{week_start}.json"
+
+
+def completed_days(store: ObjectStore, operation: str, week_start: str) -> set[str]:
+    raw_state = store.get_object(Key=_state_key(operation, week_start))
+    return set(json.loads(raw_state)["completed"]) if raw_state is not None else set()
+
+
+def _save(
+    store: ObjectStore, operation: str, week_start: str, completed: set[str]
+) -> None:
+    store.put_object(
+        Key=_state_key(operation, week_start),
+        Body=json.dumps(
+            {
+                "completed": sorted(completed),
+                "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+        ).encode("utf-8"),
+    )
+
+
+async def schedule_partial_week(
+    config: Mapping[str, Any], dates: Sequence[str]
+) -> list[dict[str, Any]]:
+    store = open_store(config["partial_week_state_uri"])
+    operation, week_start = config["operation"], dates[0]
+    completed = completed_days(store, operation, week_start)
+    outstanding = [date for date in dates if date not in completed]
+    if not outstanding:
+        handler.emit_event(
+            "INFO", "schedule.partial_week", "publish", completed_days=len(completed)
+        )
+        return []
+
+    raw_meals = await handler._scrape_or_empty(
+        config, outstanding[0], outstanding, dormitory_retry=True
+    )
+    meals_by_date: dict[str, list[Mapping[str, Any]]] = defaultdict(list)
+    for raw_meal in raw_meals:
+        meals_by_date[handler._meal_date(raw_meal, outstanding[0])].append(raw_meal)
+
+    results: list[dict[str, Any]] = []
+    published: list[str] = []
+    send_failures: list[str] = []
+    for date in outstanding:
+        meals = meals_by_date.get(date)
+        if not meals or any(meal.get("outcome") == AMBIGUOUS_EMPTY for meal in meals):
+            continue
+        try:
+            results.extend(await handler._process_meals(config, date, meals))
+        except handler.RetryableApiSendError:
+            send_failures.append(date)
+            continue
+        published.append(date)
+
+    if published:
+        completed.update(published)
+        _save(store, operation, week_start, completed)
+    remaining = [date for date in outstanding if date not in completed]
+    handler.emit_event(
+        "WARNING" if remaining else "INFO",
+        "schedule.partial_week",
+        "publish",
+        completed_days=len(completed),
+        published_days=len(published),
+        outstanding_days=len(remaining),
+    )
+    if send_failures:
+        raise handler.RetryableApiSendError(
+            send_failures[0], failed_days=len(send_failures)
+        )
+    if remaining:
+        raise handler.RetryableEmptyMenuError(remaining[0])
+    return results
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+
+_THRESHOLD_ENVIRONMENT = "PROFILE_SLOW_INVOCATION_MS"
+_INTERVAL_ENVIRONMENT = "PROFILE_SAMPLE_INTERVAL_MS"
+_OUTPUT_ENVIRONMENT = "PROFILE_OUTPUT_DIR"
+_DEFAULT_INTERVAL_MS = 20
+_MAX_DEPTH = 64
+_MAX_STACKS = 2000
+_TRUNCATED_STACK = "[truncated]"
+# Pools that run invocation work off the handler thread: the scraper's parse
+# pool and the default executor behind asyncio.to_thread.
+WORKER_THREAD_PREFIXES = ("menu-parse_", "asyncio_")
+# An idle executor worker blocks in C inside this frame.
+_IDLE_WORKER_FRAME = "thread._worker"
+EVENT_STACK_LIMIT = 200
+
+
+def _positive_milliseconds(name: str) -> int | None:
+    raw_value = os.getenv(name, "")
+    return int(raw_value) if raw_value.isdigit() and int(raw_value) > 0 else None
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}.{code.co_name}"
+
+
+class SamplingProfiler:
+    """Sample Python stacks into flamegraph-ready collapsed stacks.
+
+    The handler thread is sampled as is; busy worker-pool threads are sampled
+    too, under a ``[pool]`` root frame. Pools are shared by the process, so
+    overlapping invocations can appear in each other's worker stacks.
+    """
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval_seconds: float,
+        *,
+        max_depth: int = _MAX_DEPTH,
+        max_stacks: int = _MAX_STACKS,
+        threshold_ms: int = 0,
+    ) -> None:
+        self.thread_id = thread_id
+        self.threshold_ms = threshold_ms
+        self.interval_seconds = interval_seconds
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.overhead_seconds = 0.0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="food-crawling-profiler", daemon=True
+        )
+
+    def start(self) -> SamplingProfiler:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            started = time.perf_counter()
+            frames = sys._current_frames()
+            frame = frames.get(self.thread_id)
+            if frame is not None:
+                self.sample(frame)
+            for thread in threading.enumerate():
+                worker_frame = frames.get(thread.ident or 0)
+                if (
+                    worker_frame is not None
+                    and thread.name.startswith(WORKER_THREAD_PREFIXES)
+                    and _frame_label(worker_frame) != _IDLE_WORKER_FRAME
+                ):
+                    pool = thread.name.rsplit("_", 1)[0]
+                    self.sample(worker_frame, root=f"[{pool}]")
+            self.overhead_seconds += time.perf_counter() - started
+
+    def sample(self, frame: FrameType, root: str | None = None) -> None:
+        labels: list[str] = []
+        current: FrameType | None = frame
+        while current is not None and len(labels) < self.max_depth:
+            labels.append(_frame_label(current))
+            current = current.f_back
+        if root is not None:
+            labels.append(root)
+        stack = ";".join(reversed(labels))
+        if stack not in self.stacks and len(self.stacks) >= self.max_stacks:
+            stack = _TRUNCATED_STACK
+        self.stacks[stack] += 1
+        self.samples += 1
+
+    def collapsed(self, limit: int | None = None) -> str:
+        """Return ``frame;frame count`` lines, heaviest stacks first."""
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.stacks.most_common(limit)
+        )
+
+
+def slow_invocation_profiler() -> SamplingProfiler | None:
+    """Start a profiler for the calling thread when the slow-run hook is enabled."""
+    threshold_ms = _positive_milliseconds(_THRESHOLD_ENVIRONMENT)
+    if threshold_ms is None:
+        return None
+    interval_ms = _positive_milliseconds(_INTERVAL_ENVIRONMENT) or _DEFAULT_INTERVAL_MS
+    return SamplingProfiler(
+        threading.get_ident(), interval_ms / 1000, threshold_ms=threshold_ms
+    ).start()
+
+
+def write_profile(profiler: SamplingProfiler, invocation_id: str) -> str | None:
+    """Write the full collapsed profile under PROFILE_OUTPUT_DIR for later upload."""
+    directory = os.getenv(_OUTPUT_ENVIRONMENT)
+    if not directory:
+        return None
+    safe_name = "".join(
+        character if character.isalnum() or character in "-_" else "_"
+        for character in invocation_id
+    )
+    path = Path(directory) / f"{safe_name or 'invocation'}.collapsed"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ = path.write_text(profiler.collapsed() + "\n", encoding="utf-8")
+    return str(path)
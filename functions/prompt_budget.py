@@ -0,0 +1,129 @@
+"""Local prompt token accounting and per-restaurant prompt budgets."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+from functions import menu_ai
+from functions.translation_memory import estimated_tokens
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only without the tokens extra
+    tiktoken = None
+
+
+ENCODING = "o200k_base"
+
+
+class PromptBudgetError(menu_ai.MenuInterpretationError):
+    """The canonical prompt for one meal exceeds the restaurant's token budget."""
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(ENCODING)
+    except Exception:
+        # The encoding is downloaded on first use; estimate when that fails.
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with ``tiktoken`` when installed, else estimate from bytes."""
+    encoding = _encoding()
+    if encoding is None:
+        return estimated_tokens(text)
+    return len(encoding.encode(text))
+
+
+def request_tokens(request: Mapping[str, Any]) -> int:
+    """Local token count of the messages and tool schema of a completion request."""
+    text = "".join(str(message["content"]) for message in request["messages"])
+    return count_tokens(text) + count_tokens(
+        json.dumps(request.get("tools", []), ensure_ascii=False, sort_keys=True)
+    )
+
+
+def _usage_count(value: object, name: str) -> int:
+    count = getattr(value, name, None)
+    return count if isinstance(count, int) and not isinstance(count, bool) else 0
+
+
+class PromptBudget:
+    """Count every canonical prompt before it is sent and tally provider usage.
+
+    ``admit`` rejects a meal whose prompt exceeds ``limit`` with
+    ``PromptBudgetError`` so runaway scraper text never reaches the model;
+    ``observe`` adds the prompt, cached and completion tokens a response reports.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.prompts = 0
+        self.local_tokens = 0
+        self.largest_prompt = 0
+        self.over_budget = 0
+        self.responses = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+
+    def admit(
+        self,
+        restaurant: str,
+        raw_source: str,
+        source_english: tuple[str, ...],
+    ) -> int:
+        tokens = request_tokens(
+            menu_ai.completion_request(restaurant, raw_source, source_english)
+        )
+        self.prompts += 1
+        self.local_tokens += tokens
+        self.largest_prompt = max(self.largest_prompt, tokens)
+        if tokens > self.limit:
+            self.over_budget += 1
+            raise PromptBudgetError(
+                f"prompt needs {tokens} tokens; {restaurant} budget is {self.limit}"
+            )
+        return tokens
+
+    def observe(self, response: object) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.responses += 1
+        self.prompt_tokens += _usage_count(usage, "prompt_tokens")
+        self.completion_tokens += _usage_count(usage, "completion_tokens")
+        self.cached_tokens += _usage_count(
+            getattr(usage, "prompt_tokens_details", None), "cached_tokens"
+        )
+
+    def take_stats(self) -> dict[str, Any]:
+        stats = {
+            "prompts": self.prompts,
+            "prompt_token_budget": self.limit,
+            "local_prompt_tokens": self.local_tokens,
+            "largest_prompt_tokens": self.largest_prompt,
+            "over_budget": self.over_budget,
+            "responses_with_usage": self.responses,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "prompt_cache_hit_rate": (
+                round(self.cached_tokens / self.prompt_tokens, 3)
+                if self.prompt_tokens
+                else None
+            ),
+            "tokenizer": ENCODING if _encoding() is not None else "estimate",
+        }
+        self.reset_stats()
+        return stats
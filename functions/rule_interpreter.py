@@ -0,0 +1,178 @@
+"""Deterministic interpretation of Soongguri menus that carry English evidence."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from functions.menu_ai import (
+    _BRACKETED_LABEL_RE,
+    _DECORATION_RE,
+    _HANGUL_RE,
+    _LATIN_RE,
+    _SLOT_LABEL_RE,
+    MenuInterpretation,
+    MenuInterpretationError,
+    has_site_english,
+    validate_tool_arguments,
+)
+
+
+DEFAULT_MIN_CONFIDENCE = 0.8
+_BRACKET_RE = re.compile(r"\[[^\]]*\]")
+_DIGIT_RE = re.compile(r"\d")
+# Penalties multiply into the confidence score; each marks text GPT would have
+# to judge rather than split.
+_AMBIGUOUS_MAIN = 0.5
+_EXTRA_MAIN = 0.3
+_MIXED_SCRIPT = 0.3
+_NUMERIC_TOKEN = 0.3
+_PHRASE_FRAGMENT = 0.4
+_STRAY_ENGLISH = 0.2
+_DUPLICATE_MENU = 0.1
+
+
+def _items(raw_source: str, evidence: tuple[str, ...]) -> list[tuple[str, str]]:
+    """Tokenize into ``("en", phrase)``, ``("label", text)`` and ``("word", token)``."""
+    text = _DECORATION_RE.sub(" ", raw_source)
+    alternatives = [_BRACKET_RE.pattern]
+    alternatives.extend(
+        re.escape(phrase) for phrase in sorted(set(evidence), key=len, reverse=True)
+    )
+    pattern = re.compile("|".join(alternatives))
+    items: list[tuple[str, str]] = []
+    cursor = 0
+    for match in pattern.finditer(text):
+        items.extend(("word", token) for token in text[cursor : match.start()].split())
+        kind = "label" if _BRACKETED_LABEL_RE.fullmatch(match.group(0)) else "en"
+        items.append((kind, match.group(0)))
+        cursor = match.end()
+    items.extend(("word", token) for token in text[cursor:].split())
+    return items
+
+
+def rule_arguments(
+    raw_source: str, source_english: Iterable[str] = ()
+) -> tuple[dict[str, Any], float] | None:
+    """Split a site menu into tool arguments plus a confidence score in [0, 1]."""
+    evidence = tuple(phrase for phrase in source_english if phrase.strip())
+    if not evidence:
+        return None
+    menu_names: list[str] = []
+    candidates: list[dict[str, Any]] = []
+    segment: list[int] = []
+    confidence = 1.0
+    for kind, value in _items(raw_source, evidence):
+        if kind == "label" or _SLOT_LABEL_RE.fullmatch(value):
+            segment = []
+            continue
+        if kind == "en":
+            if not segment:
+                return None
+            if len(segment) > 1:
+                confidence *= 1 - _AMBIGUOUS_MAIN
+            if candidates:
+                # English service labels look exactly like a second main menu.
+                confidence *= 1 - _EXTRA_MAIN
+            index = segment[-1]
+            if all(candidate["menuIndex"] != index for candidate in candidates):
+                candidates.append({"menuIndex": index, "nameEn": value})
+            segment = []
+            continue
+        if not _HANGUL_RE.search(value):
+            if _LATIN_RE.search(value):
+                confidence *= 1 - _STRAY_ENGLISH
+            continue
+        if _LATIN_RE.search(value):
+            confidence *= 1 - _MIXED_SCRIPT
+        if _DIGIT_RE.search(value):
+            confidence *= 1 - _NUMERIC_TOKEN
+        if value.endswith("의"):
+            confidence *= 1 - _PHRASE_FRAGMENT
+        if value in menu_names:
+            confidence *= 1 - _DUPLICATE_MENU
+            segment.append(menu_names.index(value))
+            continue
+        segment.append(len(menu_names))
+        menu_names.append(value)
+    if not menu_names or not candidates:
+        return None
+    return {"menuNames": menu_names, "mainCandidates": candidates}, round(confidence, 3)
+
+
+def interpret_with_rules(
+    restaurant: str, raw_source: str, source_english: Iterable[str] = ()
+) -> tuple[MenuInterpretation, float] | None:
+    """Return a validator-approved interpretation and its confidence, if any."""
+    if not has_site_english(restaurant):
+        return None
+    evidence = tuple(source_english)
+    ruled = rule_arguments(raw_source, evidence)
+    if ruled is None:
+        return None
+    arguments, confidence = ruled
+    try:
+        interpretation = validate_tool_arguments(
+            arguments, restaurant, raw_source, evidence
+        )
+    except MenuInterpretationError:
+        return None
+    return interpretation, confidence
+
+
+class RuleFastPath:
+    """Serve confident rule-based interpretations and account for skipped calls.
+
+    Model latency is tracked as a moving average across the warm container so a
+    run served entirely by rules can still report the latency it saved.
+    """
+
+    def __init__(self, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> None:
+        self.min_confidence = min_confidence
+        self.model_latency: float | None = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.meals = 0
+        self.hits = 0
+        self.model_calls = 0
+        self.lowest_confidence: float | None = None
+
+    def interpret(
+        self, restaurant: str, raw_source: str, source_english: Iterable[str]
+    ) -> MenuInterpretation | None:
+        self.meals += 1
+        ruled = interpret_with_rules(restaurant, raw_source, source_english)
+        if ruled is None:
+            return None
+        interpretation, confidence = ruled
+        if self.lowest_confidence is None or confidence < self.lowest_confidence:
+            self.lowest_confidence = confidence
+        if confidence < self.min_confidence:
+            return None
+        self.hits += 1
+        return interpretation
+
+    def observe_model_call(self, seconds: float) -> None:
+        self.model_calls += 1
+        self.model_latency = (
+            seconds
+            if self.model_latency is None
+            else 0.8 * self.model_latency + 0.2 * seconds
+        )
+
+    def take_stats(self) -> dict[str, Any]:
+        stats = {
+            "meals": self.meals,
+            "fast_path_hits": self.hits,
+            "fast_path_rate": round(self.hits / self.meals, 3) if self.meals else None,
+            "model_calls": self.model_calls,
+            "min_confidence": self.min_confidence,
+            "lowest_confidence": self.lowest_confidence,
+            "estimated_latency_saved_ms": round(self.hits * self.model_latency * 1000)
+            if self.model_latency is not None
+            else None,
+        }
+        self.reset_stats()
+        return stats
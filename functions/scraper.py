@@ -1,28 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import html
+import logging
+import os
 import re
-from collections.abc import Callable, Iterable, Mapping, Sequence
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 import aiohttp
 from bs4 import BeautifulSoup, Tag
 
+from functions import metrics, sources
 
-SOONGGURI_BASE_URL = "http://m.soongguri.com/m_req/m_menu.php"
-DORMITORY_BASE_URL = "https://ssudorm.ssu.ac.kr:444/SShostel/mall_main.php"
 
-SOONGGURI_RESTAURANTS: Mapping[str, int] = {
-    "HAKSIK": 1,
-    "DODAM": 2,
-    "FACULTY": 7,
-}
+logger = logging.getLogger(__name__)
 
 SUCCESS = "SUCCESS"
 EXPECTED_EMPTY = "EXPECTED_EMPTY"
 AMBIGUOUS_EMPTY = "AMBIGUOUS_EMPTY"
 API_FAILURE = "API_FAILURE"
+PARSE_WORKERS_ENVIRONMENT = "PARSE_WORKERS"
+MAX_PARSE_WORKERS = 4
+
+# Kept for importers from before the source registry; built-in sources only.
+SOONGGURI_BASE_URL = sources.SOONGGURI_BASE_URL
+DORMITORY_BASE_URL = sources.DORMITORY_BASE_URL
+SOONGGURI_RESTAURANTS: Mapping[str, int] = {
+    spec.restaurant: int(spec.query["rcd"])
+    for spec in sources.BUILTIN_SOURCES
+    if spec.family == "soongguri"
+}
 
 _CLOSURE_MARKERS = frozenset(
     {
@@ -34,6 +48,20 @@ _CLOSURE_MARKERS = frozenset(
         "오늘은 쉽니다.",
     }
 )
+_DORMITORY_TABLE = re.compile(
+    r"<table[^>]*class=[\"'][^\"']*boxstyle02[^>]*>(.*?)</table>", re.I | re.S
+)
+_TABLE_ROW = re.compile(r"<tr[^>]*>(.*?)</tr>", re.I | re.S)
+_TABLE_CELL = re.compile(r"<t[hd][^>]*>(.*?)</t[hd]>", re.I | re.S)
+_SPANNED_CELL = re.compile(r"\b(?:row|col)span\s*=", re.I)
+_MARKUP = re.compile(r"<[^>]+>")
+_DAY_CLOSURE_TEXT = "오늘은 쉽니다."
+_DAY_CLOSURE_NODE = re.compile(r"(?:^|>)\s*오늘은 쉽니다\.\s*(?:<|$)")
+_QUOTED_TAG = re.compile(r"<(?:[^<>\"']|\"[^\"]*\"|'[^']*')*>")
+# Any character reference, numeric or named ("&#46;", "&nbsp;", "&period;").
+_ENTITY_MARKER = "&"
+# Markup the byte scan cannot read the way html.parser does.
+_OPAQUE_MARKUP = (_ENTITY_MARKER, "<!--", "<script", "<style", "<![cdata")
 _ENGLISH_PHRASE = re.compile(
     r"(?<![A-Za-z])(?:[A-Za-z][A-Za-z'’-]*)(?:[ \t]+[A-Za-z][A-Za-z'’-]*)*"
 )
@@ -95,10 +123,16 @@ def _restaurant_name(restaurant: object) -> str:
     value = restaurant if isinstance(restaurant, str) else getattr(restaurant, "name", None)
     if not isinstance(value, str):
         raise ValueError("restaurant must be a restaurant name")
-    name = value.upper()
-    if name not in {*SOONGGURI_RESTAURANTS, "DORMITORY"}:
+    if sources.source(value) is None:
         raise ValueError(f"unsupported restaurant: {value}")
-    return name
+    return value.upper()
+
+
+def _family(name: str) -> str:
+    compiled = sources.source(name)
+    if compiled is None:
+        raise ValueError(f"unsupported restaurant: {name}")
+    return compiled.spec.family
 
 
 def _normalized_text(value: str) -> str:
@@ -109,6 +143,28 @@ def _is_closure(value: str) -> bool:
     return _normalized_text(value) in _CLOSURE_MARKERS
 
 
+def _precheck_soongguri(html_content: str, date: str, name: str) -> None:
+    """Classify pages that cannot hold menu rows without building a tree.
+
+    Raises the same errors the full parser would; returns when the page may
+    contain menus or the raw markup is ambiguous.
+    """
+    if "menu_nm" in html_content:
+        return
+    lowered = html_content.lower()
+    if any(marker in lowered for marker in _OPAQUE_MARKUP):
+        return
+    if _DAY_CLOSURE_NODE.search(html_content):
+        raise HolidayError(date, name)
+    if _DAY_CLOSURE_TEXT in html_content:
+        return
+    text = _QUOTED_TAG.sub(" ", html_content)
+    if "<" in text:
+        return
+    reason = "SOURCE_SCHEMA_CHANGED" if text.strip() else "SOURCE_EMPTY"
+    raise SourceParseError(date, name, reason)
+
+
 def _is_day_closure(soup: BeautifulSoup) -> bool:
     for text_node in soup.find_all(
         string=lambda value: bool(value and value.strip() == "오늘은 쉽니다.")
@@ -139,11 +195,13 @@ def parse_soongguri_html(
     restaurant: object,
 ) -> list[MealRecord]:
     name = _restaurant_name(restaurant)
-    if name not in SOONGGURI_RESTAURANTS:
+    if _family(name) != "soongguri":
         raise ValueError(f"not a Soongguri restaurant: {name}")
 
+    _precheck_soongguri(html_content, date, name)
     soup = BeautifulSoup(html_content, "html.parser")
-    if _is_day_closure(soup):
+    may_close = _DAY_CLOSURE_TEXT in html_content or _ENTITY_MARKER in html_content
+    if may_close and _is_day_closure(soup):
         raise HolidayError(date, name)
 
     rows = [
@@ -218,47 +276,86 @@ def _span(cell: Tag, attribute: str) -> int:
     return int(raw_value)
 
 
-def _table_matrix(table: Tag) -> list[list[str | None]]:
-    rows = [row for row in table.find_all("tr") if isinstance(row, Tag)]
-    matrix: list[dict[int, str]] = []
-    active: dict[int, tuple[int, str]] = {}
+class _TableGrid:
+    """Row-major cell texts with spans resolved; ``None`` marks an empty position."""
 
-    for row in rows:
-        values = {column: value for column, (_, value) in active.items()}
-        next_active: dict[int, tuple[int, str]] = {
-            column: (remaining - 1, value)
-            for column, (remaining, value) in active.items()
-            if remaining > 1
-        }
-        column = 0
-        cells = [
-            cell
+    __slots__ = ("width", "height", "cells", "_columns")
+
+    def __init__(self, width: int, height: int, cells: list[str | None]) -> None:
+        self.width = width
+        self.height = height
+        self.cells = cells
+        self._columns: dict[str, int] = {}
+        for column, text in enumerate(cells[:width]):
+            if text is not None:
+                _ = self._columns.setdefault(text, column)
+
+    def column(self, header: str) -> int | None:
+        """First column whose header-row text equals ``header``."""
+        return self._columns.get(header)
+
+    def rows(self, start: int = 0) -> Iterator[list[str | None]]:
+        for row_index in range(start, self.height):
+            offset = row_index * self.width
+            yield self.cells[offset : offset + self.width]
+
+
+def _table_grid(table: Tag) -> _TableGrid:
+    specs: list[list[tuple[str, int, int]]] = []
+    bound = carried = 0
+    released: dict[int, int] = defaultdict(int)
+    for row in table.find_all("tr"):
+        if not isinstance(row, Tag):
+            continue
+        carried -= released.pop(len(specs), 0)
+        row_specs = [
+            (cell.get_text().strip(), _span(cell, "colspan"), _span(cell, "rowspan"))
             for cell in row.find_all(["th", "td"], recursive=False)
             if isinstance(cell, Tag)
         ]
-        for cell in cells:
-            while column in values:
+        bound = max(bound, carried + sum(colspan for _, colspan, _ in row_specs))
+        for _, colspan, rowspan in row_specs:
+            if rowspan > 1:
+                carried += colspan
+                released[len(specs) + rowspan] += colspan
+        specs.append(row_specs)
+
+    # Every position lies left of ``bound``, so the grid never has to grow.
+    height = len(specs)
+    cells: list[str | None] = [None] * (bound * height)
+    remaining = [0] * bound
+    carried_text: list[str | None] = [None] * bound
+    width = 0
+    for row_index, row_specs in enumerate(specs):
+        base = row_index * bound
+        for column in range(bound):
+            if remaining[column]:
+                cells[base + column] = carried_text[column]
+                remaining[column] -= 1
+                width = max(width, column + 1)
+        column = 0
+        for text, colspan, rowspan in row_specs:
+            while cells[base + column] is not None:
                 column += 1
-            colspan = _span(cell, "colspan")
-            rowspan = _span(cell, "rowspan")
-            text = cell.get_text().strip()
-            for offset in range(colspan):
-                target = column + offset
-                if target in values:
+            for target in range(column, column + colspan):
+                if cells[base + target] is not None:
                     raise ValueError("overlapping table span")
-                values[target] = text
+                cells[base + target] = text
                 if rowspan > 1:
-                    next_active[target] = (rowspan - 1, text)
+                    remaining[target] = rowspan - 1
+                    carried_text[target] = text
             column += colspan
-        matrix.append(values)
-        active = next_active
+            width = max(width, column)
 
-    if active:
+    if any(remaining):
         raise ValueError("rowspan exceeds table rows")
-    if not matrix:
-        return []
-    width = max((max(row, default=-1) for row in matrix), default=-1) + 1
-    return [[row.get(column) for column in range(width)] for row in matrix]
+    if width != bound:
+        cells = [
+            cells[row_index * bound + column]
+            for row_index in range(height)
+            for column in range(width)
+        ]
+    return _TableGrid(width, height, cells)
 
 
 def _requested_date_map(requested_dates: Iterable[str]) -> tuple[list[str], dict[str, str]]:
@@ -294,29 +391,32 @@ def parse_dormitory_html(
 ) -> list[MealRecord]:
     ordered_dates, requested = _requested_date_map(requested_dates)
     error_date = ordered_dates[0]
+    if "boxstyle02" not in html_content and _ENTITY_MARKER not in html_content:
+        raise SourceParseError(error_date, "DORMITORY", "SOURCE_SCHEMA_CHANGED")
     soup = BeautifulSoup(html_content, "html.parser")
     table = soup.find("table", class_="boxstyle02")
     if not isinstance(table, Tag):
         raise SourceParseError(error_date, "DORMITORY", "SOURCE_SCHEMA_CHANGED")
 
     try:
-        matrix = _table_matrix(table)
+        grid = _table_grid(table)
     except ValueError as error:
         raise SourceParseError(error_date, "DORMITORY", "SOURCE_SCHEMA_CHANGED") from error
-    if not matrix:
+    if not grid.height:
         raise SourceParseError(error_date, "DORMITORY", "SOURCE_EMPTY")
 
-    headers = matrix[0]
-    if "날짜" not in headers:
+    date_index = grid.column("날짜")
+    if date_index is None:
         raise SourceParseError(error_date, "DORMITORY", "MISSING_DATE_HEADER")
-    date_index = headers.index("날짜")
     meal_indices = {
-        slot: headers.index(slot) for slot in ("중식", "석식") if slot in headers
+        slot: index
+        for slot in ("중식", "석식")
+        if (index := grid.column(slot)) is not None
     }
 
     records_by_date: dict[str, list[MealRecord]] = {}
-    for row in matrix[1:]:
-        raw_date = row[date_index] if date_index < len(row) else None
+    for row in grid.rows(start=1):
+        raw_date = row[date_index]
         if raw_date is None:
             raise SourceParseError(error_date, "DORMITORY", "MISSING_DATE_CELL")
         date = _source_date(raw_date, requested)
@@ -326,7 +426,7 @@ def parse_dormitory_html(
         day_records: list[MealRecord] = []
         for slot in ("중식", "석식"):
             index = meal_indices.get(slot)
-            value = row[index] if index is not None and index < len(row) else None
+            value = row[index] if index is not None else None
             if index is None or value is None:
                 day_records.append(
                     MealRecord(
@@ -372,6 +472,102 @@ def parse_dormitory_html(
     return [record for date in ordered_dates for record in records_by_date.get(date, [])]
 
 
+@dataclass(frozen=True)
+class DormitoryProbe:
+    modified: bool
+    sha256: str | None
+    etag: str | None
+    last_modified: str | None
+    ready_dates: tuple[str, ...] | None
+
+
+def ready_dormitory_dates(
+    html_content: str, requested_dates: Iterable[str]
+) -> tuple[str, ...] | None:
+    """Requested dates whose lunch and dinner cells both have text, found without a DOM.
+
+    This is the full parser's rule: a missing column or a cell that is only
+    whitespace or entities such as ``&nbsp;`` leaves the date ambiguous. Returns
+    ``None`` when the table cannot be read this way (spanned cells or an
+    unexpected header), in which case only the full parser can tell.
+    """
+    ordered_dates, requested = _requested_date_map(requested_dates)
+    table = _DORMITORY_TABLE.search(html_content)
+    if table is None or _SPANNED_CELL.search(table.group(1)):
+        return None
+    rows = [
+        [
+            html.unescape(_MARKUP.sub("", cell)).strip()
+            for cell in _TABLE_CELL.findall(row)
+        ]
+        for row in _TABLE_ROW.findall(table.group(1))
+    ]
+    if not rows or "날짜" not in rows[0]:
+        return None
+    headers = rows[0]
+    date_index = headers.index("날짜")
+    if "중식" not in headers or "석식" not in headers:
+        return ()
+    meal_indices = [headers.index("중식"), headers.index("석식")]
+    ready = set()
+    for row in rows[1:]:
+        if date_index >= len(row):
+            continue
+        date = _source_date(row[date_index], requested) if row[date_index] else None
+        if date is not None and all(
+            index < len(row) and row[index] for index in meal_indices
+        ):
+            ready.add(date)
+    return tuple(date for date in ordered_dates if date in ready)
+
+
+@metrics.timed("source.probe.latency")
+async def probe_dormitory_page(
+    requested_dates: Iterable[str],
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    dormitory_base_url: str | None = None,
+    session_factory: Callable[[], Any] | None = None,
+) -> DormitoryProbe:
+    """Conditionally fetch the dormitory week and report which dates have menus."""
+    dates = tuple(requested_dates)
+    url, params = sources.registry()["DORMITORY"].request(dates[0], dormitory_base_url)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    make_session = session_factory or aiohttp.ClientSession
+
+    try:
+        async with make_session() as session:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status == 304:
+                    return DormitoryProbe(False, None, etag, last_modified, None)
+                _ = response.raise_for_status()
+                html_content = await response.text()
+                response_headers = response.headers
+    except Exception as error:
+        status_value = getattr(error, "status", None)
+        raise ScraperError(
+            dates[0],
+            "DORMITORY",
+            "SOURCE_HTTP_ERROR",
+            API_FAILURE,
+            error_type=type(error).__name__,
+            status=status_value if isinstance(status_value, int) else None,
+        ) from None
+
+    return DormitoryProbe(
+        True,
+        hashlib.sha256(html_content.encode("utf-8")).hexdigest(),
+        response_headers.get("ETag"),
+        response_headers.get("Last-Modified"),
+        ready_dormitory_dates(html_content, dates),
+    )
+
+
 def parse_menu_html(
     html_content: str,
     restaurant: object,
@@ -381,49 +577,97 @@ def parse_menu_html(
     dates = tuple(requested_dates)
     if not dates:
         raise ValueError("requested_dates must not be empty")
-    parser = PARSERS[name]
-    if name == "DORMITORY":
-        return parser(html_content, dates)
+    family = _family(name)
+    if family == "dormitory":
+        return parse_dormitory_html(html_content, dates)
     if len(dates) != 1:
         raise ValueError("Soongguri parsing requires exactly one requested date")
-    return parser(html_content, dates[0], name)
+    return parse_soongguri_html(html_content, dates[0], name)
 
 
 PARSERS: Mapping[str, Callable[..., list[MealRecord]]] = {
-    "HAKSIK": parse_soongguri_html,
-    "DODAM": parse_soongguri_html,
-    "FACULTY": parse_soongguri_html,
-    "DORMITORY": parse_dormitory_html,
+    spec.restaurant: (
+        parse_dormitory_html if spec.family == "dormitory" else parse_soongguri_html
+    )
+    for spec in sources.BUILTIN_SOURCES
 }
 
 
+_parse_pool: ThreadPoolExecutor | None = None
+
+
+def _parse_workers() -> int:
+    """Parse pool size from ``PARSE_WORKERS``; 0 parses inline on the caller's thread."""
+    return _worker_count(os.getenv(PARSE_WORKERS_ENVIRONMENT))
+
+
+@lru_cache(maxsize=4)
+def _worker_count(raw_value: str | None) -> int:
+    default = min(os.cpu_count() or 1, MAX_PARSE_WORKERS)
+    if not raw_value:
+        return default
+    try:
+        workers = int(raw_value)
+    except ValueError:
+        workers = -1
+    if workers < 0:
+        logger.warning(
+            "ignoring %s=%r; using %d workers", PARSE_WORKERS_ENVIRONMENT, raw_value, default
+        )
+        return default
+    return min(workers, MAX_PARSE_WORKERS)
+
+
+def _parse_executor() -> ThreadPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ThreadPoolExecutor(_parse_workers(), thread_name_prefix="menu-parse")
+    return _parse_pool
+
+
+async def parse_menu_html_async(
+    html_content: str,
+    restaurant: object,
+    requested_dates: Iterable[str],
+) -> list[MealRecord]:
+    """``parse_menu_html`` on the bounded parse pool, raising the same errors."""
+    if _parse_workers() == 0:
+        return parse_menu_html(html_content, restaurant, tuple(requested_dates))
+    return await asyncio.get_running_loop().run_in_executor(
+        _parse_executor(),
+        parse_menu_html,
+        html_content,
+        restaurant,
+        tuple(requested_dates),
+    )
+
+
+@metrics.timed("source.fetch.latency")
 async def fetch_meals(
     restaurant: object,
     date: str,
     *,
     requested_dates: Iterable[str] | None = None,
-    soongguri_base_url: str = SOONGGURI_BASE_URL,
-    dormitory_base_url: str = DORMITORY_BASE_URL,
+    soongguri_base_url: str | None = None,
+    dormitory_base_url: str | None = None,
     session_factory: Callable[[], Any] | None = None,
+    page_sink: Callable[[str, str, str], None] | None = None,
 ) -> list[MealRecord]:
     name = _restaurant_name(restaurant)
+    compiled = sources.registry()[name]
+    base_url = (
+        dormitory_base_url if compiled.spec.family == "dormitory" else soongguri_base_url
+    )
+    url, params = compiled.request(date, base_url)
     dates = tuple(requested_dates) if requested_dates is not None else (date,)
     make_session = session_factory or aiohttp.ClientSession
 
     try:
         async with make_session() as session:
-            if name == "DORMITORY":
-                date_value = datetime.strptime(date, "%Y%m%d")
-                params = {
-                    "viewform": "B0001_foodboard_list",
-                    "gyear": date_value.year,
-                    "gmonth": date_value.month,
-                    "gday": date_value.day,
-                }
-                request = session.get(dormitory_base_url, params=params)
-            else:
-                url = f"{soongguri_base_url}?rcd={SOONGGURI_RESTAURANTS[name]}&sdt={date}"
+            if params is None:
                 request = session.get(url)
+            else:
+                request = session.get(url, params=params)
             async with request as response:
                 _ = response.raise_for_status()
                 html_content = await response.text()
@@ -439,4 +683,7 @@ async def fetch_meals(
             status=status,
         ) from None
 
-    return parse_menu_html(html_content, name, dates)
+    if page_sink is not None:
+        # Archiving writes to S3 or disk; keep it off the event loop.
+        await asyncio.to_thread(page_sink, name, date, html_content)
+    return await parse_menu_html_async(html_content, name, dates)
@@ -0,0 +1,491 @@
+"""Memory and CPU right-sizing for the deployed functions.
+
+Every operation runs through ``orchestrate`` with in-process stand-ins for the
+source, OpenAI, Spring and Slack, each answering after an injected latency.
+tracemalloc and process CPU time are read around every client call (a stage)
+and around the whole invocation; ``recommend`` turns the totals into a Lambda
+memory size and timeout::
+
+    python -m functions.sizing --output sizing.json
+
+Stage figures are exact when calls do not overlap. Schedule runs interpret
+slots concurrently, so their stage peaks are lower bounds; the operation peak
+is always the true maximum.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from typing import Any
+
+from functions import clients, handler, menu_ai, scraper
+
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "tests/fixtures/characterization"
+STAGES = MappingProxyType(
+    {
+        "fetch_meals": "fetch",
+        "interpret_menu": "interpret",
+        "publish_spring_meal": "publish",
+        "send_slack_text": "notify",
+    }
+)
+DEFAULT_LATENCY_MS = MappingProxyType(
+    {"fetch": 400.0, "interpret": 3000.0, "publish": 150.0, "notify": 150.0}
+)
+# Lambda allocates one full vCPU at 1769 MB and CPU share linearly below it.
+FULL_VCPU_MEMORY_MB = 1769
+MIN_MEMORY_MB = 128
+MEMORY_STEP_MB = 64
+MEMORY_HEADROOM = 1.5
+MIN_TIMEOUT_S = 30
+TIMEOUT_HEADROOM = 3.0
+STAND_IN_ENVIRONMENT = MappingProxyType(
+    {
+        "GPT_API_KEY": "sizing",
+        "SLACK_WEBHOOK_URL": "http://sizing.invalid/slack",
+        "API_BASE_URL": "http://sizing.invalid/prod",
+        "DEV_API_BASE_URL": "http://sizing.invalid/dev",
+    }
+)
+_RETRYING_CLIENTS = MappingProxyType(
+    {
+        "interpret": menu_ai._request_completion,
+        "publish": clients.publish_spring_meal,
+        "notify": clients.send_slack_text,
+    }
+)
+_HANGUL_WORD = re.compile(r"[가-힣]+")
+_ENGLISH_PHRASE = re.compile(r"[A-Za-z][A-Za-z' -]*[A-Za-z]")
+_DORMITORY_ROW = re.compile(r"<tr>\s*<td>[^<]*</td>(.*?)</tr>", re.S)
+_WEEKDAYS = "월화수목금토일"
+
+
+@dataclass
+class StageUsage:
+    calls: int = 0
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_kib: float = 0.0
+
+
+@dataclass(frozen=True)
+class OperationUsage:
+    function: str
+    operation: str
+    status: int
+    wall_ms: float
+    cpu_ms: float
+    peak_kib: float
+    stages: Mapping[str, StageUsage] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    memory_mb: int
+    timeout_s: int
+
+
+class _Meter:
+    """Folds every tracemalloc peak into the invocation peak before resetting it."""
+
+    def __init__(self) -> None:
+        self.peak = 0
+        self.stages: dict[str, StageUsage] = {}
+
+    def checkpoint(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def wrap(
+        self, stage: str, client: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        async def measured(*args: Any, **kwargs: Any) -> Any:
+            baseline = self.checkpoint()
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return await client(*args, **kwargs)
+            finally:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak = max(self.peak, peak)
+                usage = self.stages.setdefault(stage, StageUsage())
+                usage.calls += 1
+                usage.wall_ms += (time.perf_counter() - wall) * 1000
+                usage.cpu_ms += (time.process_time() - cpu) * 1000
+                usage.peak_kib = max(usage.peak_kib, max(peak - baseline, 0) / 1024)
+
+        return measured
+
+
+def dormitory_week(template_html: str, dates: Sequence[str]) -> str:
+    """Repeat the template's day rows so the page covers every requested date."""
+    rows = _DORMITORY_ROW.findall(template_html)
+    header = template_html[: template_html.index("</tr>") + len("</tr>")]
+    body = []
+    for index, date in enumerate(dates):
+        value = datetime.strptime(date, "%Y%m%d")
+        label = f"{value:%m-%d} {_WEEKDAYS[value.weekday()]}"
+        body.append(f"<tr><td>{label}</td>{rows[index % len(rows)]}</tr>")
+    return f"{header}{''.join(body)}</table>"
+
+
+class _Page:
+    def __init__(self, html: str, latency_s: float) -> None:
+        self.html = html
+        self.latency_s = latency_s
+
+    async def __aenter__(self) -> _Page:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def get(self, *args: object, **kwargs: object) -> _Page:
+        return self
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def text(self) -> str:
+        await asyncio.sleep(self.latency_s)
+        return self.html
+
+
+def _completion(restaurant: str, raw_source: str, evidence: Sequence[str]) -> object:
+    names = list(
+        dict.fromkeys(
+            word
+            for word in _HANGUL_WORD.findall(raw_source)
+            if not menu_ai._SLOT_LABEL_RE.fullmatch(word)
+        )
+    )
+    if menu_ai.has_site_english(restaurant):
+        english = [*evidence, *_ENGLISH_PHRASE.findall(raw_source)]
+        candidates = [{"menuIndex": 0, "nameEn": english[0] if english else "Menu"}]
+    else:
+        candidates = [
+            {"menuIndex": index, "nameEn": f"Menu {index + 1}"}
+            for index in range(min(3, len(names)))
+        ]
+    arguments = json.dumps({"menuNames": names, "mainCandidates": candidates})
+    call = SimpleNamespace(
+        function=SimpleNamespace(name=menu_ai.TOOL_NAME, arguments=arguments)
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))])
+
+
+def fixture_page(pages: Mapping[str, str]) -> Callable[[str, Sequence[str]], str]:
+    """Serve each restaurant's fixture; the dormitory page covers the requested dates."""
+
+    def page(restaurant: str, dates: Sequence[str]) -> str:
+        html = pages[restaurant]
+        return dormitory_week(html, dates) if restaurant == "DORMITORY" else html
+
+    return page
+
+
+def stand_ins(
+    page: Callable[[str, Sequence[str]], str],
+    latency_ms: Mapping[str, float],
+    jitter: random.Random | None = None,
+) -> dict[str, Callable[..., Awaitable[Any]]]:
+    """Source, OpenAI, Spring and Slack clients answering after injected latency.
+
+    With ``jitter`` every call waits between half and one and a half times the
+    stage latency instead of exactly the stage latency.
+    """
+
+    def latency(stage: str) -> float:
+        scale = jitter.uniform(0.5, 1.5) if jitter is not None else 1.0
+        return latency_ms.get(stage, 0.0) * scale / 1000
+
+    async def fetch_meals(restaurant: str, date: str, **kwargs: Any) -> Any:
+        session = _Page(
+            page(restaurant, kwargs.get("requested_dates") or (date,)), latency("fetch")
+        )
+        return await scraper.fetch_meals(
+            restaurant, date, session_factory=lambda: session, **kwargs
+        )
+
+    async def request_completion(
+        client: object,
+        restaurant: str,
+        raw_source: str,
+        evidence: Sequence[str],
+        **_: Any,
+    ) -> object:
+        await asyncio.sleep(latency("interpret"))
+        return _completion(restaurant, raw_source, evidence)
+
+    async def publish_spring_meal(**_: Any) -> clients.SpringPublishResult:
+        await asyncio.sleep(latency("publish"))
+        return clients.SpringPublishResult(accepted=True)
+
+    async def send_slack_text(**_: Any) -> None:
+        await asyncio.sleep(latency("notify"))
+
+    return {
+        "fetch_meals": fetch_meals,
+        "interpret_menu": partial(
+            menu_ai.interpret_menu, request_completion=request_completion
+        ),
+        "publish_spring_meal": publish_spring_meal,
+        "send_slack_text": send_slack_text,
+    }
+
+
+def pin_stand_ins(
+    operation: str,
+    clients_by_name: Mapping[str, Callable[..., Any]],
+    meter: _Meter | None = None,
+) -> None:
+    """Pin the operation's plan with its client boundaries replaced by stand-ins."""
+    plan = handler.load_operation_plan(operation)
+    if plan is None:
+        raise ValueError(f"unknown operation: {operation}")
+    bound = dict(plan.clients)
+    for name, stage in STAGES.items():
+        if name in bound:
+            client = clients_by_name[name]
+            bound[name] = meter.wrap(stage, client) if meter is not None else client
+    handler.pin_operation_plan(dataclasses.replace(plan, clients=MappingProxyType(bound)))
+
+
+async def measure_operation(
+    function: str,
+    operation: str,
+    event: Mapping[str, Any],
+    pages: Mapping[str, str],
+    latency_ms: Mapping[str, float] = DEFAULT_LATENCY_MS,
+) -> OperationUsage:
+    """Run one invocation with stand-ins under tracemalloc and CPU accounting."""
+    for name, value in STAND_IN_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    meter = _Meter()
+    pin_stand_ins(operation, stand_ins(fixture_page(pages), latency_ms), meter)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _ = meter.checkpoint()
+    baseline = tracemalloc.get_traced_memory()[0]
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        response = await handler.orchestrate(
+            {**event, "operation": operation},
+            SimpleNamespace(aws_request_id=f"sizing-{operation}"),
+        )
+        _ = meter.checkpoint()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        handler._OPERATION_PLANS.pop(operation, None)
+    return OperationUsage(
+        function=function,
+        operation=operation,
+        status=response["statusCode"],
+        wall_ms=(time.perf_counter() - wall) * 1000,
+        cpu_ms=(time.process_time() - cpu) * 1000,
+        peak_kib=max(meter.peak - baseline, 0) / 1024,
+        stages=meter.stages,
+    )
+
+
+def import_footprint_mib() -> float:
+    """Resident memory of a fresh interpreter after importing the handler's modules."""
+    script = (
+        "import resource, functions.handler, functions.scraper, functions.menu_ai, "
+        "functions.clients; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        cwd=ROOT,
+        text=True,
+    ).stdout
+    return int(output.strip()) / 1024
+
+
+def _retry_wait_s(stage: str) -> float:
+    policy = getattr(_RETRYING_CLIENTS.get(stage), "retry", None)
+    if policy is None:
+        return 0.0
+    return (policy.stop.max_attempt_number - 1) * policy.wait.wait_fixed
+
+
+def recommend(usage: OperationUsage, *, footprint_mib: float) -> Recommendation:
+    """Smallest memory that fits the peak with headroom, and a timeout for it."""
+    memory = footprint_mib + usage.peak_kib / 1024 * MEMORY_HEADROOM
+    memory_mb = max(MIN_MEMORY_MB, math.ceil(memory / MEMORY_STEP_MB) * MEMORY_STEP_MB)
+    cpu_s = usage.cpu_ms / 1000
+    scaled_cpu_s = cpu_s * max(FULL_VCPU_MEMORY_MB / memory_mb, 1.0)
+    waiting_s = max(usage.wall_ms / 1000 - cpu_s, 0.0)
+    retry_s = max((_retry_wait_s(stage) for stage in usage.stages), default=0.0)
+    timeout = (waiting_s + scaled_cpu_s) * TIMEOUT_HEADROOM + retry_s
+    return Recommendation(
+        memory_mb=memory_mb,
+        timeout_s=max(MIN_TIMEOUT_S, math.ceil(timeout / 10) * 10),
+    )
+
+
+def template_functions(template: Path) -> dict[str, str]:
+    """``logical resource -> OPERATION`` for every function in the template."""
+    functions: dict[str, str] = {}
+    resource = None
+    for line in template.read_text(encoding="utf-8").splitlines():
+        if re.fullmatch(r"  [A-Za-z0-9]+:", line):
+            resource = line.strip().rstrip(":")
+        operation = re.fullmatch(r"\s+OPERATION: (\w+)", line)
+        if operation is not None and resource is not None:
+            functions[resource] = operation.group(1)
+    return functions
+
+
+def _global_setting(template: Path, name: str) -> int | None:
+    match = re.search(rf"^    {name}: (\d+)$", template.read_text("utf-8"), re.M)
+    return int(match.group(1)) if match else None
+
+
+def _fixture_events(fixtures: Path) -> dict[str, Mapping[str, Any]]:
+    invocations = json.loads((fixtures / "invocations.json").read_text("utf-8"))
+    entries = [*invocations["operations"], invocations["final_failure"]]
+    return {entry["operation"]: entry["event"] for entry in entries}
+
+
+def fixture_pages(fixtures: Path = FIXTURES) -> dict[str, str]:
+    return {
+        restaurant: (fixtures / f"{restaurant.lower()}.html").read_text("utf-8")
+        for restaurant in ("DODAM", "HAKSIK", "FACULTY", "DORMITORY")
+    }
+
+
+async def measure_template(
+    template: Path = ROOT / "template.yml",
+    fixtures: Path = FIXTURES,
+    latency_ms: Mapping[str, float] = DEFAULT_LATENCY_MS,
+) -> list[OperationUsage]:
+    """Measure every template function once warm, after an unmeasured warm-up."""
+    events, pages = _fixture_events(fixtures), fixture_pages(fixtures)
+    functions = template_functions(template)
+    no_latency = {stage: 0.0 for stage in latency_ms}
+    for function, operation in functions.items():
+        _ = await measure_operation(
+            function, operation, events.get(operation, {}), pages, no_latency
+        )
+    return [
+        await measure_operation(
+            function, operation, events.get(operation, {}), pages, latency_ms
+        )
+        for function, operation in functions.items()
+    ]
+
+
+def report(
+    usages: Sequence[OperationUsage], template: Path, footprint_mib: float
+) -> dict[str, Any]:
+    current = {
+        "memory_mb": _global_setting(template, "MemorySize"),
+        "timeout_s": _global_setting(template, "Timeout"),
+    }
+    return {
+        "import_footprint_mib": round(footprint_mib, 1),
+        "current": current,
+        "functions": [
+            {
+                **{
+                    name: round(value, 1) if isinstance(value, float) else value
+                    for name, value in dataclasses.asdict(usage).items()
+                    if name != "stages"
+                },
+                "stages": {
+                    stage: {
+                        name: round(value, 1) if isinstance(value, float) else value
+                        for name, value in dataclasses.asdict(stage_usage).items()
+                    }
+                    for stage, stage_usage in usage.stages.items()
+                },
+                "recommended": dataclasses.asdict(
+                    recommend(usage, footprint_mib=footprint_mib)
+                ),
+            }
+            for usage in usages
+        ],
+    }
+
+
+@contextmanager
+def discarded_logs() -> Iterator[None]:
+    """Keep encoding observation and EMF lines, but drop them instead of printing."""
+    log_handlers = [
+        log_handler
+        for name in ("food_crawling.observation", "food_crawling.metrics")
+        for log_handler in logging.getLogger(name).handlers
+        if isinstance(log_handler, logging.StreamHandler)
+    ]
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        previous = [log_handler.setStream(sink) for log_handler in log_handlers]
+        try:
+            yield
+        finally:
+            for log_handler, stream in zip(log_handlers, previous):
+                _ = log_handler.setStream(stream)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m functions.sizing",
+        description="Recommend MemorySize and Timeout per template function.",
+    )
+    parser.add_argument("--template", type=Path, default=ROOT / "template.yml")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--output", type=Path, help="write the JSON report to PATH")
+    args = parser.parse_args(argv)
+
+    latency_ms = {
+        stage: value * args.latency_scale for stage, value in DEFAULT_LATENCY_MS.items()
+    }
+    with discarded_logs():
+        usages = asyncio.run(measure_template(args.template, args.fixtures, latency_ms))
+        handler.flush_observations()
+    result = report(usages, args.template, import_footprint_mib())
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    print(
+        f"import footprint {result['import_footprint_mib']} MiB; template "
+        f"{result['current']['memory_mb']} MB / {result['current']['timeout_s']} s"
+    )
+    for entry in result["functions"]:
+        recommended = entry["recommended"]
+        print(
+            f"{entry['function']:34s} {entry['status']} "
+            f"peak {entry['peak_kib']:8.1f} KiB  cpu {entry['cpu_ms']:7.1f} ms  "
+            f"-> {recommended['memory_mb']} MB / {recommended['timeout_s']} s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
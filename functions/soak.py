@@ -0,0 +1,440 @@
+"""Synthetic load and soak runs against in-process stand-ins.
+
+The four campus restaurants are extended with synthetic soongguri sources
+(declared through ``SOURCE_SPECS_URI``) until there are N of them. Each one
+serves M weeks of pages generated from the characterization fixtures: the
+same markup with dishes drawn per restaurant and date, padded with unrelated
+rows to a realistic page size. Every day of every week becomes a
+``schedule_`` invocation (a weekly ``scrape_dormitory`` for the dormitory),
+and a fixed number of workers drive them through ``orchestrate`` until the
+duration has elapsed, reusing the sizing stand-ins with jittered latency::
+
+    python -m functions.soak --restaurants 24 --weeks 8 --duration 600
+
+One JSON line per window reports throughput, latency percentiles, resident
+memory, Python heap blocks, open file descriptors, threads and pending tasks;
+growth is measured from a sample taken after an unmeasured warm-up pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from functions import handler, sizing, sources
+from functions.metrics import Histogram
+
+
+FIRST_MONDAY = "20260706"
+DEFAULT_PADDING_ROWS = 200
+DEFAULT_WINDOW_S = 10.0
+PERCENTILES = (50, 95, 99)
+# Korean dish with the English name the site prints next to it.
+DISHES = (
+    ("제육볶음", "Spicy Pork"),
+    ("돈가스", "Pork Cutlet"),
+    ("비빔밥", "Bibimbap"),
+    ("뚝배기불고기", "Beef Bulgogi"),
+    ("닭갈비", "Spicy Chicken"),
+    ("김치볶음밥", "Kimchi Fried Rice"),
+    ("순두부찌개", "Soft Tofu Stew"),
+    ("카레라이스", "Curry Rice"),
+    ("잔치국수", "Banquet Noodles"),
+    ("고등어구이", "Grilled Mackerel"),
+    ("짜장면", "Black Bean Noodles"),
+    ("오므라이스", "Omelette Rice"),
+)
+SIDES = (
+    "쌀밥",
+    "잡곡밥",
+    "미역국",
+    "된장국",
+    "어묵국",
+    "포기김치",
+    "깍두기",
+    "단무지",
+    "샐러드",
+    "계란말이",
+    "콩나물무침",
+    "감자조림",
+)
+_SLOT_LABEL = re.compile(r'<td class="menu_nm">([^<]+)</td>')
+_WEEKDAYS = "월화수목금토일"
+
+
+@dataclass(frozen=True)
+class Job:
+    operation: str
+    event: Mapping[str, Any]
+
+
+@dataclass
+class _Window:
+    started: float = field(default_factory=time.perf_counter)
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: Counter[str] = field(default_factory=Counter)
+
+
+def synthetic_specs(restaurants: int) -> list[dict[str, Any]]:
+    """Plugin specs that, with the builtins, make ``restaurants`` sources."""
+    templates = [spec for spec in sources.BUILTIN_SOURCES if spec.family == "soongguri"]
+    specs = []
+    for index in range(len(sources.BUILTIN_SOURCES), restaurants):
+        template = templates[index % len(templates)]
+        specs.append(
+            {
+                "restaurant": f"LOAD{index:03d}",
+                "name_ko": f"부하식당{index}",
+                "family": "soongguri",
+                "base_url": "http://soak.invalid/m_menu.php",
+                "query": {"rcd": str(100 + index), "sdt": "{date}"},
+                "inline_query": True,
+                "week_days": template.week_days,
+                "slots": {
+                    marker: list(policy) for marker, policy in template.slots.items()
+                },
+                "site_english": True,
+            }
+        )
+    return specs
+
+
+def _fixture_for(restaurant: str, fixtures: Mapping[str, str]) -> str:
+    if restaurant in fixtures:
+        return fixtures[restaurant]
+    soongguri = [name for name in fixtures if name != "DORMITORY"]
+    return fixtures[soongguri[int(restaurant.removeprefix("LOAD")) % len(soongguri)]]
+
+
+def page_generator(
+    fixtures: Mapping[str, str], padding_rows: int = DEFAULT_PADDING_ROWS
+) -> Callable[[str, Sequence[str]], str]:
+    """Pages shaped like each restaurant's fixture with dishes varying by date."""
+    padding = "<table>{}</table>".format(
+        "".join(
+            f"<tr><td class='notice'>공지 {index}</td><td>안내 문구 {index}</td></tr>"
+            for index in range(padding_rows)
+        )
+    )
+
+    def page(restaurant: str, dates: Sequence[str]) -> str:
+        template = _fixture_for(restaurant, fixtures)
+        rng = random.Random(f"{restaurant}:{dates[0]}")
+        if restaurant == "DORMITORY":
+            header = template[: template.index("</tr>") + len("</tr>")]
+            rows = []
+            for date in dates:
+                value = datetime.strptime(date, "%Y%m%d")
+                lunch = [rng.choice(DISHES)[0], *rng.sample(SIDES, 2)]
+                dinner = [rng.choice(DISHES)[0], rng.choice(SIDES)]
+                rows.append(
+                    f"<tr><td>{value:%m-%d} {_WEEKDAYS[value.weekday()]}</td>"
+                    f"<td>미운영</td><td>{' '.join(lunch)}</td>"
+                    f"<td>{' '.join(dinner)}</td></tr>"
+                )
+            table = f"{header}{''.join(rows)}</table>"
+        else:
+            rows = []
+            for label in _SLOT_LABEL.findall(template):
+                name_ko, name_en = rng.choice(DISHES)
+                rows.append(
+                    f'<tr><td class="menu_nm">{label}</td>'
+                    f"<td>{name_ko} {name_en}</td>"
+                    f"<td>{' '.join(rng.sample(SIDES, 2))}</td></tr>"
+                )
+            table = f"<table>{''.join(rows)}</table>"
+        return f"<html><body>{table}{padding}</body></html>"
+
+    return page
+
+
+def workload(restaurants: Sequence[str], weeks: int) -> list[Job]:
+    """One job per served day and restaurant, week by week."""
+    first_monday = datetime.strptime(FIRST_MONDAY, "%Y%m%d")
+    jobs = []
+    for week in range(weeks):
+        monday = first_monday + timedelta(days=7 * week)
+        for restaurant in restaurants:
+            compiled = sources.source(restaurant)
+            assert compiled is not None
+            if compiled.spec.family == "dormitory":
+                jobs.append(
+                    Job(
+                        f"scrape_{restaurant.lower()}",
+                        {"trigger": "local", "target_date": f"{monday:%Y%m%d}"},
+                    )
+                )
+                continue
+            for day in range(compiled.spec.week_days):
+                jobs.append(
+                    Job(
+                        f"schedule_{restaurant.lower()}",
+                        {
+                            "trigger": "direct",
+                            "target_date": f"{monday + timedelta(days=day):%Y%m%d}",
+                        },
+                    )
+                )
+    return jobs
+
+
+def _resident_mib() -> float:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # Peak instead of current residency where /proc is unavailable.
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _open_fds() -> int | None:
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(directory)) - 1
+        except OSError:
+            continue
+    return None
+
+
+def sample() -> dict[str, Any]:
+    """Process resources that grow when a pool, cache or connection leaks."""
+    return {
+        "rss_mib": round(_resident_mib(), 1),
+        "heap_blocks": sys.getallocatedblocks(),
+        "open_fds": _open_fds(),
+        "threads": threading.active_count(),
+        "tasks": len(asyncio.all_tasks()),
+        "plan_cache": len(handler._OPERATION_PLANS),
+    }
+
+
+def _latency_summary(histogram: Histogram) -> dict[str, float | None]:
+    summary = {f"p{value}": histogram.percentile(value) for value in PERCENTILES}
+    summary["max"] = round(histogram.maximum, 1) if histogram.count else None
+    return summary
+
+
+def _growth(baseline: Mapping[str, Any], current: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        name: round(current[name] - value, 1)
+        for name, value in baseline.items()
+        if isinstance(value, (int, float))
+        and isinstance(current.get(name), (int, float))
+    }
+
+
+async def _invoke(job: Job, request_id: str) -> str:
+    try:
+        response = await handler.orchestrate(
+            {**job.event, "operation": job.operation},
+            SimpleNamespace(aws_request_id=request_id),
+        )
+    except Exception as error:
+        return type(error).__name__
+    return str(response["statusCode"])
+
+
+async def soak(
+    jobs: Sequence[Job],
+    *,
+    duration_s: float,
+    concurrency: int,
+    window_s: float = DEFAULT_WINDOW_S,
+    report: Callable[[Mapping[str, Any]], None] = lambda window: None,
+) -> dict[str, Any]:
+    """Run every job at least once, then keep cycling until ``duration_s`` elapses."""
+    for operation in dict.fromkeys(job.operation for job in jobs):
+        first = next(job for job in jobs if job.operation == operation)
+        _ = await _invoke(first, "soak-warmup")
+    baseline = sample()
+    total, window = _Window(), _Window()
+    windows: list[dict[str, Any]] = []
+    started = time.perf_counter()
+    deadline = started + duration_s
+    positions = iter(range(sys.maxsize))
+
+    def close_window() -> None:
+        nonlocal window
+        elapsed = time.perf_counter() - window.started
+        entry = {
+            "elapsed_s": round(time.perf_counter() - started, 1),
+            "completed": window.latency.count,
+            "throughput_per_s": round(window.latency.count / max(elapsed, 1e-9), 2),
+            "latency_ms": _latency_summary(window.latency),
+            "statuses": dict(window.statuses),
+            **sample(),
+        }
+        windows.append(entry)
+        report(entry)
+        window = _Window()
+
+    async def worker() -> None:
+        for position in positions:
+            if position >= len(jobs) and time.perf_counter() >= deadline:
+                return
+            invoked = time.perf_counter()
+            status = await _invoke(jobs[position % len(jobs)], f"soak-{position}")
+            latency_ms = (time.perf_counter() - invoked) * 1000
+            for bucket in (total, window):
+                bucket.latency.record(latency_ms)
+                bucket.statuses[status] += 1
+
+    async def sampler() -> None:
+        while True:
+            await asyncio.sleep(window_s)
+            close_window()
+
+    sampling = asyncio.create_task(sampler())
+    try:
+        _ = await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        _ = sampling.cancel()
+        with suppress(asyncio.CancelledError):
+            await sampling
+    close_window()
+    elapsed = time.perf_counter() - started
+    final = windows[-1]
+    return {
+        "invocations": total.latency.count,
+        "elapsed_s": round(elapsed, 1),
+        "throughput_per_s": round(total.latency.count / max(elapsed, 1e-9), 2),
+        "latency_ms": _latency_summary(total.latency),
+        "statuses": dict(total.statuses),
+        "baseline": baseline,
+        "growth": _growth(baseline, final),
+        "windows": windows,
+    }
+
+
+async def run(
+    *,
+    restaurants: int,
+    weeks: int,
+    duration_s: float,
+    concurrency: int,
+    latency_ms: Mapping[str, float] = sizing.DEFAULT_LATENCY_MS,
+    padding_rows: int = DEFAULT_PADDING_ROWS,
+    window_s: float = DEFAULT_WINDOW_S,
+    seed: int = 0,
+    fixtures: Path = sizing.FIXTURES,
+    report: Callable[[Mapping[str, Any]], None] = lambda window: None,
+) -> dict[str, Any]:
+    """Declare the synthetic sources, pin stand-ins for every operation and soak."""
+    restaurants = max(restaurants, 1)
+    overrides = dict(sizing.STAND_IN_ENVIRONMENT)
+    previous = {
+        name: os.environ.get(name)
+        for name in (*overrides, sources.SOURCE_SPECS_ENVIRONMENT)
+    }
+    with tempfile.TemporaryDirectory(prefix="soak-") as directory:
+        specs_path = Path(directory) / "sources.json"
+        specs = json.dumps(synthetic_specs(restaurants))
+        specs_path.write_text(specs, encoding="utf-8")
+        overrides[sources.SOURCE_SPECS_ENVIRONMENT] = str(specs_path)
+        os.environ.update(overrides)
+        names = list(sources.registry())[:restaurants]
+        jobs = workload(names, weeks)
+        operations = list(dict.fromkeys(job.operation for job in jobs))
+        clients_by_name = sizing.stand_ins(
+            page_generator(sizing.fixture_pages(fixtures), padding_rows),
+            latency_ms,
+            jitter=random.Random(seed),
+        )
+        try:
+            for operation in operations:
+                sizing.pin_stand_ins(operation, clients_by_name)
+            result = await soak(
+                jobs,
+                duration_s=duration_s,
+                concurrency=concurrency,
+                window_s=window_s,
+                report=report,
+            )
+        finally:
+            for operation in operations:
+                _ = handler._OPERATION_PLANS.pop(operation, None)
+            for name, value in previous.items():
+                if value is None:
+                    _ = os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    return {
+        "restaurants": len(names),
+        "weeks": weeks,
+        "jobs": len(jobs),
+        "concurrency": concurrency,
+        **result,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m functions.soak",
+        description="Drive synthetic restaurants through orchestrate for a while.",
+    )
+    parser.add_argument("--restaurants", type=int, default=12)
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=300.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("--padding-rows", type=int, default=DEFAULT_PADDING_ROWS)
+    parser.add_argument(
+        "--window", type=float, default=DEFAULT_WINDOW_S, help="seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the JSON summary to PATH")
+    args = parser.parse_args(argv)
+
+    latency_ms = {
+        stage: value * args.latency_scale
+        for stage, value in sizing.DEFAULT_LATENCY_MS.items()
+    }
+    with sizing.discarded_logs():
+        summary = asyncio.run(
+            run(
+                restaurants=args.restaurants,
+                weeks=args.weeks,
+                duration_s=args.duration,
+                concurrency=args.concurrency,
+                latency_ms=latency_ms,
+                padding_rows=args.padding_rows,
+                window_s=args.window,
+                seed=args.seed,
+                report=lambda window: print(json.dumps(window), flush=True),
+            )
+        )
+        handler.flush_observations()
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    latency = summary["latency_ms"]
+    print(
+        f"{summary['invocations']} invocations of {summary['jobs']} jobs "
+        f"({summary['restaurants']} restaurants x {summary['weeks']} weeks) in "
+        f"{summary['elapsed_s']} s: {summary['throughput_per_s']}/s, "
+        f"p50 {latency['p50']} / p95 {latency['p95']} / p99 {latency['p99']} ms, "
+        f"statuses {summary['statuses']}, growth {summary['growth']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
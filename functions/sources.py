@@ -0,0 +1,220 @@
+"""Declarative restaurant sources compiled once into extraction plans.
+
+A source spec is plain data: where the page lives and how its query is built,
+which extraction family reads it, the slot policy with prices and how many
+days a week it serves. ``BUILTIN_SOURCES`` holds the campus restaurants;
+``SOURCE_SPECS_URI`` may name a JSON list of further specs, which is how one
+deployment serves more cafeterias without new code or another function.
+Every source gets ``scrape_``, ``schedule_`` and ``backfill_`` operations.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+
+SOURCE_SPECS_ENVIRONMENT = "SOURCE_SPECS_URI"
+SOONGGURI_BASE_URL = "http://m.soongguri.com/m_req/m_menu.php"
+DORMITORY_BASE_URL = "https://ssudorm.ssu.ac.kr:444/SShostel/mall_main.php"
+FAMILIES = frozenset({"soongguri", "dormitory"})
+OPERATION_KINDS = ("scrape", "schedule", "backfill")
+DEFAULT_PROMPT_TOKEN_BUDGET = 1500
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_QUERY_FIELDS = frozenset({"date", "year", "month", "day"})
+_RESTAURANT_NAME = re.compile(r"[A-Z][A-Z0-9_]*")
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    restaurant: str
+    name_ko: str
+    family: str
+    base_url: str
+    query: Mapping[str, str]
+    week_days: int
+    slots: Mapping[str, tuple[str, int]]
+    special_note: str | None = None
+    site_english: bool = False
+    inline_query: bool = False
+    prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET
+
+
+@dataclass(frozen=True)
+class CompiledSource:
+    """A validated spec with its operation settings and request builder."""
+
+    spec: SourceSpec
+    settings: Mapping[str, Any] = field(repr=False)
+
+    @property
+    def restaurant(self) -> str:
+        return self.spec.restaurant
+
+    @property
+    def operations(self) -> tuple[str, ...]:
+        return tuple(f"{kind}_{self.restaurant.lower()}" for kind in OPERATION_KINDS)
+
+    def request(
+        self, date: str, base_url: str | None = None
+    ) -> tuple[str, dict[str, Any] | None]:
+        """URL and query parameters for the page that holds ``date``."""
+        value = datetime.strptime(date, "%Y%m%d")
+        fields = {
+            "date": date,
+            "year": value.year,
+            "month": value.month,
+            "day": value.day,
+        }
+        params = {
+            name: _render(template, fields) for name, template in self.spec.query.items()
+        }
+        url = base_url or self.spec.base_url
+        if self.spec.inline_query:
+            return f"{url}?{urlencode(params)}", None
+        return url, params
+
+
+def _render(template: str, fields: Mapping[str, Any]) -> Any:
+    whole = _PLACEHOLDER.fullmatch(template)
+    if whole is not None:
+        return fields[whole.group(1)]
+    return template.format(**fields)
+
+
+BUILTIN_SOURCES: tuple[SourceSpec, ...] = (
+    SourceSpec(
+        restaurant="DODAM",
+        name_ko="도담식당",
+        family="soongguri",
+        base_url=SOONGGURI_BASE_URL,
+        query={"rcd": "2", "sdt": "{date}"},
+        inline_query=True,
+        week_days=6,
+        slots={"중식": ("LUNCH", 6000), "석식": ("DINNER", 6000)},
+        site_english=True,
+    ),
+    SourceSpec(
+        restaurant="HAKSIK",
+        name_ko="학생식당",
+        family="soongguri",
+        base_url=SOONGGURI_BASE_URL,
+        query={"rcd": "1", "sdt": "{date}"},
+        inline_query=True,
+        week_days=5,
+        slots={"중식": ("LUNCH", 5000), "석식": ("MORNING", 1000)},
+        special_note="석식 메뉴는 1000원 조식으로 처리됨",
+        site_english=True,
+    ),
+    SourceSpec(
+        restaurant="FACULTY",
+        name_ko="교직원식당",
+        family="soongguri",
+        base_url=SOONGGURI_BASE_URL,
+        query={"rcd": "7", "sdt": "{date}"},
+        inline_query=True,
+        week_days=5,
+        slots={"중식": ("LUNCH", 7000)},
+        special_note="교직원식당은 점심만 운영됩니다",
+        site_english=True,
+    ),
+    SourceSpec(
+        restaurant="DORMITORY",
+        name_ko="기숙사식당",
+        family="dormitory",
+        base_url=DORMITORY_BASE_URL,
+        query={
+            "viewform": "B0001_foodboard_list",
+            "gyear": "{year}",
+            "gmonth": "{month}",
+            "gday": "{day}",
+        },
+        week_days=7,
+        slots={"중식": ("LUNCH", 5500), "석식": ("DINNER", 5500)},
+        special_note="기숙사식당은 조식을 운영하지 않습니다",
+        prompt_token_budget=2500,
+    ),
+)
+
+
+def compile_source(spec: SourceSpec) -> CompiledSource:
+    if not _RESTAURANT_NAME.fullmatch(spec.restaurant):
+        raise ValueError(f"invalid restaurant name: {spec.restaurant!r}")
+    if spec.family not in FAMILIES:
+        raise ValueError(f"unsupported source family: {spec.family}")
+    if spec.family == "dormitory" and spec.restaurant != "DORMITORY":
+        # The dormitory parser and weekly retries are written for that one page.
+        raise ValueError(f"{spec.restaurant}: only DORMITORY may use the dormitory family")
+    if not 1 <= spec.week_days <= 7:
+        raise ValueError(f"{spec.restaurant}: week_days must be between 1 and 7")
+    if not spec.slots:
+        raise ValueError(f"{spec.restaurant}: at least one slot is required")
+    for template in spec.query.values():
+        unknown = set(_PLACEHOLDER.findall(template)) - _QUERY_FIELDS
+        if unknown:
+            raise ValueError(f"{spec.restaurant}: unknown query fields {sorted(unknown)}")
+    slots = {
+        str(marker): (str(time_slot), int(price))
+        for marker, (time_slot, price) in spec.slots.items()
+    }
+    settings: dict[str, Any] = {
+        "name_ko": spec.name_ko,
+        "week_days": spec.week_days,
+        "slots": slots,
+    }
+    if spec.special_note:
+        settings["special_note"] = spec.special_note
+    return CompiledSource(spec, MappingProxyType(settings))
+
+
+def _load_specs(uri: str) -> list[SourceSpec]:
+    parts = urlsplit(uri)
+    if parts.scheme not in {"", "file"}:
+        raise ValueError(f"unsupported source spec URI: {uri}")
+    raw_specs = json.loads(Path(parts.path if parts.scheme else uri).read_text("utf-8"))
+    if not isinstance(raw_specs, list):
+        raise ValueError("source specs must be a JSON list")
+    specs = []
+    for raw_spec in raw_specs:
+        slots = {marker: tuple(policy) for marker, policy in raw_spec["slots"].items()}
+        specs.append(SourceSpec(**{**raw_spec, "slots": slots}))
+    return specs
+
+
+@lru_cache(maxsize=4)
+def _registry(uri: str | None) -> Mapping[str, CompiledSource]:
+    specs = [*BUILTIN_SOURCES, *(_load_specs(uri) if uri else ())]
+    compiled: dict[str, CompiledSource] = {}
+    for spec in specs:
+        if spec.restaurant in compiled:
+            raise ValueError(f"duplicate source: {spec.restaurant}")
+        compiled[spec.restaurant] = compile_source(spec)
+    return MappingProxyType(compiled)
+
+
+def registry() -> Mapping[str, CompiledSource]:
+    """Compiled sources for the current ``SOURCE_SPECS_URI``, cached per value."""
+    return _registry(os.getenv(SOURCE_SPECS_ENVIRONMENT) or None)
+
+
+def source(restaurant: str) -> CompiledSource | None:
+    return registry().get(restaurant.upper())
+
+
+def operations() -> dict[str, tuple[str, str]]:
+    """``operation -> (kind, restaurant)`` for every registered source."""
+    return {
+        operation: (kind, compiled.restaurant)
+        for compiled in registry().values()
+        for kind, operation in zip(OPERATION_KINDS, compiled.operations)
+    }
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from functions.archive import ObjectStore, open_store
+
+
+MEMORY_KEY = "translation-memory/DORMITORY.json"
+
+
+def estimated_tokens(text: str) -> int:
+    """Rough tokenizer-free estimate: about four UTF-8 bytes per token."""
+    return max(1, len(text.encode("utf-8")) // 4) if text else 0
+
+
+def _tokens(raw_source: str) -> list[str]:
+    return list(dict.fromkeys(raw_source.split()))
+
+
+class TranslationMemory:
+    """Persistent nameKo→nameEn memory fed from validated DORMITORY interpretations.
+
+    ``dishes`` holds every validated Korean menu name so a meal whose tokens are
+    all known dishes can be resolved without a model call; ``translations`` holds
+    the English name first accepted for each main menu and is never overwritten.
+    """
+
+    def __init__(self, store: ObjectStore, key: str = MEMORY_KEY) -> None:
+        self.store = store
+        self.key = key
+        self.translations: dict[str, str] = {}
+        self.dishes: set[str] = set()
+        self._learned: dict[str, str] = {}
+        self._learned_dishes: set[str] = set()
+        self._merge(self._load())
+        self.reset_stats()
+
+    def _load(self) -> Mapping[str, Any]:
+        raw = self.store.get_object(Key=self.key)
+        if raw is None:
+            return {}
+        loaded = json.loads(raw)
+        return loaded if isinstance(loaded, Mapping) else {}
+
+    def _merge(self, stored: Mapping[str, Any]) -> None:
+        translations = stored.get("translations")
+        if isinstance(translations, Mapping):
+            for name_ko, name_en in translations.items():
+                if isinstance(name_ko, str) and isinstance(name_en, str):
+                    _ = self.translations.setdefault(name_ko, name_en)
+        dishes = stored.get("dishes")
+        if isinstance(dishes, list):
+            self.dishes.update(dish for dish in dishes if isinstance(dish, str))
+        self.dishes.update(self.translations)
+
+    def reset_stats(self) -> None:
+        self.lookups = 0
+        self.hits = 0
+        self.calls_skipped = 0
+        self.tokens_saved = 0
+
+    def known(self, raw_source: str) -> dict[str, str]:
+        """Translations for source tokens that are known dishes, matched whole."""
+        return {
+            name: self.translations[name]
+            for name in _tokens(raw_source)
+            if name in self.translations
+        }
+
+    def local_arguments(self, raw_source: str) -> dict[str, Any] | None:
+        """Build tool arguments locally when every source token is a known dish."""
+        menu_names = _tokens(raw_source)
+        if not menu_names or any(name not in self.dishes for name in menu_names):
+            return None
+        required = min(3, len(menu_names))
+        known = self.known(raw_source)
+        candidates = [
+            {"menuIndex": index, "nameEn": known[name]}
+            for index, name in enumerate(menu_names)
+            if name in known
+        ][:required]
+        if len(candidates) < required:
+            return None
+        return {"menuNames": menu_names, "mainCandidates": candidates}
+
+    def apply(self, main_menus: Iterable[dict[str, str]]) -> None:
+        """Pin known dishes to their remembered English name and count hits."""
+        for main_menu in main_menus:
+            self.lookups += 1
+            remembered = self.translations.get(main_menu["nameKo"])
+            if remembered is None:
+                continue
+            self.hits += 1
+            main_menu["nameEn"] = remembered
+
+    def learn(self, menu_names: Iterable[str], main_menus: Iterable[Mapping[str, str]]) -> None:
+        for name in menu_names:
+            if name not in self.dishes:
+                self.dishes.add(name)
+                self._learned_dishes.add(name)
+        for main_menu in main_menus:
+            name_ko = main_menu["nameKo"]
+            if name_ko not in self.translations:
+                self.translations[name_ko] = main_menu["nameEn"]
+                self._learned[name_ko] = main_menu["nameEn"]
+
+    def flush(self) -> int:
+        """Merge learned entries into the stored memory; returns new translations."""
+        if not self._learned and not self._learned_dishes:
+            return 0
+        learned = len(self._learned)
+        self._merge(self._load())
+        self.store.put_object(
+            Key=self.key,
+            Body=json.dumps(
+                {
+                    "translations": dict(sorted(self.translations.items())),
+                    "dishes": sorted(self.dishes),
+                },
+                ensure_ascii=False,
+            ).encode("utf-8"),
+        )
+        self._learned.clear()
+        self._learned_dishes.clear()
+        return learned
+
+    def take_stats(self) -> dict[str, Any]:
+        stats = {
+            "translation_lookups": self.lookups,
+            "translation_hits": self.hits,
+            "translation_hit_rate": round(self.hits / self.lookups, 3)
+            if self.lookups
+            else None,
+            "calls_skipped": self.calls_skipped,
+            "estimated_tokens_saved": self.tokens_saved,
+        }
+        self.reset_stats()
+        return stats
+
+
+def open_translation_memory(uri: str) -> TranslationMemory:
+    return TranslationMemory(open_store(uri))
@@ -0,0 +1,121 @@
+"""Keep-warm priming for provisioned or pinged containers.
+
+A ``warmup`` invocation compiles the operation plan (configuration and client
+module imports), builds the TLS context and OpenAI client once, starts the
+parse pool with a throwaway parse and resolves every host the operation talks
+to. It never fetches a page, calls a model or writes to Spring or Slack.
+
+Each one-time step is timed twice; the difference is the first-request work
+the warm-up removed. Lookups are reported separately: sessions are opened per
+call, so resolving only warms the upstream resolver cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import ssl
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+from urllib.parse import urlsplit
+
+from functions import handler, sources
+
+
+DNS_TIMEOUT_S = 1.0
+OPENAI_HOST = "api.openai.com"
+
+
+def _first_call_ms(step: Callable[[], object]) -> tuple[float, float]:
+    """Duration of a first and a repeated call, in milliseconds."""
+    durations = []
+    for _ in range(2):
+        started = time.perf_counter()
+        _ = step()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations[0], durations[1]
+
+
+def _hosts(plan: handler.OperationPlan) -> set[tuple[str, int]]:
+    config, clients = plan.config, plan.clients
+    urls = []
+    if "fetch_meals" in clients or "probe_dormitory_page" in clients:
+        source = sources.source(config["restaurant"])
+        if source is not None:
+            urls.append(source.spec.base_url)
+    if "interpret_menu" in clients:
+        urls.append(os.getenv("OPENAI_BASE_URL") or f"https://{OPENAI_HOST}")
+    if "publish_spring_meal" in clients:
+        urls.extend(config.get(name) for name in ("api_base_url", "dev_api_base_url"))
+    if "send_slack_text" in clients:
+        urls.append(config.get("slack_webhook_url"))
+    hosts = set()
+    for url in urls:
+        parts = urlsplit(url) if isinstance(url, str) else None
+        if parts is not None and parts.hostname:
+            default_port = 443 if parts.scheme == "https" else 80
+            hosts.add((parts.hostname, parts.port or default_port))
+    return hosts
+
+
+async def _resolve(hosts: set[tuple[str, int]]) -> tuple[int, float]:
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(loop.getaddrinfo(host, port) for host, port in hosts),
+                return_exceptions=True,
+            ),
+            DNS_TIMEOUT_S,
+        )
+    except asyncio.TimeoutError:
+        results = []
+    resolved = sum(not isinstance(result, BaseException) for result in results)
+    return resolved, (time.perf_counter() - started) * 1000
+
+
+async def prime(plan: handler.OperationPlan, *, plan_ms: float) -> Mapping[str, Any]:
+    """Run every one-time step of the plan's first request without side effects."""
+    steps: dict[str, tuple[float, float]] = {"plan": (plan_ms, 0.0)}
+    steps["tls"] = _first_call_ms(ssl.create_default_context)
+    if "interpret_menu" in plan.clients:
+        openai = importlib.import_module("openai")
+        api_key = plan.config.get("gpt_api_key") or "warmup"
+        steps["openai_client"] = _first_call_ms(
+            lambda: openai.AsyncOpenAI(api_key=api_key)
+        )
+    if "fetch_meals" in plan.clients:
+        scraper = importlib.import_module("functions.scraper")
+        durations = []
+        for _ in range(2):
+            started = time.perf_counter()
+            _ = await asyncio.get_running_loop().run_in_executor(
+                scraper._parse_executor(),
+                scraper.BeautifulSoup,
+                "<table><tr><td>warmup</td></tr></table>",
+                "html.parser",
+            )
+            durations.append((time.perf_counter() - started) * 1000)
+        steps["parse_pool"] = (durations[0], durations[1])
+    resolved, dns_ms = await _resolve(_hosts(plan))
+    removed = {
+        name: max(first - repeated, 0.0) for name, (first, repeated) in steps.items()
+    }
+    handler.emit_event(
+        "INFO",
+        "handler.warmup",
+        "warmup",
+        removed_ms=round(sum(removed.values()), 1),
+        resolved_hosts=resolved,
+        dns_ms=round(dns_ms, 1),
+    )
+    return {
+        "warmed": True,
+        "removed_ms": round(sum(removed.values()), 1),
+        "steps_ms": {name: round(value, 1) for name, value in removed.items()},
+        "resolved_hosts": resolved,
+        "dns_ms": round(dns_ms, 1),
+    }
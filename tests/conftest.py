@@ -1,5 +1,9 @@
+import os
+
 import pytest
 
+from functions import cli, handler
+
 
 @pytest.fixture(autouse=True)
 def runtime_environment(monkeypatch: pytest.MonkeyPatch):
@@ -9,3 +13,22 @@ def runtime_environment(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("DEV_API_BASE_URL", "https://dev-api.example")
     monkeypatch.delenv("OPERATION", raising=False)
     monkeypatch.delenv("HANDLER_OPERATION", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def isolated_local_runner(runtime_environment, monkeypatch: pytest.MonkeyPatch):
+    """``cli.main`` loads ``.env`` and writes ``os.environ``; keep both in the test."""
+    monkeypatch.setattr(cli, "load_dotenv", lambda *args, **kwargs: False)
+    saved = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+@pytest.fixture(autouse=True)
+def cold_operation_plans():
+    handler._OPERATION_PLANS.clear()
+    handler._CONFIG_PLANS.clear()
+    yield
+    handler._OPERATION_PLANS.clear()
+    handler._CONFIG_PLANS.clear()
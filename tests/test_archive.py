@@ -0,0 +1,197 @@
+import io
+import threading
+from pathlib import Path
+
+import pytest
+
+from functions import archive, handler
+from functions.scraper import SourceParseError, fetch_meals
+
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "tests/fixtures/characterization"
+
+
+class _Response:
+    def __init__(self, html):
+        self.html = html
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return False
+
+    def raise_for_status(self):
+        return None
+
+    async def text(self):
+        return self.html
+
+
+class _Session:
+    def __init__(self, html):
+        self.html = html
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return False
+
+    def get(self, *args, **kwargs):
+        return _Response(self.html)
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, *, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, *, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            error = RuntimeError("missing")
+            error.response = {"Error": {"Code": "NoSuchKey"}}
+            raise error
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+def _blobs(root):
+    return sorted(path for path in (root / "blobs").rglob("*") if path.is_file())
+
+
+def test_unchanged_pages_are_deduplicated_across_days_and_retries(tmp_path):
+    pages = archive.PageArchive(archive.LocalObjectStore(tmp_path))
+    html = (FIXTURES / "dormitory.html").read_text(encoding="utf-8")
+
+    first = pages.put("DORMITORY", "20260713", html)
+    retry = pages.put("DORMITORY", "20260713", html)
+    next_day = pages.put("DORMITORY", "20260714", html)
+
+    assert retry == first
+    assert next_day.sha256 == first.sha256
+    assert len(_blobs(tmp_path)) == 1
+    assert pages.get("DORMITORY", "20260714") == html
+    assert _blobs(tmp_path)[0].stat().st_size < len(html.encode("utf-8"))
+
+
+def test_changed_pages_append_versions_and_latest_wins(tmp_path):
+    pages = archive.PageArchive(archive.LocalObjectStore(tmp_path))
+
+    pages.put("dodam", "20260713", "<p>오늘은 쉽니다.</p>")
+    pages.put("DODAM", "20260713", "<table>menu</table>")
+
+    versions = pages.versions("DODAM", "20260713")
+    assert [version.size for version in versions] == [
+        len("<p>오늘은 쉽니다.</p>".encode("utf-8")),
+        len(b"<table>menu</table>"),
+    ]
+    assert pages.get("DODAM", "20260713") == "<table>menu</table>"
+    assert pages.get("DODAM", "20260714") is None
+    assert (tmp_path / "index/DODAM/20260713.json").is_file()
+
+
+def test_concurrent_writers_keep_every_version(tmp_path):
+    pages = archive.PageArchive(archive.LocalObjectStore(tmp_path))
+    bodies = [f"<table>version {index}</table>" for index in range(16)]
+    threads = [
+        threading.Thread(target=pages.put, args=("DODAM", "20260713", body))
+        for body in bodies
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    versions = pages.versions("DODAM", "20260713")
+    assert sorted(version.size for version in versions) == sorted(
+        len(body.encode("utf-8")) for body in bodies
+    )
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_archive_falls_back_to_zlib_without_zstandard(monkeypatch, tmp_path):
+    monkeypatch.setattr(archive, "zstandard", None)
+    pages = archive.PageArchive(archive.LocalObjectStore(tmp_path))
+
+    page = pages.put("DODAM", "20260713", "<table>도담</table>")
+
+    assert page.codec == "zlib"
+    assert pages.get("DODAM", "20260713") == "<table>도담</table>"
+
+
+def test_corrupted_blob_fails_its_hash_check(tmp_path):
+    pages = archive.PageArchive(archive.LocalObjectStore(tmp_path))
+    page = pages.put("FACULTY", "20260713", "<table>원본</table>")
+    codec = page.codec
+    blob = _blobs(tmp_path)[0]
+    blob.write_bytes(archive._compress(b"<table>tampered</table>", codec))
+
+    with pytest.raises(ValueError, match="hash"):
+        pages.read(page)
+
+
+def test_s3_adapter_uses_bucket_prefix_and_reports_missing_keys():
+    client = _FakeS3()
+    pages = archive.PageArchive(archive.S3ObjectStore(client, "menus", "/pages/"))
+
+    page = pages.put("HAKSIK", "20260713", "<table>학식</table>")
+
+    assert pages.get("HAKSIK", "20260713") == "<table>학식</table>"
+    assert pages.get("HAKSIK", "20260714") is None
+    assert ("menus", "pages/index/HAKSIK/20260713.json") in client.objects
+    assert any(key.endswith(f"{page.sha256}.html.{page.codec}") for _, key in client.objects)
+
+
+def test_local_store_rejects_keys_outside_its_root(tmp_path):
+    with pytest.raises(ValueError):
+        archive.LocalObjectStore(tmp_path).put_object(Key="../escape", Body=b"")
+
+
+@pytest.mark.asyncio
+async def test_configured_archive_receives_pages_fetched_by_the_plan(monkeypatch, tmp_path):
+    monkeypatch.setenv("PAGE_ARCHIVE_URI", f"file://{tmp_path}")
+    html = (FIXTURES / "dodam.html").read_text(encoding="utf-8")
+    plan = handler.load_operation_plan("scrape_dodam")
+    assert plan is not None
+
+    records = await plan.clients["fetch_meals"](
+        "DODAM", "20260713", session_factory=lambda: _Session(html)
+    )
+
+    assert records
+    assert archive.open_archive(str(tmp_path)).get("DODAM", "20260713") == html
+
+
+@pytest.mark.asyncio
+async def test_fetch_meals_hands_raw_page_to_sink_before_parsing():
+    received = []
+
+    with pytest.raises(SourceParseError):
+        await fetch_meals(
+            "HAKSIK",
+            "20260713",
+            session_factory=lambda: _Session("<main>renamed</main>"),
+            page_sink=lambda *page: received.append(page),
+        )
+
+    assert received == [("HAKSIK", "20260713", "<main>renamed</main>")]
+
+
+@pytest.mark.asyncio
+async def test_page_sink_runs_off_the_event_loop_thread():
+    threads = []
+
+    _ = await fetch_meals(
+        "DODAM",
+        "20260713",
+        session_factory=lambda: _Session(
+            "<table><tr><td class='menu_nm'>중식1</td><td>제육볶음</td></tr></table>"
+        ),
+        page_sink=lambda *page: threads.append(threading.get_ident()),
+    )
+
+    assert threads and threads[0] != threading.get_ident()
@@ -0,0 +1,251 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import archive, backfill, cli, handler
+from functions.scraper import HolidayError, ScraperError, SourceParseError
+
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "tests/fixtures/characterization"
+CONTEXT = SimpleNamespace(aws_request_id="backfill-test")
+INTERPRETED = {"menuNames": ["제육볶음"], "mainMenus": []}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _event(operation, start_date, end_date, **fields):
+    return {
+        "operation": operation,
+        "start_date": start_date,
+        "end_date": end_date,
+        **fields,
+    }
+
+
+def test_dormitory_dates_are_grouped_by_source_week():
+    dates = backfill.date_range("20260711", "20260714")
+
+    assert backfill.source_units("DORMITORY", dates) == [
+        ("20260706", ["20260711", "20260712"]),
+        ("20260713", ["20260713", "20260714"]),
+    ]
+    assert backfill.source_units("DODAM", dates[:2]) == [
+        ("20260711", ["20260711"]),
+        ("20260712", ["20260712"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_archived_pages_are_reparsed_without_fetching(monkeypatch, tmp_path):
+    store = tmp_path / "archive"
+    monkeypatch.setenv("PAGE_ARCHIVE_URI", str(store))
+    html = (FIXTURES / "dormitory.html").read_text(encoding="utf-8")
+    archive.open_archive(str(store)).put("DORMITORY", "20260713", html)
+    output = tmp_path / "backfill.ndjson"
+
+    with (
+        patch.object(handler, "scrape", AsyncMock()) as scrape,
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=INTERPRETED)),
+        patch.object(handler, "publish_menu", AsyncMock()) as publish,
+    ):
+        response = await handler.orchestrate(
+            _event(
+                "backfill_dormitory",
+                "20260713",
+                "20260714",
+                source="archive",
+                output=str(output),
+            ),
+            CONTEXT,
+        )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["days"] == 2
+    scrape.assert_not_awaited()
+    publish.assert_not_awaited()
+    lines = {line["date"]: line for line in _lines(output)}
+    assert lines["20260713"]["source"] == "archive"
+    assert lines["20260713"]["slots"]["중식"]["menuNames"] == ["제육볶음"]
+    assert lines["20260714"]["slots"]["석식"]["outcome"] == "EXPECTED_EMPTY"
+    assert all(line["complete"] for line in lines.values())
+
+
+@pytest.mark.asyncio
+async def test_midweek_ranges_reuse_the_archived_monday_page(monkeypatch, tmp_path):
+    store = tmp_path / "archive"
+    monkeypatch.setenv("PAGE_ARCHIVE_URI", str(store))
+    html = (FIXTURES / "dormitory.html").read_text(encoding="utf-8")
+    archive.open_archive(str(store)).put("DORMITORY", "20260713", html)
+    output = tmp_path / "backfill.ndjson"
+
+    with (
+        patch.object(handler, "scrape", AsyncMock()) as scrape,
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=INTERPRETED)),
+    ):
+        response = await handler.orchestrate(
+            _event(
+                "backfill_dormitory",
+                "20260714",
+                "20260715",
+                source="archive",
+                output=str(output),
+            ),
+            CONTEXT,
+        )
+
+    assert json.loads(response["body"])["incomplete_days"] == 1
+    scrape.assert_not_awaited()
+    lines = {line["date"]: line for line in _lines(output)}
+    assert {line["source"] for line in lines.values()} == {"archive"}
+    assert lines["20260714"]["complete"] is True
+    assert lines["20260715"]["outcome"] == "MISSING_DATE"
+    assert lines["20260715"]["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_days_and_retries_failed_ones(tmp_path):
+    output = tmp_path / "backfill.ndjson"
+    output.write_text(
+        json.dumps({"date": "20260713", "complete": True})
+        + "\n"
+        + json.dumps({"date": "20260714", "complete": False})
+        + "\n",
+        encoding="utf-8",
+    )
+    meal = {
+        "date": "20260714",
+        "source_slot": "중식1",
+        "raw_text": "제육볶음",
+        "outcome": "SUCCESS",
+    }
+
+    with (
+        patch.object(handler, "scrape", AsyncMock(return_value=[meal])) as scrape,
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=INTERPRETED)),
+    ):
+        response = await handler.orchestrate(
+            _event("backfill_dodam", "20260713", "20260714", output=str(output)),
+            CONTEXT,
+        )
+
+    body = json.loads(response["body"])
+    assert body["days"] == 1
+    assert body["skipped_days"] == 1
+    scrape.assert_awaited_once()
+    assert scrape.await_args.args[1] == "20260714"
+    assert _lines(output)[-1]["complete"] is True
+    assert backfill.completed_dates(output) == {"20260713", "20260714"}
+
+
+@pytest.mark.asyncio
+async def test_source_failures_are_recorded_per_day(tmp_path):
+    output = tmp_path / "backfill.ndjson"
+
+    async def scrape(config, target_date, requested_dates=None):
+        if target_date == "20260713":
+            raise HolidayError(target_date, "HAKSIK")
+        if target_date == "20260715":
+            raise SourceParseError(target_date, "HAKSIK", "SOURCE_EMPTY")
+        raise ScraperError(target_date, "HAKSIK", "SOURCE_UNAVAILABLE", "API_FAILURE")
+
+    with patch.object(handler, "scrape", side_effect=scrape):
+        response = await handler.orchestrate(
+            _event(
+                "backfill_haksik",
+                "20260713",
+                "20260715",
+                source="live",
+                output=str(output),
+            ),
+            CONTEXT,
+        )
+
+    lines = {line["date"]: line for line in _lines(output)}
+    assert lines["20260713"]["outcome"] == "EXPECTED_EMPTY"
+    assert lines["20260713"]["complete"] is True
+    assert lines["20260714"]["outcome"] == "API_FAILURE"
+    assert lines["20260714"]["complete"] is False
+    assert lines["20260715"]["outcome"] == "AMBIGUOUS_EMPTY"
+    assert lines["20260715"]["complete"] is False
+    assert json.loads(response["body"])["incomplete_days"] == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_reuses_the_scheduled_destinations(tmp_path):
+    meal = {
+        "date": "20260713",
+        "source_slot": "중식1",
+        "raw_text": "제육볶음",
+        "outcome": "SUCCESS",
+    }
+
+    with (
+        patch.object(handler, "scrape", AsyncMock(return_value=[meal])),
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=INTERPRETED)),
+        patch.object(handler, "publish_menu", AsyncMock()) as publish,
+    ):
+        _ = await handler.orchestrate(
+            _event(
+                "backfill_dodam",
+                "20260713",
+                "20260713",
+                publish=True,
+                output=str(tmp_path / "out.ndjson"),
+            ),
+            CONTEXT,
+        )
+
+    assert [call.args[2] for call in publish.await_args_list] == ["dev", "prod"]
+    assert publish.await_args_list[0].args[1]["time"] == "LUNCH"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"start_date": "20260714", "end_date": "20260713"},
+        {"start_date": "2026-07-13", "end_date": "20260713"},
+        {"start_date": "20260713", "end_date": "20260713", "source": "cache"},
+        {"start_date": "20260713", "end_date": "20260713", "source": "archive"},
+    ],
+)
+async def test_invalid_backfill_requests_are_rejected(fields):
+    response = await handler.orchestrate(
+        {"operation": "backfill_faculty", **fields}, CONTEXT
+    )
+
+    assert response["statusCode"] == 400
+
+
+def test_cli_sends_one_backfill_event_for_the_range():
+    args = cli.build_parser().parse_args(
+        [
+            "backfill_dormitory",
+            "--start",
+            "20260701",
+            "--end",
+            "20260731",
+            "--output",
+            "out.ndjson",
+            "--concurrency",
+            "8",
+        ]
+    )
+
+    event = cli.backfill_event("backfill_dormitory", args)
+
+    assert event["start_date"] == "20260701"
+    assert event["end_date"] == "20260731"
+    assert event["concurrency"] == 8
+    assert event["publish"] is False
+    with pytest.raises(ValueError):
+        cli.backfill_event(
+            "backfill_dormitory",
+            cli.build_parser().parse_args(["backfill_dormitory", "--date", "20260701"]),
+        )
@@ -0,0 +1,170 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import batch, handler, menu_ai
+
+
+ROOT = Path(__file__).resolve().parents[1]
+WORKFLOW = ROOT / "statemachine/weekly-batch-workflow.asl.json"
+CONTEXT = SimpleNamespace(aws_request_id="batch-test")
+ARGUMENTS = {
+    "menuNames": ["제육볶음", "쌀밥"],
+    "mainCandidates": [{"menuIndex": 0, "nameEn": "Spicy Pork"}],
+}
+MEAL = {
+    "date": "20260713",
+    "source_slot": "중식1",
+    "raw_text": "중식1 제육볶음 Spicy Pork 쌀밥",
+    "source_english": ["Spicy Pork"],
+    "outcome": "SUCCESS",
+}
+
+
+def _completion_body(request_body):
+    assert request_body["tool_choice"]["function"]["name"] == menu_ai.TOOL_NAME
+    return {
+        "choices": [
+            {
+                "message": {
+                    "tool_calls": [
+                        {
+                            "function": {
+                                "name": menu_ai.TOOL_NAME,
+                                "arguments": json.dumps(ARGUMENTS, ensure_ascii=False),
+                            }
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+
+
+def _accepted():
+    return SimpleNamespace(accepted=True, unmatched_main_menus=[], warnings=[])
+
+
+def _event(phase, **fields):
+    return {
+        "operation": "schedule_dodam",
+        "batch_phase": phase,
+        "batch_dates": ["20260713", "20260714"],
+        **fields,
+    }
+
+
+@pytest.fixture
+def endpoint(monkeypatch, tmp_path):
+    monkeypatch.setenv("BATCH_STATE_URI", str(tmp_path / "state"))
+    local = batch.LocalBatchEndpoint(_completion_body)
+    monkeypatch.setattr(batch, "open_batch_client", lambda config: local)
+    return local
+
+
+@pytest.mark.asyncio
+async def test_submit_persists_one_request_per_distinct_menu(endpoint, tmp_path):
+    with patch.object(handler, "scrape", AsyncMock(return_value=[MEAL])) as scrape:
+        response = await handler.orchestrate(_event("submit"), CONTEXT)
+
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert body["requests"] == 1
+    assert scrape.await_count == 2
+    (line,) = endpoint.jobs[body["job_id"]]
+    assert line["url"] == "/v1/chat/completions"
+    assert line["body"]["model"] == menu_ai.MODEL_ID
+    state = tmp_path / "state/batch-jobs/schedule_dodam" / f"{body['job_id']}.json"
+    assert json.loads(state.read_text(encoding="utf-8"))["dates"] == [
+        "20260713",
+        "20260714",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_collect_waits_for_the_job_then_publishes_batch_results(endpoint):
+    completion = AsyncMock()
+    with (
+        patch.object(handler, "scrape", AsyncMock(return_value=[MEAL])),
+        patch.object(menu_ai, "_request_completion", completion),
+        patch.object(
+            handler, "publish_menu", AsyncMock(return_value=_accepted())
+        ) as publish,
+        patch.object(handler, "notify_slack", AsyncMock()),
+    ):
+        submitted = json.loads(
+            (await handler.orchestrate(_event("submit"), CONTEXT))["body"]
+        )
+        collect = _event("collect", batch_job_id=submitted["job_id"])
+        pending = json.loads((await handler.orchestrate(collect, CONTEXT))["body"])
+        collected = json.loads((await handler.orchestrate(collect, CONTEXT))["body"])
+
+    assert pending["status"] == "pending"
+    assert collected["status"] == "completed"
+    assert collected["batch_status"] == "completed"
+    completion.assert_not_awaited()
+    assert publish.await_count == 4
+    assert publish.await_args.args[1]["mainMenus"] == [
+        {"nameKo": "제육볶음", "nameEn": "Spicy Pork"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unanswered_and_abandoned_requests_fall_back_to_synchronous_calls(
+    endpoint,
+):
+    response_body = _completion_body(
+        {"tool_choice": {"function": {"name": menu_ai.TOOL_NAME}}}
+    )
+    completion = AsyncMock(return_value=batch._namespace(response_body))
+    with (
+        patch.object(handler, "scrape", AsyncMock(return_value=[MEAL])),
+        patch.object(menu_ai, "_request_completion", completion),
+        patch.object(handler, "publish_menu", AsyncMock(return_value=_accepted())),
+        patch.object(handler, "notify_slack", AsyncMock()),
+    ):
+        submitted = json.loads(
+            (await handler.orchestrate(_event("submit"), CONTEXT))["body"]
+        )
+        response = await handler.orchestrate(
+            _event("collect", batch_job_id=submitted["job_id"], batch_abandon=True),
+            CONTEXT,
+        )
+
+    body = json.loads(response["body"])
+    assert body["batch_status"] == "abandoned"
+    assert completion.await_count == 2
+    assert endpoint.polls[submitted["job_id"]] == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_phase_requires_a_state_store():
+    response = await handler.orchestrate(_event("submit"), CONTEXT)
+
+    assert response["statusCode"] == 400
+
+
+def test_workflow_polls_with_a_bounded_wait_loop():
+    workflow = json.loads(WORKFLOW.read_text(encoding="utf-8"))
+    states = workflow["States"]
+
+    assert set(states) == {
+        "InitializePolls",
+        "SubmitBatch",
+        "WaitForBatch",
+        "CollectBatch",
+        "BatchReady",
+        "CountPoll",
+        "CollectSynchronously",
+        "Done",
+    }
+    assert states["WaitForBatch"]["Seconds"] * 144 == 24 * 60 * 60
+    choices = states["BatchReady"]["Choices"]
+    assert choices[0]["Next"] == "CountPoll"
+    assert choices[0]["And"][1] == {"Variable": "$.polls", "NumericLessThan": 144}
+    assert choices[1]["Next"] == "CollectSynchronously"
+    fallback = states["CollectSynchronously"]["Parameters"]["Payload"]
+    assert fallback["batch_abandon"] is True
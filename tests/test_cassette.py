@@ -0,0 +1,209 @@
+import json
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from functions import cassette, handler, scraper
+
+
+SECRET = "SECRET_WEBHOOK_TOKEN"
+HTML = (
+    "<table><tr><td class='menu_nm'>중식1</td>"
+    "<td>제육볶음 Spicy Pork</td></tr></table>"
+)
+
+
+class _AsyncResponse:
+    def __init__(self, *, status=200, text=""):
+        self.status = status
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError("source request failed")
+
+    async def text(self):
+        return self._text
+
+
+def _session(text="", status=200):
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    session.get.return_value = _AsyncResponse(status=status, text=text)
+    session.post.return_value = _AsyncResponse(status=status, text=text)
+    return session
+
+
+def _tool_response():
+    arguments = {
+        "menuNames": ["제육볶음"],
+        "mainCandidates": [{"menuIndex": 0, "nameEn": "Spicy Pork"}],
+    }
+    call = SimpleNamespace(
+        function=SimpleNamespace(
+            name="extract_main_menus",
+            arguments=json.dumps(arguments, ensure_ascii=False),
+        )
+    )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))]
+    )
+
+
+def _invoke():
+    return handler.lambda_handler(
+        {"operation": "scrape_dodam", "target_date": "20260713"},
+        SimpleNamespace(aws_request_id="cassette-request"),
+    )
+
+
+def _record(monkeypatch, path):
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", f"https://hooks.slack.test/{SECRET}")
+    monkeypatch.setenv("CASSETTE_MODE", "record")
+    monkeypatch.setenv("CASSETTE_PATH", str(path))
+    openai_client = MagicMock()
+    openai_client.chat.completions.create = AsyncMock(return_value=_tool_response())
+    sessions = [_session(HTML), _session('{"unmatchedMainMenus": []}'), _session()]
+    with (
+        patch("functions.menu_ai.AsyncOpenAI", return_value=openai_client),
+        patch("functions.clients.aiohttp.ClientSession", side_effect=sessions),
+    ):
+        return _invoke()
+
+
+def test_recorded_run_is_redacted_and_covers_every_dependency(monkeypatch, tmp_path):
+    path = tmp_path / "week.cassette.jsonl"
+
+    response = _record(monkeypatch, path)
+
+    assert response["statusCode"] == 200
+    text = path.read_text(encoding="utf-8")
+    exchanges = [json.loads(line) for line in text.splitlines()]
+    assert [exchange["dependency"] for exchange in exchanges] == [
+        "source",
+        "openai",
+        "spring",
+        "slack",
+    ]
+    assert exchanges[0]["key"] == (
+        "GET http://m.soongguri.com/m_req/m_menu.php?rcd=2&sdt=20260713"
+    )
+    assert exchanges[0]["body"] == HTML
+    assert exchanges[2]["key"] == "dev:20260713:DODAM:LUNCH"
+    assert all(exchange["latency_ms"] >= 0 for exchange in exchanges)
+    for unsafe in (SECRET, "hooks.slack.test", "dev-api.example", "test-gpt-key"):
+        assert unsafe not in text
+
+
+def test_replay_serves_recorded_exchanges_without_network(monkeypatch, tmp_path):
+    path = tmp_path / "week.cassette.jsonl"
+    recorded = _record(monkeypatch, path)
+    monkeypatch.setenv("CASSETTE_MODE", "replay")
+    monkeypatch.setenv("CASSETTE_LATENCY_SCALE", "0")
+    completion = AsyncMock(side_effect=AssertionError("OpenAI must not be called"))
+    openai_client = MagicMock()
+    openai_client.chat.completions.create = completion
+
+    with (
+        patch("functions.menu_ai.AsyncOpenAI", return_value=openai_client),
+        patch(
+            "functions.clients.aiohttp.ClientSession",
+            side_effect=AssertionError("network must not be used"),
+        ),
+    ):
+        replayed = _invoke()
+
+    assert replayed == recorded
+    completion.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_replay_scales_latency_and_reproduces_recorded_failures(tmp_path):
+    path = tmp_path / "failure.cassette.jsonl"
+    path.write_text(
+        json.dumps(
+            {
+                "dependency": "spring",
+                "key": "prod:20260713:DODAM:LUNCH",
+                "latency_ms": 4000,
+                "error_type": "SpringPublishError",
+                "status": None,
+            }
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    replay = cassette.Cassette("replay", path, latency_scale=0.0005)
+    publish = replay.bind({"publish_spring_meal": AsyncMock()})["publish_spring_meal"]
+
+    with patch("functions.cassette.asyncio.sleep", AsyncMock()) as sleep:
+        with pytest.raises(RuntimeError) as raised:
+            await publish(
+                environment="prod", date="20260713", restaurant="DODAM", time="LUNCH"
+            )
+        with pytest.raises(cassette.CassetteMissError):
+            await publish(
+                environment="prod", date="20260713", restaurant="DODAM", time="LUNCH"
+            )
+
+    assert type(raised.value).__name__ == "SpringPublishError"
+    sleep.assert_awaited_once_with(pytest.approx(0.002))
+
+
+@pytest.mark.asyncio
+async def test_probe_is_recorded_and_replayed_without_network(tmp_path):
+    path = tmp_path / "probe.jsonl"
+    page = (
+        "<table class='boxstyle02'><tr><th>날짜</th><th>조식</th><th>중식</th>"
+        "<th>석식</th></tr><tr><td>07-13 월</td><td>미운영</td><td>김치찌개</td>"
+        "<td>카레라이스</td></tr></table>"
+    )
+    source = _session(page)
+    source.get.return_value.headers = {"ETag": '"v2"', "Server": "nginx"}
+    recorder = cassette.Cassette("record", path)
+    probe = recorder.bind({"probe_dormitory_page": scraper.probe_dormitory_page})
+    recorded = await probe["probe_dormitory_page"](
+        ["20260713"], etag='"v1"', session_factory=lambda: source
+    )
+    recorder.finish()
+
+    replay = cassette.Cassette("replay", path)
+    replayed_probe = replay.bind(
+        {"probe_dormitory_page": scraper.probe_dormitory_page}
+    )["probe_dormitory_page"]
+    with patch("functions.scraper.aiohttp.ClientSession") as network:
+        replayed = await replayed_probe(["20260713"], etag='"v1"')
+        with pytest.raises(scraper.ScraperError):
+            _ = await replayed_probe(["20260713"], etag='"v2"')
+
+    network.assert_not_called()
+    assert recorded.etag == '"v2"'
+    assert replayed == recorded
+    [exchange] = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    assert exchange["headers"] == {"ETag": '"v2"'}
+
+
+@pytest.mark.asyncio
+async def test_recording_wraps_the_completion_seam_the_plan_installed(tmp_path):
+    installed = AsyncMock(return_value=_tool_response())
+    interpret = AsyncMock(return_value={"menuNames": ["제육볶음"], "mainMenus": []})
+    recorder = cassette.Cassette("record", tmp_path / "seam.jsonl")
+    bound = recorder.bind(
+        {"interpret_menu": partial(interpret, request_completion=installed)}
+    )["interpret_menu"]
+
+    _ = await bound("key", "DODAM", "제육볶음 Spicy Pork")
+    seam = interpret.await_args.kwargs["request_completion"]
+    _ = await seam(None, "DODAM", "제육볶음 Spicy Pork", ("Spicy Pork",))
+
+    installed.assert_awaited_once()
+    assert [exchange["dependency"] for exchange in recorder.recorded] == ["openai"]
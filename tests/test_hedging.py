@@ -0,0 +1,141 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from functions import handler, hedging, menu_ai
+
+
+VALID = {
+    "menuNames": ["제육볶음", "쌀밥"],
+    "mainCandidates": [{"menuIndex": 0, "nameEn": "Spicy Pork"}],
+}
+
+
+def _response(arguments):
+    call = SimpleNamespace(
+        function=SimpleNamespace(
+            name=menu_ai.TOOL_NAME, arguments=json.dumps(arguments, ensure_ascii=False)
+        )
+    )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))]
+    )
+
+
+class _Completions:
+    """Serve scripted (delay, response) pairs in call order and record cancellations."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, client, restaurant, raw_source, source_english, **options):
+        delay, response = self.script[self.calls]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return response
+
+
+@pytest.fixture
+def short_delay(monkeypatch):
+    monkeypatch.setattr(hedging, "INITIAL_DELAY_SECONDS", 0.02)
+
+
+async def _complete(hedger):
+    return await hedger.request_completion(
+        None, "DODAM", "제육볶음 Spicy Pork 쌀밥", ("Spicy Pork",)
+    )
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(monkeypatch, short_delay):
+    completions = _Completions((0, _response(VALID)))
+    monkeypatch.setattr(menu_ai, "_request_completion", completions)
+    hedger = hedging.HedgedCompletion(90)
+
+    _ = await _complete(hedger)
+
+    assert completions.calls == 1
+    assert hedger.take_stats()["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_the_loser_cancelled(monkeypatch, short_delay):
+    completions = _Completions((5, _response(VALID)), (0, _response(VALID)))
+    monkeypatch.setattr(menu_ai, "_request_completion", completions)
+    hedger = hedging.HedgedCompletion(90)
+
+    response = await asyncio.wait_for(_complete(hedger), timeout=1)
+
+    assert response is completions.script[1][1]
+    assert completions.cancelled == 1
+    stats = hedger.take_stats()
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["estimated_extra_prompt_tokens"] > 0
+    assert len(hedger.latencies) == 2
+    assert max(hedger.latencies) >= 0.02
+
+
+@pytest.mark.asyncio
+async def test_invalid_first_finisher_does_not_win(monkeypatch, short_delay):
+    invalid = _response({"menuNames": [], "mainCandidates": []})
+    completions = _Completions((0.05, invalid), (0.1, _response(VALID)))
+    monkeypatch.setattr(menu_ai, "_request_completion", completions)
+    hedger = hedging.HedgedCompletion(90)
+
+    response = await asyncio.wait_for(_complete(hedger), timeout=1)
+
+    assert response is completions.script[1][1]
+    assert hedger.take_stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_per_invocation(monkeypatch, short_delay):
+    completions = _Completions(
+        (0.05, _response(VALID)), (1, _response(VALID)), (0.05, _response(VALID))
+    )
+    monkeypatch.setattr(menu_ai, "_request_completion", completions)
+    hedger = hedging.HedgedCompletion(90, budget=1)
+
+    _ = await _complete(hedger)
+    _ = await _complete(hedger)
+
+    assert completions.calls == 3
+    stats = hedger.take_stats()
+    assert stats["hedges"] == 1
+    assert stats["hedges_capped"] == 1
+    assert stats["hedge_rate"] == 0.5
+
+
+def test_delay_follows_the_observed_latency_percentile():
+    hedger = hedging.HedgedCompletion(80)
+    assert hedger.delay() == hedging.INITIAL_DELAY_SECONDS
+
+    hedger.latencies.extend([2.0, 3.0, 4.0, 5.0, 20.0])
+
+    assert hedger.delay() == 5.0
+
+
+def test_configured_percentile_binds_hedging_into_the_plan(monkeypatch):
+    monkeypatch.setenv("OPENAI_HEDGE_PERCENTILE", "95")
+    monkeypatch.setenv("OPENAI_HEDGE_BUDGET", "2")
+
+    plan = handler.load_operation_plan("schedule_haksik")
+
+    assert plan is not None
+    assert (plan.hedging.percentile, plan.hedging.budget) == (95.0, 2)
+    assert plan.clients["interpret_menu"].keywords["request_completion"] == (
+        plan.hedging.request_completion
+    )
+
+    monkeypatch.setenv("OPENAI_HEDGE_PERCENTILE", "100")
+    with pytest.raises(RuntimeError, match="OPENAI_HEDGE_PERCENTILE"):
+        handler.load_operation_plan("schedule_haksik")
@@ -0,0 +1,145 @@
+import json
+import pstats
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from functions import cli, handler
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MENU = {
+    "menuNames": ["제육볶음", "쌀밥"],
+    "mainMenus": [{"nameKo": "제육볶음", "nameEn": "Pork"}],
+}
+
+
+def _raw(_config, target_date):
+    return [
+        {
+            "date": target_date,
+            "restaurant": "DODAM",
+            "source_slot": "중식1",
+            "raw_text": "제육볶음 Pork 쌀밥",
+        }
+    ]
+
+
+def test_dry_run_range_runs_every_date_without_spring_or_slack(capsys):
+    scrape = AsyncMock(side_effect=_raw)
+    with (
+        patch.object(handler, "scrape", scrape),
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=MENU)),
+        patch("functions.clients.aiohttp.ClientSession") as session,
+    ):
+        exit_code = cli.main(
+            ["schedule_dodam", "--start", "20260713", "--end", "20260715", "--dry-run"]
+        )
+
+    assert exit_code == 0
+    session.assert_not_called()
+    assert [call.args[1] for call in scrape.await_args_list] == [
+        "20260713",
+        "20260714",
+        "20260715",
+    ]
+    responses = [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith('{"statusCode"')
+    ]
+    assert [response["statusCode"] for response in responses] == [200, 200, 200]
+
+
+def test_dry_run_leaves_the_notification_outbox_alone(monkeypatch, tmp_path):
+    monkeypatch.setenv("NOTIFICATION_OUTBOX_URI", f"sqlite://{tmp_path / 'outbox.db'}")
+    args = cli.build_parser().parse_args(["notify_final_failure", "--dry-run"])
+
+    plan = cli._local_plan("notify_final_failure", args)
+
+    assert plan is not None and plan.outbox is None
+    with pytest.raises(SystemExit):
+        cli.main(["drain_notifications", "--dry-run"])
+
+
+def test_source_stand_in_urls_are_bound_into_the_local_plan():
+    args = cli.build_parser().parse_args(
+        ["scrape_dormitory", "--dormitory-url", "http://127.0.0.1:9/dorm"]
+    )
+
+    plan = cli._local_plan("scrape_dormitory", args)
+
+    assert plan is not None
+    assert plan.clients["fetch_meals"].keywords == {
+        "dormitory_base_url": "http://127.0.0.1:9/dorm"
+    }
+    assert handler.load_operation_plan("scrape_dormitory") is plan
+
+
+def test_dormitory_scrape_range_steps_by_week_and_rejects_mixed_dates():
+    parser = cli.build_parser()
+    weekly = parser.parse_args(
+        ["scrape_dormitory", "--start", "20260713", "--end", "20260802"]
+    )
+    assert cli.target_dates("scrape_dormitory", weekly) == [
+        "20260713",
+        "20260720",
+        "20260727",
+    ]
+
+    mixed = parser.parse_args(
+        ["scrape_dodam", "--date", "20260713", "--start", "20260713", "--end", "20260714"]
+    )
+    with pytest.raises(ValueError):
+        cli.target_dates("scrape_dodam", mixed)
+
+
+def test_profile_writes_pstats_dump_and_hot_function_table(tmp_path, capsys):
+    dump = tmp_path / "scrape.pstats"
+    with (
+        patch.object(handler, "scrape", AsyncMock(side_effect=_raw)),
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=MENU)),
+    ):
+        exit_code = cli.main(
+            [
+                "scrape_dodam",
+                "--date",
+                "20260713",
+                "--dry-run",
+                "--profile",
+                str(dump),
+                "--top",
+                "5",
+            ]
+        )
+
+    assert exit_code == 0
+    stats = pstats.Stats(str(dump))
+    assert any(name == "_process_source_date" for _, _, name in stats.stats)
+    assert "cumulative" in capsys.readouterr().err
+
+
+def test_profile_parses_inline_so_the_dump_covers_the_parser(tmp_path):
+    dump = tmp_path / "parse.pstats"
+    page = (ROOT / "tests/fixtures/characterization/dodam.html").read_text(
+        encoding="utf-8"
+    )
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    response = session.get.return_value
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock(return_value=None)
+    response.text = AsyncMock(return_value=page)
+    with (
+        patch("functions.scraper.aiohttp.ClientSession", return_value=session),
+        patch.object(handler, "interpret_menu", AsyncMock(return_value=MENU)),
+    ):
+        exit_code = cli.main(
+            ["scrape_dodam", "--date", "20260713", "--dry-run", "--profile", str(dump)]
+        )
+
+    assert exit_code == 0
+    stats = pstats.Stats(str(dump))
+    assert any(name == "parse_soongguri_html" for _, _, name in stats.stats)
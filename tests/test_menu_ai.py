@@ -326,6 +326,8 @@ async def test_interpret_menu_uses_exact_model_tool_and_choice():
         "function": {"name": menu_ai.TOOL_NAME},
     }
     assert kwargs["reasoning_effort"] == "none"
+    assert "prompt_cache_key" not in kwargs
+    assert kwargs["extra_body"] == {"prompt_cache_key": "menu-dormitory"}
     assert result["mainMenus"][1] == {"nameKo": "쌀밥", "nameEn": "Rice"}
 
 
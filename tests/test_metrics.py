@@ -0,0 +1,103 @@
+import io
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler, metrics
+
+
+CONTEXT = SimpleNamespace(aws_request_id="metrics-test")
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    metrics.REGISTRY.reset()
+    yield metrics.REGISTRY
+    metrics.REGISTRY.reset()
+
+
+def test_histogram_buckets_to_two_significant_digits():
+    histogram = metrics.Histogram()
+    for value in (12.34, 12.1, 987.6, 0.0456):
+        histogram.record(value)
+
+    assert sorted(histogram.buckets) == [0.046, 12.0, 990.0]
+    assert histogram.percentile(50) == 12.0
+    assert histogram.percentile(100) == 990.0
+    assert histogram.emf_values() == [0.046, 12.0, 12.0, 990.0]
+
+
+def test_large_histograms_are_capped_at_the_emf_value_limit():
+    histogram = metrics.Histogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    values = histogram.emf_values()
+    assert len(values) == metrics.MAX_EMF_VALUES
+    assert values[-1] == 1000.0
+
+
+def test_documents_keep_only_bounded_dimensions(registry):
+    with metrics.dimensions(operation="scrape_dodam", restaurant="DODAM"):
+        registry.increment("menu.published", environment="dev", date="20260713")
+        registry.observe("source.fetch.latency", 42.0, outcome="timeout")
+
+    documents = registry.emf_documents("FoodCrawling", 1_700_000_000_000)
+
+    assert len(documents) == 2
+    published = next(document for document in documents if "menu.published" in document)
+    assert "date" not in published
+    assert published["_aws"]["CloudWatchMetrics"] == [
+        {
+            "Namespace": "FoodCrawling",
+            "Dimensions": [["operation", "restaurant", "environment"]],
+            "Metrics": [{"Name": "menu.published", "Unit": "Count"}],
+        }
+    ]
+    latency = next(document for document in documents if "source.fetch.latency" in document)
+    assert latency["outcome"] == "error"
+    assert latency["source.fetch.latency"] == [42.0]
+
+
+@pytest.mark.asyncio
+async def test_timed_records_failures_with_the_error_outcome(registry):
+    @metrics.timed("spring.publish.latency", argument_dimensions=("environment",))
+    async def publish(*, environment):
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        await publish(environment="prod")
+
+    [(name, unit, dimensions)] = registry.histograms
+    assert (name, unit) == ("spring.publish.latency", "Milliseconds")
+    assert dict(dimensions) == {"environment": "prod", "outcome": "error"}
+
+
+@pytest.mark.asyncio
+async def test_orchestrate_flushes_emf_once_per_invocation():
+    async def scrape(*args, **kwargs):
+        metrics.REGISTRY.observe("source.fetch.latency", 120.0, outcome="success")
+        return []
+
+    stream = io.StringIO()
+    log_handler = logging.getLogger("food_crawling.metrics").handlers[0]
+    previous = log_handler.setStream(stream)
+    try:
+        with (
+            patch.object(handler, "scrape", scrape),
+            patch.object(handler, "notify_slack", AsyncMock()),
+        ):
+            _ = await handler.orchestrate(
+                {"operation": "schedule_dodam", "target_date": "20260713"}, CONTEXT
+            )
+    finally:
+        log_handler.setStream(previous)
+
+    [document] = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert document["operation"] == "schedule_dodam"
+    assert document["restaurant"] == "DODAM"
+    assert document["source.fetch.latency"] == [120.0]
+    assert metrics.REGISTRY.histograms == {}
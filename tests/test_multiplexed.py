@@ -0,0 +1,48 @@
+import json
+import re
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+TEMPLATE = (ROOT / "template-multiplexed.yml").read_text(encoding="utf-8")
+
+
+def _workflow(name):
+    return json.loads((ROOT / "statemachine" / name).read_text(encoding="utf-8"))
+
+
+def test_multiplexed_template_has_one_function_routed_by_event_operation():
+    assert TEMPLATE.count("Type: AWS::Serverless::Function") == 1
+    assert "OPERATION:" not in TEMPLATE
+    assert "Timeout: 300" in TEMPLATE
+    assert "MemorySize: 512" in TEMPLATE
+    assert TEMPLATE.count("Type: Schedule") == 4
+    assert re.findall(r'"operation": "(\w+)"', TEMPLATE) == [
+        "schedule_dodam",
+        "schedule_haksik",
+        "schedule_faculty",
+    ]
+    assert "MenuFunctionArn: !GetAtt MenuFunction.Arn" in TEMPLATE
+    assert "ReservedConcurrentExecutions: !If" in TEMPLATE
+    assert "OPERATION_CONCURRENCY" not in TEMPLATE
+    for prohibited in ("Type: Api", "Outputs:", "AWS::SQS::Queue", "AWS::SNS::Topic"):
+        assert prohibited not in TEMPLATE
+
+
+def test_multiplexed_workflow_only_adds_operations_to_the_retry_workflow():
+    workflow = _workflow("dormitory-retry-workflow.asl.json")
+    multiplexed = _workflow("dormitory-retry-workflow.multiplexed.asl.json")
+
+    operations = {}
+    for name, state in multiplexed["States"].items():
+        parameters = state["Parameters"]
+        assert parameters.pop("FunctionName") == "${MenuFunctionArn}"
+        operations[name] = parameters["Payload"].pop("operation")
+        del workflow["States"][name]["Parameters"]["FunctionName"]
+    del workflow["Comment"], multiplexed["Comment"]
+
+    assert multiplexed == workflow
+    assert operations == {
+        "InvokeDormitory": "schedule_dormitory",
+        "NotifyFinalFailure": "notify_final_failure",
+    }
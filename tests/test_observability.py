@@ -2,6 +2,8 @@ import hashlib
 import io
 import json
 import logging
+import threading
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
 
 from functions import handler
@@ -55,3 +57,52 @@ def test_structured_context_is_reset_between_invocations():
     assert second
     assert all(event["restaurant"] == "HAKSIK" for event in second)
     assert all(event["run_id"] == "request-456" for event in second)
+
+
+class _ThreadRecordingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writer_threads = set()
+
+    def write(self, text):
+        self.writer_threads.add(threading.current_thread().name)
+        return super().write(text)
+
+
+def test_events_are_written_off_the_caller_and_flushed_before_return():
+    stream = _ThreadRecordingStream()
+    log_handler = logging.getLogger("food_crawling.observation").handlers[0]
+    previous = log_handler.setStream(stream)
+    try:
+        with (
+            patch.object(handler, "scrape", AsyncMock(return_value=[])),
+            patch.object(handler, "notify_slack", AsyncMock()),
+        ):
+            handler.lambda_handler(
+                {"operation": "scrape_dodam", "target_date": "20260713"}, _Context()
+            )
+        written = stream.getvalue()
+    finally:
+        log_handler.setStream(previous)
+
+    names = [json.loads(line)["event.name"] for line in written.splitlines()]
+    assert names[0] == "handler.invocation.started"
+    assert names[-1] == "handler.invocation.completed"
+    assert stream.writer_threads == {"observation-writer"}
+
+
+def test_encoded_event_matches_the_standard_library_encoding():
+    event = {
+        "service.name": "menu-scraper",
+        "event.name": "source.classified",
+        "slot": "중식1",
+        "source_length": 412,
+        "when": datetime(2026, 7, 13, tzinfo=timezone.utc),
+    }
+    record = logging.LogRecord("observation", logging.INFO, __file__, 0, event, None, None)
+
+    encoded = handler._ObservationFormatter().format(record)
+
+    assert encoded == json.dumps(
+        event, ensure_ascii=False, separators=(",", ":"), default=str
+    )
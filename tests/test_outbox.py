@@ -0,0 +1,111 @@
+import json
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import clients, handler, outbox
+
+
+CONTEXT = SimpleNamespace(aws_request_id="outbox-test")
+
+
+@pytest.fixture
+def queue_path(monkeypatch, tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    monkeypatch.setenv("NOTIFICATION_OUTBOX_URI", f"sqlite://{path}")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_final_failure_is_enqueued_instead_of_posted(queue_path):
+    send = AsyncMock()
+    with patch.object(clients, "send_slack_text", send):
+        response = await handler.orchestrate(
+            {
+                "operation": "notify_final_failure",
+                "error_type": "RetryableEmptyMenuError",
+                "target_date": "20260713",
+            },
+            CONTEXT,
+        )
+
+    assert response["statusCode"] == 200
+    send.assert_not_awaited()
+    queued = outbox.open_outbox(f"sqlite://{queue_path}")
+    assert queued.depth() == 1
+
+
+@pytest.mark.asyncio
+async def test_drain_delivers_in_batches_and_reports_latency(queue_path):
+    queued = outbox.open_outbox(f"sqlite://{queue_path}")
+    for index in range(12):
+        _ = queued.enqueue(f"message {index}", type="date_summary")
+    send = AsyncMock()
+
+    with patch.object(clients, "send_slack_text", send):
+        response = await handler.orchestrate(
+            {"operation": "drain_notifications"}, CONTEXT
+        )
+
+    body = json.loads(response["body"])
+    assert body["delivered"] == 12
+    assert body["batches"] == 2
+    assert body["queue_depth"] == 0
+    assert body["delivery_latency_ms_max"] >= 0
+    assert send.await_args_list[0].kwargs == {
+        "webhook_url": "https://hooks.slack.test/webhook",
+        "text": "message 0",
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_deliveries_stay_queued_for_the_next_drain(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    queued = outbox.Outbox(outbox.SqliteQueue(path), "outbox")
+    _ = queued.enqueue("first")
+    _ = queued.enqueue("second")
+    send = AsyncMock(side_effect=[None, RuntimeError("Slack unavailable"), None])
+
+    first = await queued.drain(send)
+    with sqlite3.connect(path) as connection:
+        _ = connection.execute("UPDATE messages SET visible_at = 0")
+    second = await queued.drain(send)
+
+    assert (first["delivered"], first["failed"], first["queue_depth"]) == (1, 1, 1)
+    assert (second["delivered"], second["queue_depth"]) == (1, 0)
+    assert send.await_args_list[-1].kwargs == {"text": "second"}
+
+
+def test_drain_requires_an_outbox(monkeypatch):
+    monkeypatch.delenv("NOTIFICATION_OUTBOX_URI", raising=False)
+
+    with pytest.raises(RuntimeError, match="NOTIFICATION_OUTBOX_URI"):
+        handler.load_operation_plan("drain_notifications")
+
+
+def test_unsupported_outbox_uri_is_rejected():
+    with pytest.raises(ValueError, match="unsupported outbox URI"):
+        outbox.open_outbox("redis://localhost/0")
+
+
+@pytest.mark.asyncio
+async def test_unreadable_and_exhausted_messages_are_discarded(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    queue = outbox.SqliteQueue(path)
+    queued = outbox.Outbox(queue, "outbox")
+    _ = queue.send_message(QueueUrl="outbox", MessageBody="not json")
+    _ = queued.enqueue("never delivered")
+    send = AsyncMock(side_effect=RuntimeError("Slack unavailable"))
+
+    summaries = []
+    for _ in range(outbox.MAX_RECEIVE_COUNT):
+        summaries.append(await queued.drain(send))
+        with sqlite3.connect(path) as connection:
+            _ = connection.execute("UPDATE messages SET visible_at = 0")
+
+    assert (summaries[0]["failed"], summaries[0]["discarded"]) == (1, 1)
+    assert (summaries[-1]["failed"], summaries[-1]["discarded"]) == (0, 1)
+    assert summaries[-1]["queue_depth"] == 0
+    assert send.await_count == outbox.MAX_RECEIVE_COUNT
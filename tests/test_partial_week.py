@@ -0,0 +1,108 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler, partial_week
+from functions.archive import open_store
+
+
+CONTEXT = SimpleNamespace(aws_request_id="partial-week")
+WEEK = ["20260713", "20260714", "20260715"]
+EVENT = {"operation": "schedule_dormitory", "trigger": "step_functions"}
+
+
+def _meal(date, slot="중식", outcome="SUCCESS"):
+    return {
+        "date": date,
+        "source_slot": slot,
+        "raw_text": "" if outcome != "SUCCESS" else "김치찌개 쌀밥",
+        "source_english": (),
+        "outcome": outcome,
+        "reason_code": "EMPTY_CELL" if outcome != "SUCCESS" else "SOURCE_AVAILABLE",
+    }
+
+
+def _accepted():
+    return SimpleNamespace(accepted=True, unmatched_main_menus=[], warnings=[])
+
+
+@pytest.fixture
+def state_uri(monkeypatch, tmp_path):
+    monkeypatch.setenv("PARTIAL_WEEK_STATE_URI", str(tmp_path))
+    return str(tmp_path)
+
+
+async def _run(scrape, publish=None):
+    with (
+        patch.object(handler, "scrape", scrape),
+        patch.object(
+            handler, "interpret_menu", AsyncMock(return_value={"menuNames": ["김치찌개"]})
+        ),
+        patch.object(handler, "publish_menu", publish or AsyncMock(return_value=_accepted())),
+        patch.object(handler, "notify_slack", AsyncMock()),
+        patch.object(handler, "_week_dates", return_value=WEEK),
+    ):
+        return await handler.orchestrate(EVENT, CONTEXT)
+
+
+@pytest.mark.asyncio
+async def test_complete_days_are_published_and_kept_across_retries(state_uri):
+    first = AsyncMock(
+        return_value=[
+            _meal("20260713"),
+            _meal("20260714"),
+            _meal("20260714", "석식", "AMBIGUOUS_EMPTY"),
+        ]
+    )
+    with pytest.raises(handler.RetryableEmptyMenuError) as raised:
+        await _run(first)
+
+    assert raised.value.target_date == "20260714"
+    assert partial_week.completed_days(
+        open_store(state_uri), "schedule_dormitory", "20260713"
+    ) == {"20260713"}
+
+    second = AsyncMock(return_value=[_meal("20260714"), _meal("20260715")])
+    publish = AsyncMock(return_value=_accepted())
+    response = await _run(second, publish)
+
+    assert response["statusCode"] == 200
+    assert second.await_args.kwargs["requested_dates"] == ["20260714", "20260715"]
+    published = {call.args[1]["date"] for call in publish.await_args_list}
+    assert published == {"20260714", "20260715"}
+    assert [item["date"] for item in json.loads(response["body"])] == [
+        "20260714",
+        "20260715",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_finished_week_skips_the_source(state_uri):
+    store = open_store(state_uri)
+    partial_week._save(store, "schedule_dormitory", "20260713", set(WEEK))
+    scrape = AsyncMock()
+
+    response = await _run(scrape)
+
+    assert json.loads(response["body"]) == []
+    scrape.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_publication_leaves_only_that_day_outstanding(state_uri):
+    scrape = AsyncMock(return_value=[_meal(date) for date in WEEK])
+    def publish_or_fail(config, payload, environment):
+        if environment == "prod" and payload["date"] == "20260715":
+            raise RuntimeError("Spring unavailable")
+        return _accepted()
+
+    publish = AsyncMock(side_effect=publish_or_fail)
+
+    with pytest.raises(handler.RetryableApiSendError):
+        await _run(scrape, publish)
+
+    assert partial_week.completed_days(
+        open_store(state_uri), "schedule_dormitory", "20260713"
+    ) == {"20260713", "20260714"}
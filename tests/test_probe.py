@@ -0,0 +1,147 @@
+import json
+from pathlib import Path
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from functions import handler, scraper
+
+
+ROOT = Path(__file__).resolve().parents[1]
+HTML = (ROOT / "tests/fixtures/characterization/dormitory.html").read_text(encoding="utf-8")
+WORKFLOW = ROOT / "statemachine/dormitory-probe-workflow.asl.json"
+CONTEXT = SimpleNamespace(aws_request_id="probe-test")
+WEEK = ["20260713", "20260714", "20260715"]
+
+
+class _Response:
+    def __init__(self, status=200, text="", headers=None):
+        self.status = status
+        self._text = text
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return False
+
+    def raise_for_status(self):
+        return None
+
+    async def text(self):
+        return self._text
+
+
+class _Session:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return False
+
+    def get(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.response
+
+
+def _parsed_ready_dates(html):
+    records = scraper.parse_dormitory_html(html, WEEK)
+    ambiguous = {
+        record.date for record in records if record.outcome == scraper.AMBIGUOUS_EMPTY
+    }
+    return tuple(sorted({record.date for record in records} - ambiguous))
+
+
+@pytest.mark.parametrize(
+    "page",
+    [
+        HTML,
+        HTML.replace("<td>카레라이스 단무지</td>", "<td>&nbsp;</td>"),
+        HTML.replace("<td>카레라이스 단무지</td>", "<td> </td>"),
+        HTML.replace("<th>석식</th>", "").replace("<td>카레라이스 단무지</td>", ""),
+    ],
+    ids=["fixture", "entity-only", "whitespace-only", "lunch-only"],
+)
+def test_ready_dates_match_the_full_parser(page):
+    assert scraper.ready_dormitory_dates(page, WEEK) == _parsed_ready_dates(page)
+
+
+def test_spanned_tables_are_left_to_the_full_parser():
+    spanned = HTML.replace("<td>07-14 화</td>", '<td rowspan="1">07-14 화</td>')
+    assert scraper.ready_dormitory_dates(spanned, WEEK) is None
+
+
+@pytest.mark.asyncio
+async def test_probe_sends_validators_and_skips_the_body_on_304():
+    session = _Session(_Response(status=304))
+
+    probe = await scraper.probe_dormitory_page(
+        WEEK,
+        etag='"v1"',
+        last_modified="Mon, 13 Jul 2026 00:00:00 GMT",
+        session_factory=lambda: session,
+    )
+
+    assert probe == scraper.DormitoryProbe(
+        False, None, '"v1"', "Mon, 13 Jul 2026 00:00:00 GMT", None
+    )
+    assert session.calls[0][1]["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 13 Jul 2026 00:00:00 GMT",
+    }
+
+
+@pytest.mark.asyncio
+async def test_probe_operation_reports_only_newly_ready_days():
+    session = _Session(_Response(text=HTML, headers={"ETag": '"v2"'}))
+    probe = partial(scraper.probe_dormitory_page, session_factory=lambda: session)
+
+    with (
+        patch.object(scraper, "probe_dormitory_page", probe),
+        patch.object(handler, "_week_dates", return_value=WEEK),
+    ):
+        response = await handler.orchestrate(
+            {
+                "operation": "probe_dormitory",
+                "probe_sha256": "stale",
+                "probe_ready_dates": ["20260713"],
+            },
+            CONTEXT,
+        )
+
+    body = json.loads(response["body"])
+    assert body["changed"] is True
+    assert body["etag"] == '"v2"'
+    assert body["ready_dates"] == ["20260713", "20260714"]
+    assert body["new_dates"] == ["20260714"]
+    assert body["complete"] is False
+
+
+def test_probe_workflow_only_runs_the_pipeline_for_new_days():
+    states = json.loads(WORKFLOW.read_text(encoding="utf-8"))["States"]
+
+    payload = states["ProbeDormitory"]["Parameters"]["Payload"]
+    assert payload["operation"] == "probe_dormitory"
+    assert payload["probe_sha256.$"] == "$.probe.body.sha256"
+    assert payload["probe_ready_dates.$"] == "$.probe.body.ready_dates"
+    assert states["NewDaysAppeared"]["Choices"] == [
+        {
+            "Variable": "$.probe.body.new_dates[0]",
+            "IsPresent": True,
+            "Next": "InvokeDormitory",
+        }
+    ]
+    assert states["PollsRemaining"]["Choices"][0]["NumericLessThan"] == 48
+    retry = states["InvokeDormitory"]["Catch"][0]
+    assert retry["ErrorEquals"] == ["RetryableEmptyMenuError"]
+    forgotten = states[retry["Next"]]["Parameters"]["probe"]["body"]
+    assert forgotten["ready_dates"] == []
+    assert forgotten["sha256.$"] == "$.probe.body.sha256"
+    assert "Cause" not in WORKFLOW.read_text(encoding="utf-8")
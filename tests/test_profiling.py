@@ -0,0 +1,166 @@
+import asyncio
+import io
+import json
+import logging
+import sys
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+from functions import handler, profiling, scraper
+
+
+class _Context:
+    aws_request_id = "profile-request"
+
+
+def _capture_observation_stream():
+    stream = io.StringIO()
+    observation_logger = logging.getLogger("food_crawling.observation")
+    original_streams = []
+    for log_handler in observation_logger.handlers:
+        if isinstance(log_handler, logging.StreamHandler):
+            original_streams.append((log_handler, log_handler.stream))
+            log_handler.setStream(stream)
+    return stream, original_streams
+
+
+def _slow_scrape(_config, target_date):
+    time.sleep(0.05)
+    return []
+
+
+def _slow_pool_parse():
+    time.sleep(0.05)
+
+
+async def _scrape_on_parse_pool(_config, target_date):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(scraper._parse_executor(), _slow_pool_parse)
+    return []
+
+
+def _profile_events(monkeypatch, scrape=_slow_scrape, **environment):
+    for name, value in environment.items():
+        monkeypatch.setenv(name, value)
+    stream, original_streams = _capture_observation_stream()
+    try:
+        with (
+            patch.object(handler, "scrape", AsyncMock(side_effect=scrape)),
+            patch.object(handler, "notify_slack", AsyncMock()),
+        ):
+            handler.lambda_handler(
+                {"operation": "scrape_dodam", "target_date": "20260713"}, _Context()
+            )
+    finally:
+        for log_handler, original_stream in original_streams:
+            log_handler.setStream(original_stream)
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    return [
+        event
+        for event in events
+        if event["event.name"].startswith("handler.invocation.profile")
+    ]
+
+
+def test_disabled_hook_starts_no_sampler_thread(monkeypatch):
+    monkeypatch.delenv("PROFILE_SLOW_INVOCATION_MS", raising=False)
+    threads = threading.active_count()
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        assert profiling.slow_invocation_profiler() is None
+    per_call = (time.perf_counter() - started) / 1000
+
+    assert threading.active_count() == threads
+    assert per_call < 0.001
+
+
+def test_slow_invocation_attaches_collapsed_stack_profile(monkeypatch):
+    events = _profile_events(
+        monkeypatch,
+        PROFILE_SLOW_INVOCATION_MS="1",
+        PROFILE_SAMPLE_INTERVAL_MS="1",
+    )
+
+    assert len(events) == 1
+    event = events[0]
+    assert event["profile_format"] == "collapsed"
+    assert event["samples"] > 0
+    assert 0 <= event["sampler_overhead_ms"] < event["duration_ms"]
+    assert event["restaurant"] == "DODAM"
+    stacks = [line.rsplit(" ", 1) for line in event["profile"].splitlines()]
+    assert all(count.isdigit() for _, count in stacks)
+    assert any("test_profiling._slow_scrape" in stack for stack, _ in stacks)
+
+
+def test_fast_invocation_under_threshold_emits_nothing(monkeypatch):
+    events = _profile_events(monkeypatch, PROFILE_SLOW_INVOCATION_MS="600000")
+
+    assert events == []
+
+
+def test_profile_can_be_written_for_upload_instead_of_logged(monkeypatch, tmp_path):
+    events = _profile_events(
+        monkeypatch,
+        PROFILE_SLOW_INVOCATION_MS="1",
+        PROFILE_SAMPLE_INTERVAL_MS="1",
+        PROFILE_OUTPUT_DIR=str(tmp_path),
+    )
+
+    assert "profile" not in events[0]
+    path = tmp_path / "profile-request.collapsed"
+    assert events[0]["profile_path"] == str(path)
+    assert path.read_text(encoding="utf-8").strip()
+
+
+def test_profile_write_failure_keeps_the_response_and_logs_the_profile(
+    monkeypatch, tmp_path
+):
+    blocked = tmp_path / "not-a-directory"
+    blocked.write_text("", encoding="utf-8")
+
+    events = _profile_events(
+        monkeypatch,
+        PROFILE_SLOW_INVOCATION_MS="1",
+        PROFILE_SAMPLE_INTERVAL_MS="1",
+        PROFILE_OUTPUT_DIR=str(blocked / "profiles"),
+    )
+
+    failed, profile = events
+    assert failed["event.name"] == "handler.invocation.profile.write_failed"
+    assert "profile_path" not in profile
+    assert profile["profile"]
+
+
+def test_parse_pool_work_is_sampled_under_its_pool(monkeypatch):
+    events = _profile_events(
+        monkeypatch,
+        scrape=_scrape_on_parse_pool,
+        PROFILE_SLOW_INVOCATION_MS="1",
+        PROFILE_SAMPLE_INTERVAL_MS="1",
+    )
+
+    stacks = [line.rsplit(" ", 1)[0] for line in events[0]["profile"].splitlines()]
+    assert any(
+        stack.startswith("[menu-parse];")
+        and stack.endswith("test_profiling._slow_pool_parse")
+        for stack in stacks
+    )
+
+
+def test_distinct_stacks_and_depth_are_bounded():
+    profiler = profiling.SamplingProfiler(
+        threading.get_ident(), 1.0, max_depth=2, max_stacks=1
+    )
+
+    def nested():
+        profiler.sample(sys._getframe())
+
+    profiler.sample(sys._getframe())
+    nested()
+
+    assert profiler.samples == 2
+    assert len(profiler.stacks) == 2
+    assert profiler.stacks["[truncated]"] == 1
+    assert all(stack.count(";") <= 1 for stack in profiler.stacks)
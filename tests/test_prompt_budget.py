@@ -0,0 +1,134 @@
+import io
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler, menu_ai
+from functions.prompt_budget import PromptBudget, PromptBudgetError
+
+
+CONTEXT = SimpleNamespace(aws_request_id="prompt-budget")
+ARGUMENTS = {
+    "menuNames": ["제육볶음", "쌀밥"],
+    "mainCandidates": [{"menuIndex": 0, "nameEn": "Spicy Pork"}],
+}
+
+
+def _response(usage=None):
+    call = SimpleNamespace(
+        function=SimpleNamespace(
+            name=menu_ai.TOOL_NAME, arguments=json.dumps(ARGUMENTS, ensure_ascii=False)
+        )
+    )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))],
+        usage=usage,
+    )
+
+
+def _usage(prompt, cached, completion):
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+def test_canonical_source_drops_decorations_and_repeated_evidence():
+    raw_source, evidence = menu_ai.canonical_source(
+        "중식1 ★제육볶음 Spicy Pork ※쌀밥",
+        ("Spicy Pork", "Serve Kitchen", "Serve Kitchen"),
+    )
+
+    assert raw_source == "중식1 제육볶음 Spicy Pork 쌀밥"
+    assert evidence == ("Serve Kitchen",)
+
+
+def test_prompt_puts_slow_changing_sections_before_the_meal():
+    request = menu_ai.completion_request(
+        "DODAM", "제육볶음 Spicy Pork 쌀밥", ("Spicy Pork", "Serve Kitchen")
+    )
+    prompt = request["messages"][1]["content"]
+
+    assert request["prompt_cache_key"] == "menu-dodam"
+    assert prompt.index("Restaurant: DODAM") < prompt.index("evidence")
+    assert prompt.index("Serve Kitchen") < prompt.index("Raw menu source")
+    assert menu_ai.completion_request("DORMITORY", "김치찌개", ())[
+        "prompt_cache_key"
+    ] == "menu-dormitory"
+
+
+@pytest.mark.asyncio
+async def test_over_budget_prompt_is_rejected_before_the_model_call():
+    budget = PromptBudget(50)
+    completion = AsyncMock(return_value=_response())
+
+    with pytest.raises(PromptBudgetError, match="budget is 50"):
+        await menu_ai.interpret_menu(
+            "key",
+            "DODAM",
+            "제육볶음 Spicy Pork 쌀밥 " * 40,
+            ("Spicy Pork",),
+            request_completion=completion,
+            prompt_budget=budget,
+        )
+
+    completion.assert_not_awaited()
+    assert budget.take_stats()["over_budget"] == 1
+
+
+@pytest.mark.asyncio
+async def test_usage_is_reported_once_per_invocation():
+    completion = AsyncMock(
+        side_effect=[_response(_usage(900, 0, 40)), _response(_usage(900, 768, 40))]
+    )
+    meal = {
+        "date": "20260713",
+        "source_slot": "중식1",
+        "raw_text": "중식1 제육볶음 Spicy Pork 쌀밥",
+        "source_english": ("Spicy Pork",),
+        "outcome": "SUCCESS",
+    }
+    stream = io.StringIO()
+    log_handler = logging.getLogger("food_crawling.observation").handlers[0]
+    previous = log_handler.setStream(stream)
+
+    try:
+        with (
+            patch.object(menu_ai, "_request_completion", completion),
+            patch.object(handler, "scrape", AsyncMock(return_value=[meal, meal])),
+            patch.object(handler, "publish_menu", AsyncMock()),
+            patch.object(handler, "notify_slack", AsyncMock()),
+        ):
+            _ = await handler.orchestrate(
+                {"operation": "scrape_dodam", "target_date": "20260713"}, CONTEXT
+            )
+    finally:
+        log_handler.setStream(previous)
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    summary = next(
+        event for event in events if event["event.name"] == "menu_ai.prompt_tokens"
+    )
+    assert summary["prompts"] == 2
+    assert summary["prompt_token_budget"] == 1500
+    assert 0 < summary["largest_prompt_tokens"] <= 1500
+    assert summary["prompt_tokens"] == 1800
+    assert summary["cached_prompt_tokens"] == 768
+    assert summary["completion_tokens"] == 80
+    assert summary["prompt_cache_hit_rate"] == round(768 / 1800, 3)
+
+
+def test_budget_can_be_overridden_per_function(monkeypatch):
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET", "800")
+    plan = handler.load_operation_plan("schedule_dormitory")
+
+    assert plan is not None and plan.prompt_budget.limit == 800
+    assert handler.load_operation_plan("notify_final_failure").prompt_budget is None
+
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET", "lots")
+    with pytest.raises(RuntimeError, match="PROMPT_TOKEN_BUDGET"):
+        handler.load_operation_plan("schedule_dormitory")
@@ -0,0 +1,160 @@
+import io
+import json
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler, menu_ai
+from functions.rule_interpreter import RuleFastPath, interpret_with_rules
+from functions.scraper import parse_menu_html
+
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = ROOT / "tests/fixtures/characterization"
+
+
+@pytest.mark.parametrize("restaurant", ["DODAM", "FACULTY"])
+def test_fixture_menus_are_split_with_full_confidence(restaurant):
+    html = (FIXTURES / f"{restaurant.lower()}.html").read_text(encoding="utf-8")
+
+    for record in parse_menu_html(html, restaurant, ["20260713"]):
+        ruled = interpret_with_rules(restaurant, record.raw_text, record.source_english)
+
+        assert ruled is not None
+        interpretation, confidence = ruled
+        assert confidence == 1.0
+        assert interpretation == menu_ai.validate_tool_arguments(
+            {
+                "menuNames": interpretation["menuNames"],
+                "mainCandidates": [
+                    {
+                        "menuIndex": interpretation["menuNames"].index(menu["nameKo"]),
+                        "nameEn": menu["nameEn"],
+                    }
+                    for menu in interpretation["mainMenus"]
+                ],
+            },
+            restaurant,
+            record.raw_text,
+            record.source_english,
+        )
+
+
+def test_labels_and_decorations_are_stripped():
+    ruled = interpret_with_rules(
+        "DODAM",
+        "중식1 [대면 코너] ★제육볶음 Spicy Pork 쌀밥 미역국",
+        ("Spicy Pork",),
+    )
+
+    assert ruled == (
+        {
+            "menuNames": ["제육볶음", "쌀밥", "미역국"],
+            "mainMenus": [{"nameKo": "제육볶음", "nameEn": "Spicy Pork"}],
+        },
+        1.0,
+    )
+
+
+@pytest.mark.parametrize(
+    ("raw_source", "evidence"),
+    [
+        ("석식1 천원의 아침밥 One Dollar Breakfast 계란후라이", ("One Dollar Breakfast",)),
+        ("중식1 제육볶음 Spicy Pork 쌀밥 Serve Kitchen", ("Spicy Pork", "Serve Kitchen")),
+        ("중식1 김치(국내산)찌개 Kimchi Stew 5000원", ("Kimchi Stew",)),
+    ],
+)
+def test_ambiguous_menus_score_below_the_default_threshold(raw_source, evidence):
+    ruled = interpret_with_rules("HAKSIK", raw_source, evidence)
+
+    assert ruled is None or ruled[1] < 0.8
+
+
+def test_menus_without_attributable_english_are_left_to_the_model():
+    assert interpret_with_rules("DODAM", "중식1 쌀밥 미역국", ()) is None
+    assert interpret_with_rules("DODAM", "Spicy Pork 제육볶음", ("Spicy Pork",)) is None
+    assert interpret_with_rules("DORMITORY", "김치찌개 Kimchi Stew", ("Kimchi Stew",)) is None
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_the_model_only_when_confident():
+    fast_path = RuleFastPath()
+    arguments = {
+        "menuNames": ["천원의 아침밥", "계란후라이"],
+        "mainCandidates": [{"menuIndex": 0, "nameEn": "One Dollar Breakfast"}],
+    }
+    call = SimpleNamespace(
+        function=SimpleNamespace(
+            name=menu_ai.TOOL_NAME, arguments=json.dumps(arguments, ensure_ascii=False)
+        )
+    )
+    completion = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))]
+        )
+    )
+
+    confident = await menu_ai.interpret_menu(
+        "key",
+        "DODAM",
+        "중식1 제육볶음 Spicy Pork 쌀밥",
+        ("Spicy Pork",),
+        request_completion=completion,
+        fast_path=fast_path,
+    )
+    ambiguous = await menu_ai.interpret_menu(
+        "key",
+        "HAKSIK",
+        "석식1 천원의 아침밥 One Dollar Breakfast 계란후라이",
+        ("One Dollar Breakfast",),
+        request_completion=completion,
+        fast_path=fast_path,
+    )
+
+    completion.assert_awaited_once()
+    assert confident["menuNames"] == ["제육볶음", "쌀밥"]
+    assert ambiguous["menuNames"] == ["천원의 아침밥", "계란후라이"]
+    stats = fast_path.take_stats()
+    assert stats["meals"] == 2
+    assert stats["fast_path_rate"] == 0.5
+    assert stats["model_calls"] == 1
+    assert stats["lowest_confidence"] < 0.8
+    assert stats["estimated_latency_saved_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_configured_threshold_binds_fast_path_and_reports_per_run(monkeypatch):
+    monkeypatch.setenv("RULE_INTERPRETER_MIN_CONFIDENCE", "0.9")
+    plan = handler.load_operation_plan("scrape_dodam")
+    assert plan is not None and plan.fast_path.min_confidence == 0.9
+    assert handler.load_operation_plan("scrape_dormitory").fast_path is None
+    plan.fast_path.meals = plan.fast_path.hits = 3
+    stream = io.StringIO()
+    log_handler = logging.getLogger("food_crawling.observation").handlers[0]
+    previous = log_handler.setStream(stream)
+
+    try:
+        with (
+            patch.object(handler, "scrape", AsyncMock(return_value=[])),
+            patch.object(handler, "notify_slack", AsyncMock()),
+        ):
+            _ = await handler.orchestrate(
+                {"operation": "scrape_dodam", "target_date": "20260713"},
+                SimpleNamespace(aws_request_id="fast-path"),
+            )
+    finally:
+        log_handler.setStream(previous)
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    summary = next(event for event in events if event["event.name"] == "menu_ai.fast_path")
+    assert summary["fast_path_rate"] == 1.0
+
+
+def test_invalid_threshold_is_a_configuration_error(monkeypatch):
+    monkeypatch.setenv("RULE_INTERPRETER_MIN_CONFIDENCE", "high")
+
+    with pytest.raises(RuntimeError, match="RULE_INTERPRETER_MIN_CONFIDENCE"):
+        handler.load_operation_plan("scrape_haksik")
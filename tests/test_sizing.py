@@ -0,0 +1,53 @@
+import pytest
+
+from functions import sizing
+
+
+# Warm peak Python allocations per invocation, about three times the measured
+# values; a regression past these means a function may outgrow its memory size.
+PEAK_BUDGET_KIB = {"scrape": 256, "schedule": 384, "notify": 32}
+NO_LATENCY = {stage: 0.0 for stage in sizing.DEFAULT_LATENCY_MS}
+
+
+def test_template_functions_cover_every_operation():
+    functions = sizing.template_functions(sizing.ROOT / "template.yml")
+
+    assert len(functions) == 9
+    assert functions["NotifyFailureFunction"] == "notify_final_failure"
+    assert functions["DormitorySchedulingFunction"] == "schedule_dormitory"
+
+
+@pytest.mark.asyncio
+async def test_peak_memory_stays_within_budget_and_template_limits():
+    usages = await sizing.measure_template(latency_ms=NO_LATENCY)
+
+    assert [usage.status for usage in usages] == [200] * 9
+    for usage in usages:
+        budget = PEAK_BUDGET_KIB[usage.operation.split("_")[0]]
+        assert usage.peak_kib < budget, usage.function
+        recommendation = sizing.recommend(usage, footprint_mib=100)
+        assert recommendation.memory_mb <= 512
+        assert recommendation.timeout_s <= 300
+    stages = {usage.operation: set(usage.stages) for usage in usages}
+    assert stages["schedule_dodam"] == {"fetch", "interpret", "publish", "notify"}
+    assert stages["notify_final_failure"] == {"notify"}
+
+
+def test_recommendation_scales_cpu_time_to_the_memory_share():
+    usage = sizing.OperationUsage(
+        function="DormitorySchedulingFunction",
+        operation="schedule_dormitory",
+        status=200,
+        wall_ms=40_000,
+        cpu_ms=1_000,
+        peak_kib=20 * 1024,
+        stages={"interpret": sizing.StageUsage(calls=11)},
+    )
+
+    recommendation = sizing.recommend(usage, footprint_mib=80)
+
+    # 80 + 20 * 1.5 = 110 MiB -> 128 MB, where one second of CPU takes ~13.8 s.
+    assert recommendation.memory_mb == 128
+    retry_s = sizing._retry_wait_s("interpret")
+    expected = ((40 - 1) + 1 * 1769 / 128) * sizing.TIMEOUT_HEADROOM + retry_s
+    assert recommendation.timeout_s == -(-expected // 10) * 10
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from functions import handler, sizing, soak, sources
+
+
+NO_LATENCY = {stage: 0.0 for stage in sizing.DEFAULT_LATENCY_MS}
+
+
+def test_workload_covers_every_served_day_of_synthetic_restaurants(
+    tmp_path, monkeypatch
+):
+    specs_path = tmp_path / "sources.json"
+    specs_path.write_text(json.dumps(soak.synthetic_specs(6)), encoding="utf-8")
+    monkeypatch.setenv(sources.SOURCE_SPECS_ENVIRONMENT, str(specs_path))
+
+    names = list(sources.registry())
+    jobs = soak.workload(names, weeks=2)
+
+    assert names[4:] == ["LOAD004", "LOAD005"]
+    assert len(jobs) == 2 * (6 + 5 + 5 + 1 + 5 + 5)
+    assert jobs[0] == soak.Job(
+        "schedule_dodam", {"trigger": "direct", "target_date": "20260706"}
+    )
+    dormitory = [job for job in jobs if job.operation == "scrape_dormitory"]
+    assert [job.event["target_date"] for job in dormitory] == ["20260706", "20260713"]
+
+
+def test_synthetic_pages_keep_the_fixture_shape_and_vary_by_date():
+    fixtures = sizing.fixture_pages()
+    page = soak.page_generator(fixtures, padding_rows=3)
+
+    monday, tuesday = page("HAKSIK", ["20260706"]), page("HAKSIK", ["20260707"])
+    assert monday != tuesday
+    assert monday == page("HAKSIK", ["20260706"])
+    labels = soak._SLOT_LABEL.findall(fixtures["HAKSIK"])
+    assert soak._SLOT_LABEL.findall(monday) == labels
+    assert monday.count("class='notice'") == 3
+    week = page("DORMITORY", ["20260706", "20260707", "20260708"])
+    assert all(label in week for label in ("07-06 월", "07-07 화", "07-08 수"))
+
+
+@pytest.mark.asyncio
+async def test_soak_runs_every_job_and_restores_the_environment():
+    windows = []
+
+    summary = await soak.run(
+        restaurants=5,
+        weeks=1,
+        duration_s=0,
+        concurrency=4,
+        latency_ms=NO_LATENCY,
+        padding_rows=10,
+        report=windows.append,
+    )
+
+    assert summary["jobs"] == 6 + 5 + 5 + 1 + 5
+    assert summary["invocations"] == summary["jobs"]
+    assert summary["statuses"] == {"200": summary["jobs"]}
+    assert windows[-1]["plan_cache"] >= 5
+    assert set(summary["growth"]) >= {"rss_mib", "heap_blocks", "open_fds", "threads"}
+    assert sources.SOURCE_SPECS_ENVIRONMENT not in os.environ
+    assert "schedule_load004" not in handler._OPERATION_PLANS
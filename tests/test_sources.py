@@ -0,0 +1,130 @@
+import dataclasses
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import config, handler, menu_ai, scraper, sources
+
+
+CAFE = {
+    "restaurant": "CAFE",
+    "name_ko": "카페식당",
+    "family": "soongguri",
+    "base_url": "https://cafe.example/menu",
+    "query": {"rcd": "9", "sdt": "{date}"},
+    "inline_query": True,
+    "week_days": 5,
+    "slots": {"중식": ["LUNCH", 4500]},
+}
+
+
+@pytest.fixture
+def cafe_source(tmp_path, monkeypatch):
+    specs = tmp_path / "sources.json"
+    specs.write_text(json.dumps([CAFE], ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setenv(sources.SOURCE_SPECS_ENVIRONMENT, str(specs))
+    yield specs
+    sources._registry.cache_clear()
+
+
+def test_builtin_sources_keep_the_existing_operations_and_requests():
+    assert set(sources.operations()) == {
+        f"{kind}_{restaurant}"
+        for kind in sources.OPERATION_KINDS
+        for restaurant in ("dodam", "haksik", "faculty", "dormitory")
+    }
+    assert sources.source("haksik").request("20260713") == (
+        "http://m.soongguri.com/m_req/m_menu.php?rcd=1&sdt=20260713",
+        None,
+    )
+    assert sources.source("DORMITORY").request("20260713") == (
+        sources.DORMITORY_BASE_URL,
+        {"viewform": "B0001_foodboard_list", "gyear": 2026, "gmonth": 7, "gday": 13},
+    )
+    assert menu_ai.has_site_english("FACULTY")
+    assert not menu_ai.has_site_english("DORMITORY")
+
+
+def test_pre_registry_constants_are_still_exported():
+    assert scraper.SOONGGURI_BASE_URL == sources.SOONGGURI_BASE_URL
+    assert scraper.DORMITORY_BASE_URL == sources.DORMITORY_BASE_URL
+    assert scraper.SOONGGURI_RESTAURANTS == {"DODAM": 2, "HAKSIK": 1, "FACULTY": 7}
+    assert scraper.PARSERS["DORMITORY"] is scraper.parse_dormitory_html
+    assert scraper.PARSERS["DODAM"] is scraper.parse_soongguri_html
+    assert menu_ai.SITE_ENGLISH_RESTAURANTS == {"HAKSIK", "DODAM", "FACULTY"}
+
+
+@pytest.mark.parametrize(
+    ("change", "message"),
+    [
+        ({"restaurant": "cafe"}, "invalid restaurant name"),
+        ({"family": "rss"}, "unsupported source family"),
+        ({"week_days": 8}, "week_days"),
+        ({"slots": {}}, "at least one slot"),
+        ({"query": {"sdt": "{week}"}}, "unknown query fields"),
+        ({"family": "dormitory"}, "only DORMITORY"),
+    ],
+)
+def test_compile_source_rejects_invalid_specs(change, message):
+    spec = sources.SourceSpec(**{**CAFE, "slots": {"중식": ("LUNCH", 4500)}})
+
+    with pytest.raises(ValueError, match=message):
+        _ = sources.compile_source(dataclasses.replace(spec, **change))
+
+
+def test_declared_source_gets_operations_and_config(cafe_source):
+    assert config.operations()["backfill_cafe"] == ("backfill", "CAFE")
+
+    loaded = config.load_operation_config("scrape_cafe")
+
+    assert loaded is not None
+    assert loaded["restaurant"] == "CAFE"
+    assert loaded["slots"] == {"중식": ("LUNCH", 4500)}
+    assert loaded["prompt_token_budget"] == sources.DEFAULT_PROMPT_TOKEN_BUDGET
+    assert sources.source("CAFE").request("20260713") == (
+        "https://cafe.example/menu?rcd=9&sdt=20260713",
+        None,
+    )
+
+
+def test_declared_source_cannot_shadow_a_builtin(tmp_path, monkeypatch):
+    specs = tmp_path / "sources.json"
+    specs.write_text(json.dumps([{**CAFE, "restaurant": "DODAM"}]), encoding="utf-8")
+    monkeypatch.setenv(sources.SOURCE_SPECS_ENVIRONMENT, str(specs))
+    try:
+        with pytest.raises(ValueError, match="duplicate source: DODAM"):
+            _ = sources.registry()
+    finally:
+        sources._registry.cache_clear()
+
+
+def test_declared_source_operation_dispatches_by_kind(cafe_source):
+    raw = {
+        "date": "20260713",
+        "restaurant": "CAFE",
+        "source_slot": "중식1",
+        "raw_text": "제육볶음",
+    }
+    interpret = AsyncMock(
+        return_value={
+            "menuNames": ["제육볶음"],
+            "mainMenus": [{"nameKo": "제육볶음", "nameEn": "Pork"}],
+        }
+    )
+    accepted = SimpleNamespace(accepted=True, unmatched_main_menus=[], warnings=[])
+
+    with (
+        patch.object(handler, "scrape", AsyncMock(return_value=[raw])),
+        patch.object(handler, "interpret_menu", interpret),
+        patch.object(handler, "publish_menu", AsyncMock(return_value=accepted)),
+        patch.object(handler, "notify_slack", AsyncMock(return_value=True)),
+    ):
+        response = handler.lambda_handler(
+            {"operation": "scrape_cafe", "target_date": "20260713"},
+            SimpleNamespace(aws_request_id="sources-test"),
+        )
+
+    assert response["statusCode"] == 200
+    interpret.assert_awaited_once()
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler
+
+
+ROOT = Path(__file__).resolve().parents[1]
+ASL_PATH = ROOT / "statemachine" / "dormitory-daily-workflow.asl.json"
+WEEKLY_ASL_PATH = ROOT / "statemachine" / "dormitory-retry-workflow.asl.json"
+CONTEXT = SimpleNamespace(aws_request_id="daily-workflow")
+
+
+def _workflow():
+    return json.loads(ASL_PATH.read_text(encoding="utf-8"))
+
+
+def _day_states():
+    return _workflow()["States"]["InvokeEachDay"]["ItemProcessor"]["States"]
+
+
+def test_days_fan_out_with_bounded_concurrency():
+    fan_out = _workflow()["States"]["InvokeEachDay"]
+
+    assert fan_out["Type"] == "Map"
+    assert fan_out["ItemsPath"] == "$.plan.body.dates"
+    assert 1 <= fan_out["MaxConcurrency"] <= 7
+    assert fan_out["ItemSelector"] == {"target_date.$": "$$.Map.Item.Value"}
+
+
+def test_each_day_keeps_the_weekly_retry_policy():
+    invoke = _day_states()["InvokeDormitoryDay"]
+    weekly = json.loads(WEEKLY_ASL_PATH.read_text(encoding="utf-8"))
+
+    assert invoke["Retry"] == weekly["States"]["InvokeDormitory"]["Retry"]
+    assert invoke["Parameters"]["Payload"] == {
+        "trigger": "step_functions",
+        "execution_id.$": "$$.Execution.Id",
+        "retry_count.$": "$$.State.RetryCount",
+        "delayed_schedule": False,
+        "target_date.$": "$.target_date",
+    }
+    assert invoke["Catch"][0]["Next"] == "NotifyDayFailure"
+
+
+def test_day_failure_payload_is_allowlisted():
+    notify = _day_states()["NotifyDayFailure"]["Parameters"]
+
+    assert notify["Payload"] == {
+        "trigger": "step_functions",
+        "execution_id.$": "$$.Execution.Id",
+        "restaurant": "DORMITORY",
+        "target_date.$": "$.target_date",
+        "error_type.$": "$.error.Error",
+    }
+    assert "Cause" not in ASL_PATH.read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_fan_out_returns_the_week_without_scraping():
+    scrape = AsyncMock()
+    with (
+        patch.object(handler, "scrape", scrape),
+        patch.object(handler, "_week_dates", return_value=["20260713", "20260714"]),
+    ):
+        response = await handler.orchestrate(
+            {"operation": "schedule_dormitory", "fan_out": True}, CONTEXT
+        )
+
+    assert json.loads(response["body"]) == {"dates": ["20260713", "20260714"]}
+    scrape.assert_not_awaited()
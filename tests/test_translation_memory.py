@@ -0,0 +1,187 @@
+import io
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler, menu_ai
+from functions.archive import LocalObjectStore
+from functions.translation_memory import MEMORY_KEY, TranslationMemory
+
+
+def _response(arguments):
+    call = SimpleNamespace(
+        function=SimpleNamespace(
+            name=menu_ai.TOOL_NAME,
+            arguments=json.dumps(arguments, ensure_ascii=False),
+        )
+    )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[call]))]
+    )
+
+
+def _arguments(names, translations):
+    return {
+        "menuNames": names,
+        "mainCandidates": [
+            {"menuIndex": index, "nameEn": name_en}
+            for index, name_en in enumerate(translations)
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_known_dishes_are_pinned_locally_without_growing_the_prompt(tmp_path):
+    memory = TranslationMemory(LocalObjectStore(tmp_path))
+    memory.learn(["김치찌개"], [{"nameKo": "김치찌개", "nameEn": "Kimchi Stew"}])
+    completion = AsyncMock(
+        return_value=_response(
+            _arguments(
+                ["김치찌개", "제육볶음", "쌀밥"],
+                ["Kimchi Jjigae", "Spicy Pork", "Rice"],
+            )
+        )
+    )
+
+    result = await menu_ai.interpret_menu(
+        "key",
+        "DORMITORY",
+        "김치찌개 제육볶음 쌀밥",
+        request_completion=completion,
+        translation_memory=memory,
+    )
+
+    assert "known_translations" not in completion.await_args.kwargs
+    assert result["mainMenus"][0] == {"nameKo": "김치찌개", "nameEn": "Kimchi Stew"}
+    assert memory.translations["제육볶음"] == "Spicy Pork"
+    stats = memory.take_stats()
+    assert stats["translation_lookups"] == 3
+    assert stats["translation_hits"] == 1
+    assert stats["calls_skipped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_meals_of_known_dishes_skip_the_model_call(tmp_path):
+    memory = TranslationMemory(LocalObjectStore(tmp_path))
+    memory.learn(
+        ["김치찌개", "쌀밥", "계란말이"],
+        [
+            {"nameKo": "김치찌개", "nameEn": "Kimchi Stew"},
+            {"nameKo": "쌀밥", "nameEn": "Rice"},
+            {"nameKo": "계란말이", "nameEn": "Rolled Omelette"},
+        ],
+    )
+    completion = AsyncMock()
+
+    result = await menu_ai.interpret_menu(
+        "key",
+        "DORMITORY",
+        "김치찌개 쌀밥 계란말이",
+        request_completion=completion,
+        translation_memory=memory,
+    )
+
+    completion.assert_not_awaited()
+    assert result["menuNames"] == ["김치찌개", "쌀밥", "계란말이"]
+    assert [menu["nameEn"] for menu in result["mainMenus"]] == [
+        "Kimchi Stew",
+        "Rice",
+        "Rolled Omelette",
+    ]
+    stats = memory.take_stats()
+    assert stats["calls_skipped"] == 1
+    assert stats["translation_hit_rate"] == 1.0
+    assert stats["estimated_tokens_saved"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_tokens_and_site_restaurants_still_call_the_model(tmp_path):
+    memory = TranslationMemory(LocalObjectStore(tmp_path))
+    memory.learn(["쌀밥"], [{"nameKo": "쌀밥", "nameEn": "Rice"}])
+    completion = AsyncMock(
+        return_value=_response(_arguments(["쌀밥", "비빔밥"], ["Rice", "Bibimbap"]))
+    )
+
+    _ = await menu_ai.interpret_menu(
+        "key",
+        "DORMITORY",
+        "쌀밥 비빔밥",
+        request_completion=completion,
+        translation_memory=memory,
+    )
+    site = AsyncMock(return_value=_response(_arguments(["돈가스"], ["Pork Cutlet"])))
+    _ = await menu_ai.interpret_menu(
+        "key",
+        "DODAM",
+        "돈가스 Pork Cutlet",
+        ("Pork Cutlet",),
+        request_completion=site,
+        translation_memory=memory,
+    )
+
+    completion.assert_awaited_once()
+    assert "known_translations" not in site.await_args.kwargs
+    assert memory.take_stats()["estimated_tokens_saved"] == 0
+
+
+def test_known_dishes_match_whole_tokens_only(tmp_path):
+    memory = TranslationMemory(LocalObjectStore(tmp_path))
+    memory.learn(["밥"], [{"nameKo": "밥", "nameEn": "Rice"}])
+
+    assert memory.known("볶음밥 김치") == {}
+    assert memory.known("밥 김치") == {"밥": "Rice"}
+    assert "돈가스" not in memory.translations
+
+
+def test_flush_merges_entries_written_by_other_containers(tmp_path):
+    store = LocalObjectStore(tmp_path)
+    first = TranslationMemory(store)
+    second = TranslationMemory(store)
+    first.learn(["김치찌개"], [{"nameKo": "김치찌개", "nameEn": "Kimchi Stew"}])
+    second.learn(["제육볶음"], [{"nameKo": "제육볶음", "nameEn": "Spicy Pork"}])
+
+    assert first.flush() == 1
+    assert second.flush() == 1
+    assert first.flush() == 0
+
+    stored = json.loads(store.get_object(Key=MEMORY_KEY))
+    assert stored["translations"] == {"김치찌개": "Kimchi Stew", "제육볶음": "Spicy Pork"}
+    assert TranslationMemory(store).dishes == {"김치찌개", "제육볶음"}
+
+
+@pytest.mark.asyncio
+async def test_dormitory_runs_flush_memory_and_report_hit_rate(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRANSLATION_MEMORY_URI", f"file://{tmp_path}")
+    plan = handler.load_operation_plan("scrape_dormitory")
+    assert plan is not None and plan.translation_memory is not None
+    assert handler.load_operation_plan("scrape_dodam").translation_memory is None
+    plan.translation_memory.learn(
+        ["김치찌개"], [{"nameKo": "김치찌개", "nameEn": "Kimchi Stew"}]
+    )
+    plan.translation_memory.hits = plan.translation_memory.lookups = 2
+    stream = io.StringIO()
+    log_handler = logging.getLogger("food_crawling.observation").handlers[0]
+    previous = log_handler.setStream(stream)
+
+    try:
+        with (
+            patch.object(handler, "scrape", AsyncMock(return_value=[])),
+            patch.object(handler, "notify_slack", AsyncMock()),
+        ):
+            _ = await handler.orchestrate(
+                {"operation": "scrape_dormitory", "target_date": "20260713"},
+                SimpleNamespace(aws_request_id="memory"),
+            )
+    finally:
+        log_handler.setStream(previous)
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    summary = next(
+        event for event in events if event["event.name"] == "menu_ai.translation_memory"
+    )
+    assert summary["translation_hit_rate"] == 1.0
+    assert summary["new_translations"] == 1
+    assert (tmp_path / MEMORY_KEY).is_file()
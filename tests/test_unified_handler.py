@@ -531,3 +531,56 @@ def test_direct_dormitory_fetches_seven_dates_once_and_aggregates_weekly_respons
     assert body["date"] == "20260713_weekly"
     assert body["message"] == "기숙사식당 주간 메뉴 처리 완료 (7일치)"
     assert set(body["menus"]) == {f"{date}_중식1" for date in dates}
+
+
+def test_operation_plan_is_reused_until_configuration_environment_changes(monkeypatch):
+    loader = patch.object(
+        handler, "load_operation_config", wraps=handler.load_operation_config
+    )
+    with (
+        loader as load,
+        patch.object(handler, "scrape", AsyncMock(return_value=[])),
+        patch.object(handler, "notify_slack", AsyncMock()),
+    ):
+        for _ in range(3):
+            handler.lambda_handler(
+                {"operation": "scrape_dodam", "target_date": "20260713"}, _Context()
+            )
+        first = handler.load_operation_plan("scrape_dodam")
+        monkeypatch.setenv("DEV_API_BASE_URL", "https://dev-api-2.example")
+        second = handler.load_operation_plan("scrape_dodam")
+
+    assert load.call_count == 2
+    assert first is not None and second is not None
+    assert first is not second
+    assert second.config["dev_api_base_url"] == "https://dev-api-2.example"
+
+
+def test_plans_for_configs_built_outside_an_invocation_compile_once():
+    config = dict(handler.load_operation_config("schedule_haksik"))
+    compile_plan = patch.object(
+        handler, "compile_operation_plan", wraps=handler.compile_operation_plan
+    )
+
+    with compile_plan as compiled:
+        for _ in range(3):
+            _ = handler._client(config, "fetch_meals")
+            assert handler._slot_policy(config, "석식1") == ("MORNING", 1000)
+        _ = handler._client({**config, "slots": {"중식": ["LUNCH", 5000]}}, "fetch_meals")
+
+    assert compiled.call_count == 2
+
+
+def test_operation_plan_binds_destinations_slots_and_only_needed_clients():
+    schedule = handler.load_operation_plan("schedule_haksik")
+    final_failure = handler.load_operation_plan("notify_final_failure")
+
+    assert schedule is not None and final_failure is not None
+    assert schedule.environments == ("dev", "prod")
+    assert schedule.critical_environment == "prod"
+    assert schedule.slot_policy("석식1") == ("MORNING", 1000)
+    assert schedule.slot_policy("조식1") is None
+    assert schedule.slot_policy(None) is None
+    assert schedule.parser is not None
+    assert set(final_failure.clients) == {"format_slack_text", "send_slack_text"}
+    assert final_failure.parser is None
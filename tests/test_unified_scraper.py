@@ -1,8 +1,11 @@
 import json
+import threading
 from pathlib import Path
 
 import pytest
+from bs4 import BeautifulSoup
 
+from functions import scraper
 from functions.scraper import (
     AMBIGUOUS_EMPTY,
     API_FAILURE,
@@ -267,3 +270,171 @@ async def test_fetch_failure_uses_one_attempt_and_preserves_error_classification
     assert raised.value.error_type == "TimeoutError"
     assert raised.value.__cause__ is None
     assert "provider detail" not in str(raised.value)
+
+
+@pytest.mark.asyncio
+async def test_fetch_meals_parses_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def parse(html_content, restaurant, requested_dates):
+        threads.append(threading.current_thread())
+        return parse_menu_html(html_content, restaurant, requested_dates)
+
+    monkeypatch.setattr(scraper, "parse_menu_html", parse)
+    html = (FIXTURES / "dodam.html").read_text(encoding="utf-8")
+
+    records = await fetch_meals(
+        "DODAM", "20260713", session_factory=lambda: _Session(_Response(html))
+    )
+
+    assert records
+    assert threads[0] is not threading.current_thread()
+    assert threads[0].name.startswith("menu-parse")
+
+
+@pytest.mark.parametrize("period", ["&period;", "&#46;", "&#x2E;"])
+def test_closure_written_with_character_references_is_a_holiday(period):
+    page = (FIXTURES / "dodam.html").read_text(encoding="utf-8")
+    page += f"<p>오늘은 쉽니다{period}</p>"
+
+    with pytest.raises(HolidayError):
+        parse_soongguri_html(page, "20260713", "DODAM")
+
+
+@pytest.mark.asyncio
+async def test_pooled_parse_raises_the_inline_exceptions():
+    page = "<html><body><p>오늘은 쉽니다.</p></body></html>"
+
+    with pytest.raises(HolidayError) as raised:
+        await scraper.parse_menu_html_async(page, "DODAM", ["20260713"])
+    with pytest.raises(ValueError, match="requested_dates must not be empty"):
+        await scraper.parse_menu_html_async(page, "DODAM", [])
+
+    assert raised.value.restaurant == "DODAM"
+
+
+@pytest.mark.parametrize(
+    ("raw_value", "workers"), [("0", 0), ("2", 2), ("64", 4), ("two", 3), ("-1", 3)]
+)
+def test_parse_worker_setting_falls_back_on_bad_values(raw_value, workers, monkeypatch):
+    monkeypatch.setattr(scraper.os, "cpu_count", lambda: 3)
+    scraper._worker_count.cache_clear()
+    monkeypatch.setenv(scraper.PARSE_WORKERS_ENVIRONMENT, raw_value)
+
+    assert scraper._parse_workers() == workers
+    scraper._worker_count.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_zero_parse_workers_parse_on_the_calling_thread(monkeypatch):
+    monkeypatch.setenv(scraper.PARSE_WORKERS_ENVIRONMENT, "0")
+    threads = []
+    monkeypatch.setattr(
+        scraper,
+        "parse_menu_html",
+        lambda *args: threads.append(threading.current_thread()) or [],
+    )
+
+    assert await scraper.parse_menu_html_async("", "DODAM", ["20260713"]) == []
+    assert threads == [threading.current_thread()]
+
+
+PRECHECK_PAGES = [
+    "",
+    "   \n",
+    "<html><body><p>오늘은 쉽니다.</p></body></html>",
+    "<html><body><div>\n 오늘은 쉽니다. \n</div></body></html>",
+    "<html><body><h1>500 Internal Server Error</h1></body></html>",
+    '<html><body><div title="a > b"></div></body></html>',
+    "<html><body><p>오늘은 쉽니다. 내일 뵙겠습니다</p></body></html>",
+    "<html><!-- 오늘은 쉽니다. --><body></body></html>",
+    "<table><tr><td>오늘은 쉽니다.</td></tr></table>",
+    "<table><tr><td>&nbsp;</td></tr></table>",
+    "<html><body><p>&amp;</p></body></html>",
+    (FIXTURES / "dodam.html").read_text(encoding="utf-8"),
+]
+
+
+def _outcome(parse):
+    try:
+        records = parse()
+    except ScraperError as error:
+        return type(error).__name__, error.reason_code
+    return [(record.source_slot, record.outcome) for record in records]
+
+
+@pytest.mark.parametrize("html", PRECHECK_PAGES)
+def test_precheck_matches_the_full_parser(html, monkeypatch):
+    fast = _outcome(lambda: parse_soongguri_html(html, "20260713", "DODAM"))
+    monkeypatch.setattr(scraper, "_precheck_soongguri", lambda *args: None)
+    monkeypatch.setattr(scraper, "_DAY_CLOSURE_TEXT", "")
+
+    assert fast == _outcome(lambda: parse_soongguri_html(html, "20260713", "DODAM"))
+
+
+def test_closure_and_error_pages_are_rejected_before_parsing(monkeypatch):
+    monkeypatch.setattr(scraper, "BeautifulSoup", None)
+
+    with pytest.raises(HolidayError):
+        parse_soongguri_html("<p>오늘은 쉽니다.</p>", "20260713", "DODAM")
+    with pytest.raises(SourceParseError) as raised:
+        parse_dormitory_html("<h1>Bad Gateway</h1>", ["20260713"])
+    assert raised.value.reason_code == "SOURCE_SCHEMA_CHANGED"
+
+
+def _grid(html):
+    return scraper._table_grid(BeautifulSoup(html, "html.parser").find("table"))
+
+
+def test_table_grid_resolves_row_and_column_spans():
+    grid = _grid(
+        "<table>"
+        "<tr><th>날짜</th><th colspan=\"2\">식사</th></tr>"
+        '<tr><td rowspan="2">07-13</td><td>밥</td><td>국</td></tr>'
+        "<tr><td>빵</td></tr>"
+        "</table>"
+    )
+
+    assert (grid.width, grid.height) == (3, 3)
+    assert grid.column("식사") == 1
+    assert grid.column("없음") is None
+    assert list(grid.rows(start=1)) == [["07-13", "밥", "국"], ["07-13", "빵", None]]
+
+    carried = _grid(
+        '<table><tr><td rowspan="2">a</td><td>b</td></tr>'
+        '<tr><td colspan="2">c</td><td>d</td></tr></table>'
+    )
+    assert list(carried.rows()) == [["a", "b", None, None], ["a", "c", "c", "d"]]
+
+
+@pytest.mark.parametrize(
+    ("html", "message"),
+    [
+        (
+            '<table><tr><td>a</td><td rowspan="2">b</td></tr>'
+            '<tr><td colspan="2">c</td></tr></table>',
+            "overlapping table span",
+        ),
+        ('<table><tr><td rowspan="2">a</td></tr></table>', "rowspan exceeds table rows"),
+    ],
+)
+def test_table_grid_keeps_span_errors(html, message):
+    with pytest.raises(ValueError, match=message):
+        _grid(html)
+
+
+def test_month_long_dormitory_table_is_parsed():
+    dates = [f"202607{day:02d}" for day in range(1, 32)]
+    rows = "".join(
+        f'<tr><td>07-{date[6:]}</td><td rowspan="1">비빔밥</td><td>카레</td></tr>'
+        for date in dates
+    )
+    html = (
+        '<table class="boxstyle02"><tr><th>날짜</th><th>중식</th><th>석식</th></tr>'
+        f"{rows}</table>"
+    )
+
+    records = parse_dormitory_html(html, dates)
+
+    assert len(records) == 62
+    assert {record.date for record in records} == set(dates)
@@ -0,0 +1,56 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from functions import handler, warmup
+
+
+CONTEXT = SimpleNamespace(aws_request_id="warmup-test")
+
+
+def test_warmup_is_a_recognised_trigger():
+    assert handler.parse_event({"trigger": "warmup"})["trigger"] == "warmup"
+
+
+def test_warmup_primes_without_side_effects_and_reports_removed_work():
+    boundaries = {
+        name: AsyncMock()
+        for name in ("scrape", "interpret_menu", "publish_menu", "notify_slack")
+    }
+    resolve = AsyncMock(return_value=(4, 2.5))
+
+    with (
+        patch.multiple(handler, **boundaries),
+        patch.object(warmup, "_resolve", resolve),
+    ):
+        first = handler.lambda_handler(
+            {"operation": "schedule_dodam", "trigger": "warmup"}, CONTEXT
+        )
+        second = handler.lambda_handler(
+            {"operation": "schedule_dodam", "trigger": "warmup"}, CONTEXT
+        )
+
+    assert all(boundary.await_count == 0 for boundary in boundaries.values())
+    cold, warm = json.loads(first["body"]), json.loads(second["body"])
+    assert first["statusCode"] == 200
+    assert set(cold["steps_ms"]) == {"plan", "tls", "openai_client", "parse_pool"}
+    assert cold["removed_ms"] == pytest.approx(sum(cold["steps_ms"].values()), abs=0.3)
+    assert cold["steps_ms"]["plan"] > warm["steps_ms"]["plan"]
+    assert cold["resolved_hosts"] == 4
+    [hosts] = resolve.await_args.args
+    assert hosts == {
+        ("m.soongguri.com", 80),
+        ("api.openai.com", 443),
+        ("api.example", 443),
+        ("dev-api.example", 443),
+        ("hooks.slack.test", 443),
+    }
+
+
+def test_warmup_of_final_failure_resolves_only_slack():
+    plan = handler.load_operation_plan("notify_final_failure")
+
+    assert plan is not None
+    assert warmup._hosts(plan) == {("hooks.slack.test", 443)}